@@ -1,20 +1,57 @@
+import gc
+import json
+import os
+import threading
+import time
+from collections import Counter
 from pathlib import Path
 import streamlit as st
-import streamlit.components.v1 as components
-import yaml
-
-from src.catalog import build_full_catalog
-from src.estimates import (
-    Anchor, anchors_by_label,
-    estimate_club_speed, estimate_carry,
-    responsiveness_exponent, scaled_carry, rollout_for, category_of
-)
-from src.shot_pattern import simulate_shot_pattern, render_shot_pattern_svg
+
+from src.cards import CARD_CSS, clubs_grid_html, wedges_grid_html
+from src.config import ConfigStore
+from src.graph import CardGraph, card_groups, shared_card_graph
+from src.lookup import TableStore, lookup_today
+from src.memory import enforce_budget, session_usage, shared
+from src.partials import PartialScheme, WedgeMatrix, build_wedge_matrix
+from src import perf
+from src.profiles import BASE_PROFILE
+from src.estimates import category_of
+from src.warmup import ENABLED as WARMUP_ENABLED, Warmup
 
 # ---------------------------
 # Page config (MUST be first Streamlit call)
 # ---------------------------
 st.set_page_config(page_title="Yardage Card", layout="wide")
+_rerun_t0 = time.perf_counter()
+
+@st.cache_resource
+def _freeze_import_heap() -> bool:
+    # Once per process, after the first run's imports: move numpy/pandas/module
+    # objects out of the collector's reach. Streamlit runs a full gc after every
+    # run, holding the GIL while the queued card deltas wait to be flushed.
+    gc.freeze()
+    return True
+
+# Deploy-time opt-in: frozen objects are never collected for the life of the process
+if os.environ.get("YARDAGE_GC_FREEZE", "0") == "1":
+    _freeze_import_heap()
+
+# Sampling profiler for this session's next N full reruns (Debug → Profiler).
+# A rerun interrupted by the next one never reaches the end; fold its samples here.
+_sampler = st.session_state.pop("_profile_sampler", None)
+if _sampler is not None:
+    st.session_state.profile_samples.update(_sampler.stop())
+    _sampler = None
+if st.session_state.get("profile_reruns_left", 0) > 0:
+    from src.profiler import StackSampler
+    _sampler = StackSampler(threading.get_ident(), root_file=__file__).start()
+    st.session_state._profile_sampler = _sampler
+
+# Widgets in the Shot Pattern and Debug tabs are not rendered while their tab
+# is closed, which would drop their values; re-assigning keeps them.
+for _key in ("shot_pattern_selected", "shot_pattern_shape_tab", "debug_enabled"):
+    if _key in st.session_state:
+        st.session_state[_key] = st.session_state[_key]
 
 # ---------------------------
 # Top whitespace kill + hide Streamlit chrome
@@ -53,18 +90,6 @@ h1 { margin-top: 0.0rem !important; margin-bottom: 0.15rem !important; }
 # ---------------------------
 st.markdown("""
 <style>
-/* Augusta-inspired palette */
-:root{
-  --augusta-green: #006747;
-  --augusta-green-dark: #004c35;
-  --azalea-pink: #e86aa3;
-  --gold: #d4af37;
-  --cream: #fbf7ef;
-  --ink: #10201a;
-  --muted: rgba(16,32,26,0.65);
-  --line: rgba(16,32,26,0.12);
-}
-
 /* background */
 .stApp {
   background: linear-gradient(180deg, var(--cream) 0%, #ffffff 65%);
@@ -175,146 +200,6 @@ hr { border-color: var(--line) !important; }
   margin: 6px 0 10px 20px;
 }
 
-/* badges */
-.badges { display:flex; gap:8px; flex-wrap:wrap; margin: 6px 0 12px 0; }
-.badge {
-  padding: 4px 10px;
-  border-radius: 999px;
-  border: 1px solid rgba(16,32,26,0.10);
-  background: rgba(255,255,255,0.70);
-  font-size: 0.78rem;
-  font-weight: 800;
-  color: rgba(16,32,26,0.75);
-  max-width: 100%;
-  white-space: nowrap;
-  overflow: hidden;
-  text-overflow: ellipsis;
-  box-shadow: 0 1px 0 rgba(0,0,0,0.03);
-}
-
-/* cards */
-.ycard {
-  padding: 10px 12px;
-  border: 1px solid var(--line);
-  border-left: 6px solid var(--augusta-green);
-  background: rgba(255,255,255,0.75);
-  backdrop-filter: blur(4px);
-  border-radius: 16px;
-  margin-bottom: 10px;
-  box-shadow: 0 1px 0 rgba(0,0,0,0.03);
-  position: relative;
-  overflow: hidden;
-  transition: transform 120ms ease, box-shadow 120ms ease, border-color 120ms ease;
-}
-.ycard:hover{
-  transform: translateY(-1px);
-  box-shadow: 0 6px 18px rgba(0,0,0,0.06);
-  border-color: rgba(16,32,26,0.18);
-}
-.ycard:before{
-  content:"";
-  position:absolute;
-  left:0; top:0;
-  width:100%; height:40%;
-  background: linear-gradient(180deg, rgba(255,255,255,0.55), rgba(255,255,255,0.0));
-  pointer-events:none;
-}
-
-.yrow { display:flex; justify-content: space-between; align-items: baseline; gap: 10px; }
-.yclub { font-size: 1.0rem; font-weight: 800; color: var(--ink); }
-.ycloft{
-  font-size: 0.78rem;
-  font-weight: 700;
-  color: rgba(16,32,26,0.50);
-  margin-left: 6px;
-}
-.yvals {
-  font-size: 1.18rem;
-  font-weight: 900;
-  color: var(--augusta-green-dark);
-  letter-spacing: -0.02em;
-  text-shadow: 0 1px 0 rgba(255,255,255,0.6);
-}
-.ysub  { opacity: 0.75; font-size: 0.80rem; margin-top: 2px; color: var(--muted); }
-
-/* carry bar */
-.barwrap {
-  width: 100%;
-  height: 8px;
-  background: rgba(16,32,26,0.08);
-  border-radius: 999px;
-  overflow: hidden;
-  margin-top: 8px;
-}
-.barfill {
-  height: 100%;
-  background: linear-gradient(90deg, var(--augusta-green), var(--augusta-green-dark));
-  border-radius: 999px;
-  filter: saturate(1.05);
-}
-
-/* gap pill */
-.gapline{
-  margin-top: 6px;
-  display: flex;
-  justify-content: flex-start;
-  align-items: center;
-  min-height: 24px;
-}
-.gappill{
-  display:inline-block;
-  padding: 3px 8px;
-  border-radius: 999px;
-  border: 1px solid rgba(16,32,26,0.08);
-  background: rgba(255,255,255,0.65);
-  font-size: 0.72rem;
-  font-weight: 800;
-  color: rgba(16,32,26,0.68);
-  min-height: 18px;
-}
-
-/* wedges: mini grid */
-.wgrid {
-  display: grid;
-  grid-template-columns: repeat(5, 1fr);
-  gap: 8px;
-  margin-top: 8px;
-}
-.wcell {
-  border: 1px solid rgba(16,32,26,0.10);
-  border-radius: 12px;
-  padding: 8px 8px;
-  background: rgba(255,255,255,0.60);
-  text-align: center;
-}
-.wlab {
-  font-size: 0.72rem;
-  font-weight: 800;
-  color: rgba(16,32,26,0.70);
-  letter-spacing: 0.02em;
-}
-.wval {
-  margin-top: 2px;
-  font-size: 1.05rem;
-  font-weight: 900;
-  color: var(--augusta-green-dark);
-}
-.wbarwrap{
-  width: 100%;
-  height: 6px;
-  background: rgba(16,32,26,0.08);
-  border-radius: 999px;
-  overflow: hidden;
-  margin-top: 6px;
-}
-.wbarfill{
-  height: 100%;
-  background: linear-gradient(90deg, var(--augusta-green), var(--augusta-green-dark));
-  border-radius: 999px;
-}
-
-.ycard.wedge { padding: 10px 12px; }
-
 /* Shot Pattern tab layout */
 .pattern-panel{
   margin-top: 4px;
@@ -368,104 +253,82 @@ div[data-testid="stTabs"] button[aria-selected="false"]{
 </style>
 """, unsafe_allow_html=True)
 
-# Wedge grid sizing helper
-st.markdown("""
-<style>
-.wgrid.wgrid4{
-  grid-template-columns: repeat(4, 1fr) !important;
-}
-</style>
-""", unsafe_allow_html=True)
+# Card palette + card/grid styles (src/cards.py; shared with the static exporter)
+st.markdown(f"<style>{CARD_CSS}</style>", unsafe_allow_html=True)
 
 # ---------------------------
 # Config loading
 # ---------------------------
 CFG_PATH = Path("data/config.yaml")
 
-@st.cache_data
-def load_cfg():
-    with CFG_PATH.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+@st.cache_resource
+def config_store() -> ConfigStore:
+    # One compiled config shared by all sessions; rebuilt when the YAML changes
+    return ConfigStore(CFG_PATH)
 
-cfg = load_cfg()
+cc = config_store().get()
 
-# ---------------------------
-# Loft helpers
-# ---------------------------
-lofts_cfg = cfg.get("lofts_deg", {})
-
-def loft_text_for(label: str) -> str | None:
-    """Return a pretty loft string for non-wedge clubs, like '32°' or '10.5°'."""
-    if category_of(label) == "wedge":
-        return None
-
-    loft = lofts_cfg.get(label)
-    if loft is None:
-        return None
-
-    try:
-        f = float(loft)
-    except Exception:
-        return None
-
-    if abs(f - round(f)) < 1e-9:
-        return f"{int(round(f))}°"
-    return f"{f:.1f}°"
-
-baseline_chs0 = float(cfg["baseline"]["driver_chs_mph"])
-p_shape = float(cfg["model"]["exponent_shape_p"])
-rollout_cfg = cfg.get("rollout_defaults_yd", {})
-wedges_cfg = cfg.get("wedges", {})
-choke_sub = float(wedges_cfg.get("choke_down_subtract_yd", 4))
-partials_cfg = wedges_cfg.get("partials", {})
-alpha = float(partials_cfg.get("alpha", 0.55))
-feel_map_cfg = partials_cfg.get("feel_map", {"75%": 0.75, "50%": 0.50, "25%": 0.25})
-
-ui = cfg.get("ui", {})
-presets = ui.get("presets", {})
-default_preset = ui.get("default_preset", "My Bag")
-default_bag = presets.get(default_preset, ui.get("default_bag", []))
-
-# Anchors
-anchors_raw = cfg["baseline"]["anchors"]
-anchors = [Anchor(
-    label=a["label"],
-    club_speed_mph=float(a["club_speed_mph"]),
-    carry_yd=float(a["carry_yd"]),
-    category=a["category"],
-    loft_deg=a.get("loft_deg")
-) for a in anchors_raw]
-anchor_map = anchors_by_label(anchors)
-
-catalog = build_full_catalog()
+@st.cache_resource
+def table_store() -> TableStore:
+    # Optional mmap lookup file shared by every process on the host (src/lookup.py)
+    return TableStore()
+
+@st.cache_resource
+def warmup_job() -> Warmup:
+    # Once per process: models, lookup file, card graphs and default shot patterns
+    # for every profile x preset, on a background thread (src/warmup.py)
+    return Warmup(config_store(), table_store()).start()
+
+presets = cc.presets
+default_preset = cc.default_preset
+default_bag = list(cc.default_bag)
+
+# Anchors + fitted model for the base profile (shared with the JSON API in
+# src/api.py); replaced below if another anchor-set profile is picked.
+profile_ids = cc.profiles.ids()
+profile_id = BASE_PROFILE
+model = cc.model
+
+catalog = list(cc.catalog)
 
 # ---------------------------
 # Helper functions
 # ---------------------------
-def compute_baseline(label: str):
-    if label in anchor_map:
-        a = anchor_map[label]
-        return a.club_speed_mph, a.carry_yd
-
-    spd = estimate_club_speed(label, anchor_map)
-    if spd is None:
-        return None, None
-
-    carry = estimate_carry(label, float(spd), anchor_map, anchors)
-    return float(spd), float(carry)
+# Per-session dependency graph (set up after the controls); serves the
+# current chs/offset incrementally, other inputs go to the lookup file/model
+graph = None
 
 def compute_today(label: str, chs_today: float, offset: float):
-    spd0, carry0 = compute_baseline(label)
-    if spd0 is None or carry0 is None:
-        return None, None
-    g = responsiveness_exponent(spd0, baseline_chs0, p_shape)
-    carry = scaled_carry(carry0, float(chs_today), baseline_chs0, g) + float(offset)
-    rollout = rollout_for(label, rollout_cfg)
-    total = carry + rollout
-    return carry, total
-
-def clamp01(x: float) -> float:
-    return max(0.0, min(1.0, x))
+    if graph is not None and graph.get("chs") == chs_today and graph.get("offset") == offset:
+        hit = graph.carry_total(label)
+        if hit is not None:
+            return hit
+    return lookup_today(table_store().get(), model_key, model, label, chs_today, offset)
+
+# Wedge partials (Wedges + Debug tabs): one wedges x feel matrix per CHS from
+# the config's wedges.partials, shifted to the current offset
+partial_scheme = PartialScheme.from_config(cc)
+wedge_catalog = tuple(x for x in catalog if category_of(x) == "wedge")
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def wedge_matrix(cfg_digest: str, model_key: str, labels: tuple, chs_today: float) -> WedgeMatrix:
+    perf.cache_miss("st.wedge_matrix")
+    return build_wedge_matrix(model, labels, partial_scheme, chs_today)
+
+# Whole-tab card grids: one HTML payload per tab, cached by inputs
+@st.cache_data(show_spinner=False, max_entries=512)
+def clubs_grid(cfg_digest: str, model_key: str, bag: tuple, chs_today: float, offset: float, max_carry: float,
+               _graph: CardGraph) -> str:
+    perf.cache_miss("st.clubs_grid")
+    rows = _graph.rows("clubs")
+    return clubs_grid_html(rows, max_carry, cc.loft_texts)
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def wedges_grid(cfg_digest: str, model_key: str, wedge_labels: tuple, chs_today: float, offset: float, max_carry: float,
+                _graph: CardGraph, _partials: WedgeMatrix) -> str:
+    perf.cache_miss("st.wedges_grid")
+    rows = _graph.rows("wedges")
+    return wedges_grid_html(rows, max_carry, {r["club"]: _partials.cells(r["club"]) for r in rows})
 
 # ---------------------------
 # Title
@@ -475,30 +338,130 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+# ---------------------------
+# Golfer (saved settings + CHS history, src/golfers.py)
+# ---------------------------
+@st.cache_resource
+def golfer_store():
+    # One SQLite connection pool per process; the file is created on first use
+    from src.golfers import GolferStore
+    return GolferStore()
+
+st.session_state.setdefault("golfer_handle", st.query_params.get("golfer", ""))
+with st.expander("Golfer", expanded=False):
+    handle = st.text_input(
+        "Golfer id", key="golfer_handle", placeholder="e.g. alice",
+        help="Loads and saves your preset, bag, anchor profile and CHS history. ?golfer=<id> in the URL does the same.",
+    ).strip()
+    golfer_box = st.container()
+
+golfer = golfer_store().get(handle) if handle else None
+if handle != st.session_state.get("_golfer_loaded", ""):
+    # First run for this golfer: start from their recent CHS and saved offset
+    st.session_state["_golfer_loaded"] = handle
+    if handle:
+        st.query_params["golfer"] = handle
+    else:
+        st.query_params.pop("golfer", None)
+    if golfer is not None:
+        stats = golfer_store().stats(handle)
+        recent = stats.avg(7) or stats.last
+        if recent is not None:
+            st.session_state["chs_today"] = round(min(135.0, max(90.0, recent)), 1)
+        st.session_state["offset"] = int(round(min(25.0, max(-25.0, golfer.offset))))
+if golfer is not None and golfer.preset in cc.preset_names:
+    default_preset = golfer.preset
+if golfer is not None and golfer.profile_id in profile_ids:
+    profile_id = golfer.profile_id
+
 # ---------------------------
 # Controls
 # ---------------------------
+# Defaults live in session state, so "Estimate CHS from carries" and a golfer's saved values can set them
+st.session_state.setdefault("chs_today", 105.0)
+st.session_state.setdefault("offset", 0)
+
 with st.expander("Adjust Yardages", expanded=False):
-    chs_today = st.slider("Driver CHS (mph)", 90, 135, 105, 1)
+    # Fractional CHS (e.g. a launch-monitor reading) is served by the card graph's response fit
+    chs_today = st.slider("Driver CHS (mph)", 90.0, 135.0, step=0.1, format="%.1f", key="chs_today")
 
     c1, c2 = st.columns([0.9, 1.8], vertical_alignment="center")
     with c1:
-        offset = st.number_input("± (yd)", -25, 25, 0, 1)
+        offset = st.number_input("± (yd)", -25, 25, step=1, key="offset")
     with c2:
-        preset_names = list(presets.keys()) if presets else ["My Bag"]
+        preset_names = list(cc.preset_names)
         preset_index = preset_names.index(default_preset) if default_preset in preset_names else 0
         preset = st.selectbox("Preset", preset_names, index=preset_index)
-        bag_default = presets.get(preset, default_bag)
+        bag_default = list(presets.get(preset, default_bag))
+        if golfer is not None and golfer.bag and preset == golfer.preset:
+            bag_default = list(golfer.bag)
+
+    if len(profile_ids) > 1:
+        profile_id = st.selectbox(
+            "Anchor profile",
+            profile_ids,
+            index=profile_ids.index(profile_id),
+            format_func=cc.profiles.name,
+        )
 
 if "chs_today" not in locals():
-    chs_today = 105
+    chs_today = 105.0
 if "offset" not in locals():
     offset = 0
 if "preset" not in locals():
-    preset_names = list(presets.keys()) if presets else ["My Bag"]
-    preset = default_preset if default_preset in preset_names else preset_names[0]
+    preset = default_preset
 if "bag_default" not in locals():
-    bag_default = presets.get(preset, default_bag)
+    bag_default = list(presets.get(preset, default_bag))
+
+model = cc.profiles.model(profile_id)
+model_key = cc.profiles.key(profile_id)
+if golfer is not None and golfer.anchors:
+    model_key, model = cc.profiles.with_anchors(profile_id, golfer.anchors)
+
+# ---------------------------
+# Estimate CHS from carries (src/solve.py)
+# ---------------------------
+SOLVE_ROWS = 3
+
+def _apply_solution(chs: float, offset_yd: int) -> None:
+    # Runs before the next rerun, so the controls above pick these up
+    st.session_state["chs_today"] = chs
+    st.session_state["offset"] = offset_yd
+
+with st.expander("Estimate CHS from carries", expanded=False):
+    st.caption("Enter carries you know today. The solver finds the driver CHS and, with two or more clubs, "
+               "the offset that fit them best.")
+    observations = []
+    for i in range(SOLVE_ROWS):
+        s1, s2 = st.columns([1.4, 1.0], vertical_alignment="center")
+        with s1:
+            solve_club = st.selectbox(f"Club {i + 1}", [""] + catalog, key=f"solve_club_{i}",
+                                format_func=lambda x: x or "—")
+        with s2:
+            solve_carry = st.number_input(f"Carry {i + 1} (yd)", 0, 400, 0, 1, key=f"solve_carry_{i}")
+        if solve_club and solve_carry:
+            observations.append((solve_club, float(solve_carry)))
+
+    if observations:
+        from src.solve import solve_chs
+        try:
+            # One club only pins CHS; hold the offset at its current value
+            sol = solve_chs(model, observations, None if len(observations) >= 2 else float(offset))
+        except ValueError as e:
+            st.warning(str(e))
+        else:
+            solved_chs = round(min(135.0, max(90.0, sol.chs)), 1)
+            solved_offset = int(round(min(25.0, max(-25.0, sol.offset))))
+            st.markdown(f"**CHS {sol.chs:.1f} mph**, offset {sol.offset:+.1f} yd "
+                        f"(RMS residual {sol.rmse:.1f} yd)")
+            if sol.at_bound:
+                st.caption("The best fit is at the edge of the 90–135 mph range.")
+            st.dataframe(
+                [{"club": r["club"], "observed": r["observed"], "model": round(r["predicted"], 1),
+                  "residual": round(r["residual"], 1)} for r in sol.residuals],
+                use_container_width=True, hide_index=True,
+            )
+            st.button("Apply to card", on_click=_apply_solution, args=(solved_chs, solved_offset))
 
 # ---------------------------
 # Clubs shown
@@ -510,13 +473,32 @@ with st.expander("Select Clubs", expanded=False):
 if not bag:
     bag = bag_default
 
+if handle:
+    with golfer_box:
+        g1, g2 = st.columns(2)
+        if g1.button("Save settings", use_container_width=True):
+            golfer_store().save_golfer(handle, profile_id=profile_id, preset=preset, offset=float(offset), bag=bag)
+            st.toast(f"Saved settings for {handle}")
+        if g2.button(f"Log CHS {chs_today:.1f}", use_container_width=True):
+            golfer_store().add_reading(handle, float(chs_today))
+            st.toast(f"Logged {chs_today:.1f} mph for today")
+        stats = golfer_store().stats(handle)
+        if stats.last is None:
+            st.caption("No CHS readings yet." if golfer is not None else "New golfer: save settings to create.")
+        else:
+            parts = [f"Last {stats.last:.1f} mph ({stats.last_day})"]
+            parts += [f"{w}-day avg {a:.1f} ({n})" for w, (a, n) in stats.windows.items() if a is not None]
+            st.caption(" · ".join(parts))
+
 # Badges up top
+profile_badge = f'<div class="badge">Profile: {cc.profiles.name(profile_id)}</div>' if profile_id != BASE_PROFILE else ""
 st.markdown(
     f"""
     <div class="badges">
-      <div class="badge">CHS: {chs_today} mph</div>
+      <div class="badge">CHS: {chs_today:.1f} mph</div>
       <div class="badge">Offset: {offset:+.0f} yd</div>
       <div class="badge">Preset: {preset}</div>
+      {profile_badge}
     </div>
     """,
     unsafe_allow_html=True
@@ -526,197 +508,47 @@ st.divider()
 # ---------------------------
 # Tabs
 # ---------------------------
-tab_clubs, tab_wedges, tab_pattern, tab_debug = st.tabs(["Clubs", "Wedges", "Shot Pattern", "Debug"])
-
-# Precompute driver carry for bar scaling
-driver_carry, _ = compute_today("Driver", chs_today, offset)
-max_carry = float(driver_carry) if driver_carry else 1.0
-
-def render_card(label: str, shown: str, sub: str, fill_pct: float, gap_text: str | None = None):
-    fill_pct = clamp01(fill_pct)
-
-    loft_txt = loft_text_for(label)
-    label_html = (
-        f'{label} <span class="ycloft">({loft_txt})</span>'
-        if loft_txt else
-        f'{label}'
-    )
-
-    gap_safe = gap_text if gap_text else "&nbsp;"
-
-    st.markdown(
-        f"""
-        <div class="ycard">
-          <div class="yrow">
-            <div class="yclub">{label_html}</div>
-            <div class="yvals">{shown}</div>
-          </div>
-          <div class="ysub">{sub}</div>
-          <div class="barwrap"><div class="barfill" style="width:{fill_pct*100:.0f}%;"></div></div>
-          <div class="gapline"><span class="gappill">{gap_safe}</span></div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+# Switching tabs reruns the script, so the Shot Pattern and Debug panels
+# (and their imports) only run while their tab is open.
+tab_clubs, tab_wedges, tab_pattern, tab_debug = st.tabs(
+    ["Clubs", "Wedges", "Shot Pattern", "Debug"], key="main_tab", on_change="rerun"
+)
 
-with tab_clubs:
+# Card values for this session: rebuilt when the model or label set changes,
+# otherwise only the nodes downstream of a changed chs/offset are recomputed
+clubs_only, wedge_labels, graph_labels = card_groups(catalog, bag)
+graph_key = (model_key, graph_labels)
+cached_graph = st.session_state.get("_card_graph")
+if cached_graph is None or cached_graph[0] != graph_key:
+    # Baselines/exponents/response fit are one shared copy per model and label set
+    cached_graph = (graph_key, shared_card_graph(model, model_key, graph_labels, chs_today, offset))
+    st.session_state["_card_graph"] = cached_graph
+graph = cached_graph[1]
+graph.set(chs=float(chs_today), offset=float(offset))
+graph.group("clubs", clubs_only)
+graph.group("wedges", wedge_labels)
+
+# Driver carry for bar scaling
+max_carry = graph.get("max_carry")
+
+perf.cache_lookup("st.wedge_matrix")
+partials = wedge_matrix(cc.digest, model_key, tuple(dict.fromkeys(wedge_catalog + tuple(wedge_labels))),
+                        float(chs_today)).with_offset(offset)
+
+with tab_clubs, perf.span("tab.clubs"):
     st.markdown('<div class="section-title"><div class="section-dot"></div><h3 style="margin:0;">Clubs</h3></div>', unsafe_allow_html=True)
     st.markdown('<div class="section-underline"></div>', unsafe_allow_html=True)
+    perf.cache_lookup("st.clubs_grid")
+    st.markdown(clubs_grid(cc.digest, model_key, tuple(bag), chs_today, offset, max_carry, graph), unsafe_allow_html=True)
 
-    clubs_only = [x for x in bag if category_of(x) not in ("wedge", "putter")]
-
-    club_vals = []
-    for label in clubs_only:
-        carry, total = compute_today(label, chs_today, offset)
-        sort_carry = carry if carry is not None else -1e9
-        club_vals.append((label, carry, total, sort_carry))
-
-    club_vals.sort(key=lambda x: x[3], reverse=True)
-    clubs_sorted = [x[0] for x in club_vals]
-
-    gap_map = {}
-    for i, (label, carry, total, _) in enumerate(club_vals):
-        if carry is None:
-            continue
-
-        nxt_carry = None
-        for j in range(i + 1, len(club_vals)):
-            if club_vals[j][1] is not None:
-                nxt_carry = club_vals[j][1]
-                break
-
-        if nxt_carry is not None:
-            gap = carry - nxt_carry
-            gap_map[label] = f"Gap to next: +{gap:.0f} yd"
-
-    for i in range(0, len(clubs_sorted), 2):
-        left, right = st.columns(2, gap="small")
-        for col, label in zip([left, right], clubs_sorted[i:i+2]):
-            carry, total = compute_today(label, chs_today, offset)
-
-            if carry is None:
-                shown, sub, fill, gap_txt = "—", "No model", 0.0, None
-            else:
-                shown = f"{carry:.0f} / {total:.0f}"
-                sub = "Carry / Total"
-                fill = (carry / max_carry) if max_carry else 0.0
-                gap_txt = gap_map.get(label)
-
-            with col:
-                render_card(label, shown, sub, fill, gap_txt)
-
-with tab_wedges:
+with tab_wedges, perf.span("tab.wedges"):
     st.markdown(
         '<div class="section-title"><div class="section-dot"></div><h3 style="margin:0;">Wedges</h3></div>',
         unsafe_allow_html=True
     )
     st.markdown('<div class="section-underline"></div>', unsafe_allow_html=True)
-
-    wedge_labels = [x for x in bag if category_of(x) == "wedge"]
-    if not wedge_labels:
-        wedge_labels = ["PW (46°)", "GW (50°)", "SW (56°)", "LW (60°)"]
-
-    scheme = ["Choke-down", "75%", "50%", "25%"]
-    pct_map = {"25%": 0.40, "50%": 0.60, "75%": 0.80}
-    lbl_map = {"Choke-down": "Choke"}
-
-    PARTIAL_K = {
-        "75%": 0.92,
-        "50%": 0.85,
-        "25%": 0.78,
-    }
-
-    def wedge_values(full_carry: float):
-        vals = {}
-        for k in scheme:
-            if k == "Choke-down":
-                vals[k] = max(0.0, full_carry - choke_sub)
-            else:
-                pct = float(pct_map[k])
-                exp = float(PARTIAL_K.get(k, 0.85))
-                vals[k] = full_carry * (pct ** exp)
-        return vals
-
-    wedge_vals = []
-    for w in wedge_labels:
-        carry_full, total_full = compute_today(w, chs_today, offset)
-        sort_carry = carry_full if carry_full is not None else -1e9
-        wedge_vals.append((w, carry_full, total_full, sort_carry))
-
-    wedge_vals.sort(key=lambda x: x[3], reverse=True)
-    wedge_labels_sorted = [x[0] for x in wedge_vals]
-
-    wedge_gap_map = {}
-    for i, (label, carry_full, total_full, _) in enumerate(wedge_vals):
-        if carry_full is None:
-            continue
-
-        nxt_carry = None
-        for j in range(i + 1, len(wedge_vals)):
-            if wedge_vals[j][1] is not None:
-                nxt_carry = wedge_vals[j][1]
-                break
-
-        if nxt_carry is not None:
-            gap = carry_full - nxt_carry
-            wedge_gap_map[label] = f"Gap to next: +{gap:.0f} yd"
-
-    def render_wedge_card(label: str, gap_text: str | None = None):
-        carry_full, total_full = compute_today(label, chs_today, offset)
-
-        if carry_full is None:
-            shown = "—"
-            sub = "No model"
-
-            cells = []
-            for k in scheme:
-                k2 = lbl_map.get(k, k)
-                cells.append(
-                    f'<div class="wcell"><div class="wlab">{k2}</div><div class="wval">—</div>'
-                    f'<div class="wbarwrap"><div class="wbarfill" style="width:0%;"></div></div></div>'
-                )
-            grid_html = f'<div class="wgrid wgrid4">{"".join(cells)}</div>'
-        else:
-            shown = f"{carry_full:.0f} / {total_full:.0f}"
-            sub = "Full (Carry / Total)"
-            vals = wedge_values(carry_full)
-
-            cells = []
-            for k in scheme:
-                k2 = lbl_map.get(k, k)
-                v = float(vals[k])
-
-                pct = clamp01(v / carry_full) if carry_full else 0.0
-                cells.append(
-                    f'<div class="wcell"><div class="wlab">{k2}</div><div class="wval">{v:.0f}</div>'
-                    f'<div class="wbarwrap"><div class="wbarfill" style="width:{pct*100:.0f}%;"></div></div></div>'
-                )
-            grid_html = f'<div class="wgrid wgrid4">{"".join(cells)}</div>'
-
-        fill = (carry_full / max_carry) if (carry_full is not None and max_carry) else 0.0
-        gap_safe = gap_text if gap_text else "&nbsp;"
-
-        st.markdown(
-            f"""
-            <div class="ycard wedge">
-              <div class="yrow">
-                <div class="yclub">{label}</div>
-                <div class="yvals">{shown}</div>
-              </div>
-              <div class="ysub">{sub}</div>
-              <div class="barwrap"><div class="barfill" style="width:{clamp01(fill)*100:.0f}%;"></div></div>
-              <div class="gapline"><span class="gappill">{gap_safe}</span></div>
-              {grid_html}
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
-    for i in range(0, len(wedge_labels_sorted), 2):
-        left, right = st.columns(2, gap="small")
-        for col, label in zip([left, right], wedge_labels_sorted[i:i+2]):
-            with col:
-                render_wedge_card(label, gap_text=wedge_gap_map.get(label))
+    perf.cache_lookup("st.wedges_grid")
+    st.markdown(wedges_grid(cc.digest, model_key, tuple(wedge_labels), chs_today, offset, max_carry, graph, partials), unsafe_allow_html=True)
 
 with tab_pattern:
     st.markdown(
@@ -725,62 +557,72 @@ with tab_pattern:
     )
     st.markdown('<div class="section-underline"></div>', unsafe_allow_html=True)
 
-    pattern_labels = []
-    for label in bag:
-        if category_of(label) == "putter":
-            continue
-        carry, total = compute_today(label, chs_today, offset)
-        sort_carry = carry if carry is not None else -1e9
-        pattern_labels.append((label, carry, total, sort_carry))
+    # Fragment: the club selectbox / shape radio rerun only this panel,
+    # not the CSS, config and the Clubs/Wedges tabs.
+    @st.fragment
+    @perf.timed("tab.shot_pattern")
+    def shot_pattern_panel(bag: list[str], chs_today: float, offset: float, profile_id: str):
+        import streamlit.components.v1 as components
+        from src.dispersion import table_for as dispersion_table_for
+        from src.shot_pattern import cached_pattern_svg
+
+        pattern_labels = []
+        for label in bag:
+            if category_of(label) == "putter":
+                continue
+            carry, total = compute_today(label, chs_today, offset)
+            sort_carry = carry if carry is not None else -1e9
+            pattern_labels.append((label, carry, total, sort_carry))
 
-    pattern_labels.sort(key=lambda x: x[3], reverse=True)
-    pattern_options = [x[0] for x in pattern_labels]
+        pattern_labels.sort(key=lambda x: x[3], reverse=True)
+        pattern_options = [x[0] for x in pattern_labels]
 
-    if not pattern_options:
-        st.info("No modeled clubs available for shot patterns.")
-    else:
-        if "shot_pattern_selected" not in st.session_state:
-            st.session_state.shot_pattern_selected = pattern_options[0]
-
-        if st.session_state.shot_pattern_selected not in pattern_options:
-            st.session_state.shot_pattern_selected = pattern_options[0]
-
-        st.markdown('<div class="pattern-panel">', unsafe_allow_html=True)
-
-        c1, c2 = st.columns([1.15, 0.85], vertical_alignment="bottom")
-        with c1:
-            selected_label = st.selectbox(
-                "Club",
-                pattern_options,
-                index=pattern_options.index(st.session_state.shot_pattern_selected),
-                key="shot_pattern_selected",
-                label_visibility="collapsed",
-            )
-        with c2:
-            shape = st.radio(
-                "Shot Shape",
-                ["Straight", "Fade", "Draw"],
-                horizontal=True,
-                key="shot_pattern_shape_tab",
-                label_visibility="collapsed",
-            )
+        if not pattern_options:
+            st.info("No modeled clubs available for shot patterns.")
+        else:
+            if "shot_pattern_selected" not in st.session_state:
+                st.session_state.shot_pattern_selected = pattern_options[0]
+
+            if st.session_state.shot_pattern_selected not in pattern_options:
+                st.session_state.shot_pattern_selected = pattern_options[0]
+
+            st.markdown('<div class="pattern-panel">', unsafe_allow_html=True)
+
+            c1, c2 = st.columns([1.15, 0.85], vertical_alignment="bottom")
+            with c1:
+                selected_label = st.selectbox(
+                    "Club",
+                    pattern_options,
+                    index=pattern_options.index(st.session_state.shot_pattern_selected),
+                    key="shot_pattern_selected",
+                    label_visibility="collapsed",
+                )
+            with c2:
+                shape = st.radio(
+                    "Shot Shape",
+                    ["Straight", "Fade", "Draw"],
+                    horizontal=True,
+                    key="shot_pattern_shape_tab",
+                    label_visibility="collapsed",
+                )
 
-        carry, total = compute_today(selected_label, chs_today, offset)
+            carry, total = compute_today(selected_label, chs_today, offset)
 
-        if carry is None or total is None:
-            st.info("Shot pattern is unavailable because this club does not currently have a modeled yardage.")
-        else:
-            pattern = simulate_shot_pattern(selected_label, carry, total, shape=shape, n=220, seed=11)
+            if carry is None or total is None:
+                st.info("Shot pattern is unavailable because this club does not currently have a modeled yardage.")
+            else:
+                # Fitted per-club dispersion for this profile, if any (else category defaults)
+                params = dispersion_table_for(profile_id).get(selected_label)
+                svg = cached_pattern_svg(selected_label, shape, carry, total, params)
+
+                st.markdown('<div class="pattern-chart-wrap">', unsafe_allow_html=True)
+                components.html(svg, height=630, scrolling=False)
+                st.markdown('</div>', unsafe_allow_html=True)
 
-            st.markdown('<div class="pattern-chart-wrap">', unsafe_allow_html=True)
-            components.html(
-                render_shot_pattern_svg(selected_label, shape, carry, total, pattern),
-                height=630,
-                scrolling=False,
-            )
             st.markdown('</div>', unsafe_allow_html=True)
 
-        st.markdown('</div>', unsafe_allow_html=True)
+    if tab_pattern.open:
+        shot_pattern_panel(bag, chs_today, offset, profile_id)
 
 # ---------------------------
 # Debug / Validation tab (FULL CATALOG)
@@ -789,250 +631,240 @@ with tab_debug:
     st.markdown('<div class="section-title"><div class="section-dot"></div><h3 style="margin:0;">Debug</h3></div>', unsafe_allow_html=True)
     st.markdown('<div class="section-underline"></div>', unsafe_allow_html=True)
 
-    enable_debug = st.checkbox("Enable debug output", value=False)
-    if enable_debug:
-        st.markdown("### Inputs")
-        st.write({
-            "driver_chs_mph": chs_today,
-            "offset_yd": offset,
-            "preset": preset,
-            "selected_clubs": len(bag),
-            "catalog_clubs": len(catalog),
-        })
-
-        TH = {
-            "gap_small": 4,
-            "gap_large_irons": 18,
-            "gap_large_woods": 25,
-            "rollout_driver_max": 45,
-            "rollout_driver_min": 5,
-            "rollout_iron_max": 22,
-            "rollout_iron_min": 0,
-            "monotonic_tol": 0.1,
-        }
-
-        def bucket(label: str) -> str:
-            cat = category_of(label)
-            if cat == "wedge":
-                return "wedge"
-            if cat == "putter":
-                return "putter"
-            if label == "Driver":
-                return "driver"
-            if "Wood" in label or label.endswith("W"):
-                return "wood"
-            if "H" in label:
-                return "hybrid"
-            if "U" in label:
-                return "utility"
-            return "iron"
-
-        st.markdown("### Modeled yardages (Full catalog)")
-
-        rows = []
-        for label in catalog:
-            if category_of(label) == "putter":
-                continue
+    @st.fragment
+    @perf.timed("tab.debug")
+    def debug_panel(bag: list[str], chs_today: float, offset: float, preset: str):
+        enable_debug = st.checkbox("Enable debug output", key="debug_enabled")
+        if enable_debug:
+            st.markdown("### Inputs")
+            st.write({
+                "driver_chs_mph": chs_today,
+                "offset_yd": offset,
+                "preset": preset,
+                "selected_clubs": len(bag),
+                "catalog_clubs": len(catalog),
+            })
 
-            carry, total = compute_today(label, chs_today, offset)
-            b = bucket(label)
+            from src.debug_tables import gap_frame, partials_frame, response_frame, yardage_frame
 
-            if carry is None or total is None:
-                rows.append({
-                    "club": label, "bucket": b,
-                    "carry": None, "total": None, "rollout": None,
-                    "flags": "no_model",
-                    "action": "Add/verify anchor mapping or label parsing for this club."
-                })
-                continue
+            st.markdown("### Modeled yardages (Full catalog)")
 
-            rollout = total - carry
-            flags = []
-            actions = []
-
-            if total < carry:
-                flags.append("total<cary")
-                actions.append("Check rollout_for() and rollout_defaults_yd in config.")
-
-            if carry <= 0 or total <= 0:
-                flags.append("non_positive")
-                actions.append("Check anchors / scaling logic; carry should be positive.")
-
-            if b in ("driver", "wood"):
-                if rollout < TH["rollout_driver_min"]:
-                    flags.append("rollout_low")
-                    actions.append("Rollout seems low for driver/woods; check rollout_defaults_yd.")
-                if rollout > TH["rollout_driver_max"]:
-                    flags.append("rollout_high")
-                    actions.append("Rollout seems high for driver/woods; check rollout_defaults_yd.")
-            if b == "iron":
-                if rollout < TH["rollout_iron_min"]:
-                    flags.append("rollout_neg")
-                    actions.append("Iron rollout negative; check rollout_defaults_yd.")
-                if rollout > TH["rollout_iron_max"]:
-                    flags.append("rollout_high")
-                    actions.append("Iron rollout high; check rollout_defaults_yd.")
-
-            rows.append({
-                "club": label,
-                "bucket": b,
-                "carry": round(carry, 1),
-                "total": round(total, 1),
-                "rollout": round(rollout, 1),
-                "flags": ", ".join(flags) if flags else "",
-                "action": " | ".join(actions) if actions else ""
-            })
+            # Columnar frames from one batched (CHS x club) evaluation (src/debug_tables.py)
+            yardages = yardage_frame(model, catalog, [chs_today], offset)
+            st.dataframe(yardages, use_container_width=True, hide_index=True, height=380)
 
-        rows.sort(key=lambda r: (r["carry"] is None, -(r["carry"] or -1e9)))
-        st.dataframe(rows, use_container_width=True, hide_index=True, height=380)
-
-        st.markdown("### Gapping checks (sorted by carry)")
-
-        modeled = [r for r in rows if r["carry"] is not None]
-        gaps = []
-        for i in range(len(modeled) - 1):
-            a = modeled[i]
-            b = modeled[i + 1]
-            gap = a["carry"] - b["carry"]
-            flags = []
-            actions = []
-
-            large_thr = TH["gap_large_irons"]
-            if a["bucket"] in ("driver", "wood") or b["bucket"] in ("driver", "wood"):
-                large_thr = TH["gap_large_woods"]
-
-            if gap < TH["gap_small"]:
-                flags.append("gap_small")
-                actions.append("Clubs may be redundant/too close; verify anchors or club list.")
-            if gap > large_thr:
-                flags.append("gap_large")
-                actions.append("Gap seems large; verify anchor curve or missing intermediate club.")
-
-            gaps.append({
-                "from": a["club"],
-                "to": b["club"],
-                "gap_yd": round(gap, 1),
-                "flags": ", ".join(flags) if flags else "",
-                "action": " | ".join(actions) if actions else ""
-            })
+            st.markdown("### Gapping checks (sorted by carry)")
 
-        show_all_gaps = st.checkbox("Show all gaps (including unflagged)", value=False)
-        gaps_to_show = gaps if show_all_gaps else [g for g in gaps if g["flags"]]
-        st.dataframe(gaps_to_show, use_container_width=True, hide_index=True, height=360)
+            gaps = gap_frame(yardages)
+            show_all_gaps = st.checkbox("Show all gaps (including unflagged)", value=False)
+            gaps_to_show = gaps if show_all_gaps else gaps[gaps["flags"] != ""]
+            st.dataframe(gaps_to_show, use_container_width=True, hide_index=True, height=360)
 
-        st.markdown("### Wedge partial validation")
+            st.markdown("### Wedge partial validation")
 
-        scheme = ["100%", "Choke-down", "75%", "50%", "25%"]
-        pct_map = {"25%": 0.40, "50%": 0.60, "75%": 0.80, "100%": 1.00}
+            st.caption(
+                f"Choke = full − {partial_scheme.choke_sub:g} yd; partial = full × feel^{partial_scheme.alpha:g} "
+                "(wedges.partials in config). Same matrix as the Wedges tab."
+            )
+            wedge_full = partials.full[[partials.labels.index(w) for w in wedge_catalog]]
+            st.dataframe(partials_frame(wedge_catalog, wedge_full, partial_scheme),
+                         use_container_width=True, hide_index=True, height=380)
 
-        wedge_rows = []
-        for label in catalog:
-            if category_of(label) != "wedge":
-                continue
+            st.markdown("### Response check (multi-CHS sanity)")
 
-            carry_full, _ = compute_today(label, chs_today, offset)
-            if carry_full is None:
-                wedge_rows.append({
-                    "wedge": label, "full_carry": None, "flags": "no_model",
-                    "action": "Add/verify wedge anchor mapping or label parsing."
-                })
-                continue
+            chs_points = st.multiselect(
+                "CHS points to compare",
+                options=[90, 95, 100, 105, 110, 115, 120, 125],
+                default=[95, 105, 115]
+            )
 
-            vals = {}
-            for k in scheme:
-                if k == "Choke-down":
-                    vals[k] = carry_full - choke_sub
-                else:
-                    vals[k] = carry_full * float(pct_map[k])
-
-            flags = []
-            actions = []
-
-            if vals["Choke-down"] > vals["100%"]:
-                flags.append("choke>100")
-                actions.append("Increase choke_down_subtract_yd in config.")
-
-            order = [vals["100%"], vals["75%"], vals["50%"], vals["25%"]]
-            if not all(order[i] >= order[i+1] - TH["monotonic_tol"] for i in range(len(order)-1)):
-                flags.append("partials_non_monotonic")
-                actions.append("Check percent_map for wedges; ensure 100>75>50>25.")
-
-            wedge_rows.append({
-                "wedge": label,
-                "full_carry": round(carry_full, 1),
-                "100%": round(vals["100%"], 1),
-                "Choke": round(vals["Choke-down"], 1),
-                "75%": round(vals["75%"], 1),
-                "50%": round(vals["50%"], 1),
-                "25%": round(vals["25%"], 1),
-                "flags": ", ".join(flags) if flags else "",
-                "action": " | ".join(actions) if actions else ""
-            })
+            top_n = st.slider("How many clubs to test (top by carry)", 5, 30, 14, 1)
 
-        wedge_rows.sort(key=lambda r: (r["full_carry"] is None, -(r["full_carry"] or -1e9)))
-        st.dataframe(wedge_rows, use_container_width=True, hide_index=True, height=380)
+            sample_labels = list(yardages.loc[yardages["carry"].notna(), "club"][:top_n])
+            sample_labels += [w for w in catalog if category_of(w) == "wedge"]
+            sample_labels = list(dict.fromkeys(sample_labels))
 
-        st.markdown("### Response check (multi-CHS sanity)")
+            resp = response_frame(model, sample_labels, chs_points, offset)
+            show_all_resp = st.checkbox("Show all response rows (including unflagged)", value=False)
+            resp_to_show = resp if show_all_resp else resp[resp["flags"] != ""]
+            st.dataframe(resp_to_show, use_container_width=True, hide_index=True, height=420)
 
-        chs_points = st.multiselect(
-            "CHS points to compare",
-            options=[90, 95, 100, 105, 110, 115, 120, 125],
-            default=[95, 105, 115]
-        )
+            st.markdown("### Bulk export (every CHS 90–135)")
+            st.caption("The four tables above at every 0.1 mph across the slider range, at this offset and "
+                       "profile, zipped one file per table. Written one 5 mph block at a time on click.")
+            export_format = st.radio("Format", ["csv", "parquet"], horizontal=True, key="debug_export_format")
+
+            def export_zip():
+                import tempfile
+                from src.debug_tables import export_blocks, write_export
+
+                # Compressed blocks spill to disk past 8 MiB; nothing holds the whole range uncompressed
+                out = tempfile.SpooledTemporaryFile(max_size=8 * 2**20)
+                write_export(out, export_blocks(model, catalog, partial_scheme, float(offset)), export_format)
+                out.seek(0)
+                return out
+
+            st.download_button(
+                "Download debug tables", data=export_zip, mime="application/zip",
+                file_name=f"yardage-debug-{model_key[:8]}-{export_format}-offset{offset:+g}.zip",
+            )
+
+            st.markdown("### Carry uncertainty (bootstrap P10–P90)")
+
+            if st.checkbox("Compute bootstrap bands", value=False):
+                if not chs_points:
+                    st.info("Pick at least one CHS point above.")
+                else:
+                    from src.bootstrap import cached_bands
+                    with st.spinner("Resampling anchors..."):
+                        bands = cached_bands(model_key, model, catalog, sorted(float(c) for c in chs_points))
+                    st.caption(
+                        f"{bands.n_boot} anchor resamples. Anchored clubs use their measured carry (no band); "
+                        "'curve' clubs come from the speed→carry fit, 'wedge_loft' from loft interpolation."
+                    )
+                    show_all_bands = st.checkbox("Show anchored clubs too", value=False)
+                    band_rows = bands.rows()
+                    if not show_all_bands:
+                        band_rows = [r for r in band_rows if r["source"] != "anchor"]
+                    st.dataframe(band_rows, use_container_width=True, hide_index=True, height=380)
+
+            st.markdown("### Recompute graph")
+            st.caption("What the last CHS/offset change invalidated in this session's card graph "
+                       "(src/graph.py), and which nodes have been recomputed since.")
+            st.dataframe(
+                [{"changed inputs": ", ".join(graph.last_changed) or "—",
+                  "invalidated": ", ".join(graph.last_invalidated) or "—",
+                  "recomputed": ", ".join(dict.fromkeys(graph.recomputed)) or "—"}],
+                use_container_width=True, hide_index=True,
+            )
+            fit = graph.get("response")
+            if fit is None:
+                st.caption("CHS response fit unavailable; card values use the power law directly.")
+            else:
+                st.caption(f"CHS response fit (src/response.py): degree {fit.degree} over "
+                           f"{fit.lo:.0f}–{fit.hi:.0f} mph, max error {fit.max_err:.2g} yd carry, "
+                           f"{fit.max_slope_err:.2g} yd/mph slope vs the power law.")
+
+            st.markdown("### Memory")
+            from src.memory import SESSION_BUDGET
+            usage = session_usage(st.session_state)
+            used = sum(usage.values())
+            st.caption(f"This session's state: {used / 1024:.1f} KiB of a {SESSION_BUDGET / 1024:.0f} KiB budget "
+                       "(YARDAGE_SESSION_BUDGET_KB). Shared models and store entries are not charged to it.")
+            evicted = st.session_state.get("_memory_evicted")
+            if evicted:
+                st.caption(f"Last evicted over budget: {', '.join(evicted)}")
+            st.dataframe(
+                [{"key": k, "KiB": round(v / 1024, 1)} for k, v in sorted(usage.items(), key=lambda kv: -kv[1])[:15]],
+                use_container_width=True, hide_index=True,
+            )
+            sstats = shared.stats()
+            st.caption(f"Shared store (process-wide, by reference): {sstats['entries']} entries, "
+                       f"{sstats['bytes'] / 1024:.0f} KiB of {sstats['budget'] / 2**20:.0f} MiB (YARDAGE_SHARED_MB), "
+                       f"{sstats['hits']} hits / {sstats['misses']} misses, {sstats['evictions']} evictions.")
+            if sstats["kinds"]:
+                st.dataframe(
+                    [{"kind": k, "entries": v["entries"], "KiB": round(v["bytes"] / 1024, 1)}
+                     for k, v in sstats["kinds"].items()],
+                    use_container_width=True, hide_index=True,
+                )
 
-        top_n = st.slider("How many clubs to test (top by carry)", 5, 30, 14, 1)
-
-        sample_labels = [r["club"] for r in modeled[:top_n]]
-        sample_labels += [w for w in catalog if category_of(w) == "wedge"]
-
-        seen = set()
-        sample_labels = [x for x in sample_labels if not (x in seen or seen.add(x))]
-
-        resp_rows = []
-        for label in sample_labels:
-            carries = []
-            for chs in chs_points:
-                c, _ = compute_today(label, float(chs), offset)
-                carries.append(c)
-
-            flags = []
-            actions = []
-
-            ok = True
-            for i in range(len(carries) - 1):
-                if carries[i] is None or carries[i+1] is None:
-                    ok = False
-                    break
-                if carries[i+1] < carries[i] - TH["monotonic_tol"]:
-                    ok = False
-                    break
-
-            if not ok:
-                flags.append("non_monotonic_vs_chs")
-                actions.append("Check responsiveness_exponent() / exponent_shape_p or speed estimation mapping.")
-
-            if 105 in chs_points and 115 in chs_points:
-                try:
-                    i105 = chs_points.index(105)
-                    i115 = chs_points.index(115)
-                    c105 = carries[i105]
-                    c115 = carries[i115]
-                    if c105 is not None and c115 is not None:
-                        delta = c115 - c105
-                        b = bucket(label)
-                        if b in ("iron", "wedge") and delta > 18:
-                            flags.append("too_sensitive_105_115")
-                            actions.append("Iron/wedge gain seems high; tune exponent_shape_p or category scaling.")
-                except ValueError:
-                    pass
-
-            row = {"club": label, "bucket": bucket(label)}
-            for chs, c in zip(chs_points, carries):
-                row[f"carry@{chs}"] = None if c is None else round(c, 1)
-            row["flags"] = ", ".join(flags) if flags else ""
-            row["action"] = " | ".join(actions) if actions else ""
-            resp_rows.append(row)
-
-        show_all_resp = st.checkbox("Show all response rows (including unflagged)", value=False)
-        resp_to_show = resp_rows if show_all_resp else [r for r in resp_rows if r["flags"]]
-        st.dataframe(resp_to_show, use_container_width=True, hide_index=True, height=420)
+            st.markdown("### Warm-up")
+            if not WARMUP_ENABLED:
+                st.caption("Background cache warm-up is off (YARDAGE_WARMUP=0).")
+            else:
+                job = warmup_job()
+                polling = job.state in ("idle", "running")
+
+                # Polls while the warm-up runs; one full rerun when it finishes stops the timer
+                @st.fragment(run_every=1.0 if polling else None)
+                def warmup_panel():
+                    snap = job.snapshot()
+                    st.progress(job.progress, text=f"Cache warm-up (src/warmup.py): {snap['state']}")
+                    st.dataframe(snap["stages"], use_container_width=True, hide_index=True)
+                    if polling and snap["state"] not in ("idle", "running"):
+                        st.rerun()
+
+                warmup_panel()
+
+            st.markdown("### Performance")
+
+            # Process-wide, so visitors can't switch it: set YARDAGE_PERF=1 when starting the server
+            recording = perf.enabled()
+            snap = perf.snapshot()
+            if not snap["timers"] and not recording:
+                st.info("Hot-path timings are off. Start the server with YARDAGE_PERF=1 to record "
+                        "compute_today, estimate_*, the shot pattern and each tab for every session.")
+            else:
+                st.caption(f"Recording {'on' if recording else 'off'} (YARDAGE_PERF); per-name totals since "
+                           "the server started. 'rerun' is the full script, recorded at its end.")
+                st.dataframe(
+                    [{"name": k, "calls": v["calls"], "total ms": round(v["total_s"] * 1e3, 1),
+                      "mean ms": round(v["mean_ms"], 3), "max ms": round(v["max_ms"], 2)}
+                     for k, v in snap["timers"].items()],
+                    use_container_width=True, hide_index=True,
+                )
+                st.dataframe(
+                    [{"cache": k, "lookups": v["lookups"], "hits": v["hits"], "misses": v["misses"],
+                      "hit rate": None if v["hit_rate"] is None else f"{v['hit_rate']:.0%}"}
+                     for k, v in snap["caches"].items()],
+                    use_container_width=True, hide_index=True,
+                )
+            d1, d2 = st.columns(2)
+            with d1:
+                st.download_button("Prometheus snapshot", perf.prometheus_text(), file_name="yardage_metrics.prom",
+                                   mime="text/plain")
+            with d2:
+                st.download_button("JSON snapshot", json.dumps(snap, indent=2), file_name="yardage_metrics.json",
+                                   mime="application/json")
+
+            st.markdown("### Profiler")
+            st.caption("Samples this session's stack every 5 ms during the next full-page reruns "
+                       "(CHS, preset, club changes). Other sessions are not profiled.")
+            p1, p2 = st.columns([1, 1], vertical_alignment="bottom")
+            with p1:
+                n_profile = st.number_input("Reruns to profile", 1, 20, 3, 1)
+            with p2:
+                if st.button("Profile next reruns"):
+                    st.session_state.profile_samples = Counter()
+                    st.session_state.profile_reruns_left = int(n_profile)
+
+            left = st.session_state.get("profile_reruns_left", 0)
+            samples = st.session_state.get("profile_samples")
+            if left:
+                st.info(f"Profiling: {left} full rerun(s) left.")
+            if samples:
+                from src.profiler import collapsed, flamegraph_svg, function_table
+                st.caption(f"{sum(samples.values())} samples, {len(samples)} distinct stacks.")
+                st.dataframe(function_table(samples)[:40], use_container_width=True, hide_index=True, height=360)
+                f1, f2 = st.columns(2)
+                with f1:
+                    st.download_button("Collapsed stacks", collapsed(samples), file_name="yardage_profile.folded",
+                                       mime="text/plain")
+                with f2:
+                    st.download_button("Flame graph (SVG)", flamegraph_svg(samples, "Yardage Card reruns"),
+                                       file_name="yardage_profile.svg", mime="image/svg+xml")
+
+    if tab_debug.open:
+        debug_panel(bag, chs_today, offset, preset)
+
+if perf.enabled():
+    perf.record("rerun", time.perf_counter() - _rerun_t0)
+
+# Started after the cards are queued so the first session's paint doesn't share the GIL with it
+if WARMUP_ENABLED:
+    warmup_job()
+
+if _sampler is not None:
+    del st.session_state["_profile_sampler"]
+    st.session_state.profile_samples.update(_sampler.stop())
+    st.session_state.profile_reruns_left -= 1
+
+# Per-session memory budget (src/memory.py): drop rebuildable state, largest first.
+# Finished profiler samples go too, but never mid-run.
+_evictable = ["_card_graph"]
+if not st.session_state.get("profile_reruns_left"):
+    _evictable.append("profile_samples")
+_evicted = enforce_budget(st.session_state, _evictable)
+if _evicted:
+    st.session_state["_memory_evicted"] = _evicted
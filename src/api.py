@@ -0,0 +1,304 @@
+"""
+Standalone JSON API for yardage cards and shot patterns.
+
+Plain ASGI callable (no framework), backed by the same model code as app.py:
+
+    uvicorn src.api:app --port 8600
+
+GET /card?chs=105&offset=0&preset=My%20Bag&profile=tour
+GET /pattern?club=7i&shape=Fade&chs=105&offset=0&profile=tour
+GET /solve?carry=7i:165&carry=PW:121[&offset=0]&profile=tour   (CHS/offset from carries)
+GET /metrics[?format=json]   (src.perf counters; record with YARDAGE_PERF=1)
+"""
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from src import perf
+from src.catalog import normalize_club_label
+from src.yardage import card_rows, compute_baseline
+from src.config import CompiledConfig, ConfigStore
+from src.dispersion import table_for as dispersion_table_for
+from src.estimates import category_of
+from src.lookup import TableStore, lookup_today
+from src.profiles import BASE_PROFILE
+from src.shot_pattern import DispersionParams, simulate_shot_pattern, summarize_pattern
+from src.solve import parse_observations, solve_chs
+
+CFG_PATH = Path(os.environ.get("YARDAGE_CONFIG", Path(__file__).resolve().parent.parent / "data" / "config.yaml"))
+
+CHS_RANGE = (90.0, 135.0)
+OFFSET_RANGE = (-25.0, 25.0)
+SHAPES = ("Straight", "Fade", "Draw")
+CACHE_MAX = 2048
+
+# Compiled config, hot-reloaded when the YAML changes (cache keys carry its digest)
+store = ConfigStore(CFG_PATH)
+# Shared mmap lookup file (python -m src.lookup build); optional, computed when absent
+tables = TableStore()
+
+class BadRequest(Exception):
+    pass
+
+# ---------------------------
+# Result cache + request coalescing
+# ---------------------------
+_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_inflight: Dict[tuple, "asyncio.Future[bytes]"] = {}
+
+async def _cached(key: tuple, build: Callable[[], bytes]) -> bytes:
+    """
+    Serve from the LRU if present; otherwise compute once per key, with
+    concurrent identical requests awaiting the same in-flight future. If the
+    computing request is cancelled (client went away), its waiters retry.
+    """
+    while True:
+        body = _cache.get(key)
+        if body is not None:
+            _cache.move_to_end(key)
+            perf.cache_lookup("api.result")
+            return body
+
+        fut = _inflight.get(key)
+        if fut is None:
+            break
+        perf.cache_lookup("api.result")
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            if not fut.cancelled():
+                raise  # this request itself was cancelled
+            # The leader was cancelled: look again, and become the leader if nobody else has
+
+    perf.cache_lookup("api.result", miss=True)
+
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    _inflight[key] = fut
+    try:
+        body = await loop.run_in_executor(None, build)
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        # Mark retrieved so lone failures don't log "exception never retrieved"
+        fut.exception()
+        raise
+    else:
+        fut.set_result(body)
+        _cache[key] = body
+        if len(_cache) > CACHE_MAX:
+            _cache.popitem(last=False)
+        return body
+    finally:
+        _inflight.pop(key, None)
+
+# ---------------------------
+# Query parsing
+# ---------------------------
+def _param(qs: dict, name: str, default: Optional[str] = None) -> Optional[str]:
+    vals = qs.get(name)
+    return vals[0] if vals else default
+
+def _float_param(qs: dict, name: str, default: float, lo: float, hi: float) -> float:
+    raw = _param(qs, name)
+    if raw is None or raw == "":
+        return default
+    try:
+        x = float(raw)
+    except ValueError:
+        raise BadRequest(f"{name} must be a number")
+    if not (lo <= x <= hi):
+        raise BadRequest(f"{name} must be between {lo:g} and {hi:g}")
+    # Normalize so 105, 105.0 and 105.00 share a cache entry
+    return round(x, 1)
+
+def _common(qs: dict) -> Tuple[float, float]:
+    chs = _float_param(qs, "chs", 105.0, *CHS_RANGE)
+    offset = _float_param(qs, "offset", 0.0, *OFFSET_RANGE)
+    return chs, offset
+
+def _profile(cc: CompiledConfig, qs: dict) -> Tuple[str, str]:
+    profile_id = _param(qs, "profile", BASE_PROFILE) or BASE_PROFILE
+    if profile_id not in cc.profiles.ids():
+        raise BadRequest(f"unknown profile: {profile_id}")
+    return profile_id, cc.profiles.key(profile_id)
+
+def _dumps(obj: dict) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+# ---------------------------
+# Handlers
+# ---------------------------
+def _round(x: Optional[float]) -> Optional[float]:
+    return None if x is None else round(x, 1)
+
+@perf.timed("api.build_card")
+def build_card(cc: CompiledConfig, profile_id: str, chs: float, offset: float, preset: str) -> bytes:
+    bag = list(cc.presets.get(preset, ()))
+    table, key = tables.get(), cc.profiles.key(profile_id)
+    rows = card_rows(cc.profiles.model(profile_id), bag, chs, offset,
+                     lambda model, *args: lookup_today(table, key, model, *args))
+    out = {"chs": chs, "offset": offset, "preset": preset, "profile": profile_id}
+    for section, section_rows in rows.items():
+        out[section] = [
+            {"club": r["club"], "carry": _round(r["carry"]), "total": _round(r["total"]), "gap": _round(r["gap"])}
+            for r in section_rows
+        ]
+    return _dumps(out)
+
+@perf.timed("api.build_pattern")
+def build_pattern(cc: CompiledConfig, profile_id: str, club: str, shape: str, chs: float, offset: float,
+                  params: Optional[DispersionParams] = None) -> bytes:
+    carry, total = lookup_today(tables.get(), cc.profiles.key(profile_id), cc.profiles.model(profile_id),
+                                club, chs, offset)
+    if carry is None or total is None:
+        return _dumps({"club": club, "shape": shape, "chs": chs, "offset": offset, "profile": profile_id, "error": "no_model"})
+
+    pattern = simulate_shot_pattern(club, carry, total, shape=shape, n=220, seed=11, params=params)
+    stats = summarize_pattern(pattern["carry_points"])  # type: ignore[arg-type]
+    return _dumps({
+        "club": club,
+        "shape": pattern["shape"],
+        "category": pattern["category"],
+        "chs": chs,
+        "offset": offset,
+        "profile": profile_id,
+        "carry": round(carry, 1),
+        "total": round(total, 1),
+        "summary": {k: (round(v, 2) if isinstance(v, float) else v) for k, v in stats.items()},
+        "carry_points": [[round(x, 2), round(y, 2)] for x, y in pattern["carry_points"]],  # type: ignore[union-attr]
+        "total_points": [[round(x, 2), round(y, 2)] for x, y in pattern["total_points"]],  # type: ignore[union-attr]
+    })
+
+@perf.timed("api.build_solve")
+def build_solve(cc: CompiledConfig, profile_id: str, observations: tuple, offset: Optional[float]) -> bytes:
+    try:
+        sol = solve_chs(cc.profiles.model(profile_id), observations, offset)
+    except ValueError as e:
+        return _dumps({"profile": profile_id, "error": str(e)})
+    return _dumps({
+        "profile": profile_id,
+        "chs": round(sol.chs, 2),
+        "offset": round(sol.offset, 2),
+        "offset_fitted": sol.offset_fitted,
+        "at_bound": sol.at_bound,
+        "rmse": round(sol.rmse, 2),
+        "residuals": [
+            {"club": r["club"], "observed": r["observed"], "predicted": _round(r["predicted"]),
+             "residual": _round(r["residual"])}
+            for r in sol.residuals
+        ],
+    })
+
+async def card_endpoint(qs: dict) -> bytes:
+    cc = store.get()
+    chs, offset = _common(qs)
+    profile_id, model_key = _profile(cc, qs)
+    preset = _param(qs, "preset", cc.default_preset)
+    if preset not in cc.presets:
+        raise BadRequest(f"unknown preset: {preset}")
+    return await _cached(("card", cc.digest, model_key, chs, offset, preset),
+                         lambda: build_card(cc, profile_id, chs, offset, preset))
+
+async def pattern_endpoint(qs: dict) -> bytes:
+    cc = store.get()
+    chs, offset = _common(qs)
+    profile_id, model_key = _profile(cc, qs)
+    raw = _param(qs, "club")
+    if not raw:
+        raise BadRequest("club is required")
+    # Same label parsing as /solve; only catalog clubs the profile's model covers
+    club = normalize_club_label(raw)
+    if club is None or club not in cc.catalog or category_of(club) == "putter":
+        raise BadRequest(f"unsupported club: {raw}")
+    if None in compute_baseline(cc.profiles.model(profile_id), club):
+        raise BadRequest(f"club not modeled for profile {profile_id}: {club}")
+    shape = (_param(qs, "shape", "Straight") or "Straight").strip().title()
+    if shape not in SHAPES:
+        raise BadRequest(f"shape must be one of {', '.join(SHAPES)}")
+    # Fitted dispersion (hashable) is part of the key, so refits invalidate
+    params = dispersion_table_for(profile_id).get(club)
+    return await _cached(("pattern", cc.digest, model_key, club, shape, chs, offset, params),
+                         lambda: build_pattern(cc, profile_id, club, shape, chs, offset, params))
+
+async def solve_endpoint(qs: dict) -> bytes:
+    cc = store.get()
+    profile_id, model_key = _profile(cc, qs)
+    raw = qs.get("carry") or []
+    if not raw:
+        raise BadRequest("at least one carry=club:yards is required")
+    try:
+        observations = tuple(parse_observations(raw))
+    except ValueError as e:
+        raise BadRequest(str(e))
+    offset = _float_param(qs, "offset", 0.0, *OFFSET_RANGE) if _param(qs, "offset") else None
+    return await _cached(("solve", cc.digest, model_key, observations, offset),
+                         lambda: build_solve(cc, profile_id, observations, offset))
+
+ROUTES: Dict[str, Callable[[dict], Awaitable[bytes]]] = {
+    "/card": card_endpoint,
+    "/pattern": pattern_endpoint,
+    "/solve": solve_endpoint,
+}
+
+# ---------------------------
+# ASGI entry point
+# ---------------------------
+async def _send_json(send, status: int, body: bytes, content_type: bytes = b"application/json",
+                     head: bool = False) -> None:
+    """head: HEAD request, so headers (with the GET body's length) and an empty body."""
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode("ascii")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": b"" if head else body})
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+
+    path = scope["path"].rstrip("/") or "/"
+    head = scope.get("method") == "HEAD"
+    if path == "/metrics":
+        qs = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if _param(qs, "format") == "json":
+            await _send_json(send, 200, _dumps(perf.snapshot()), head=head)
+        else:
+            await _send_json(send, 200, perf.prometheus_text().encode("utf-8"),
+                             b"text/plain; version=0.0.4; charset=utf-8", head=head)
+        return
+
+    handler = ROUTES.get(path)
+    if handler is None:
+        await _send_json(send, 404, _dumps({"error": "not found"}), head=head)
+        return
+    if scope["method"] not in ("GET", "HEAD"):
+        await _send_json(send, 405, _dumps({"error": "method not allowed"}))
+        return
+
+    qs = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    try:
+        body = await handler(qs)
+    except BadRequest as e:
+        await _send_json(send, 400, _dumps({"error": str(e)}), head=head)
+        return
+    await _send_json(send, 200, body, head=head)
@@ -0,0 +1,110 @@
+"""
+Load test for a local src.api instance (stdlib only).
+
+    uvicorn src.api:app --port 8600 --workers 1
+    python -m src.api_loadtest --url http://127.0.0.1:8600 --concurrency 64 --requests 5000
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+from urllib.parse import quote, urlsplit
+
+SHAPES = ["Straight", "Fade", "Draw"]
+PATTERN_CLUBS = ["Driver", "3W", "5i", "7i", "9i", "PW (46°)", "SW (56°)"]
+PRESETS = ["My Bag", "Tour Anchors"]
+
+def request_paths(n: int, seed: int) -> List[str]:
+    """Mixed traffic: mostly cards, integer CHS, a few offsets, some patterns."""
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(n):
+        chs = rng.randint(90, 135)
+        offset = rng.choice([0, 0, 0, -5, 5])
+        if rng.random() < 0.7:
+            preset = quote(rng.choice(PRESETS))
+            paths.append(f"/card?chs={chs}&offset={offset}&preset={preset}")
+        else:
+            club = quote(rng.choice(PATTERN_CLUBS))
+            paths.append(f"/pattern?club={club}&shape={rng.choice(SHAPES)}&chs={chs}&offset={offset}")
+    return paths
+
+async def _get(host: str, port: int, path: str) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+def _pct(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, int(round(q * (len(sorted_vals) - 1))))
+    return sorted_vals[idx]
+
+async def run(url: str, concurrency: int, n_requests: int, seed: int) -> dict:
+    parts = urlsplit(url)
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or 80
+
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for p in request_paths(n_requests, seed):
+        queue.put_nowait(p)
+
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while True:
+            try:
+                path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            t0 = time.perf_counter()
+            try:
+                status = await _get(host, port, path)
+            except OSError:
+                status = 0
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "rps": n_requests / elapsed if elapsed else 0.0,
+        "p50_ms": _pct(latencies, 0.50) * 1000,
+        "p95_ms": _pct(latencies, 0.95) * 1000,
+        "p99_ms": _pct(latencies, 0.99) * 1000,
+    }
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://127.0.0.1:8600")
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--requests", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    res = asyncio.run(run(args.url, args.concurrency, args.requests, args.seed))
+    print(
+        f"{res['requests']} requests @ c={res['concurrency']}: {res['rps']:.0f} req/s, "
+        f"p50 {res['p50_ms']:.1f} ms, p95 {res['p95_ms']:.1f} ms, p99 {res['p99_ms']:.1f} ms, "
+        f"errors {res['errors']}"
+    )
+
+if __name__ == "__main__":
+    main()
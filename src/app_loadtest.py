@@ -0,0 +1,419 @@
+"""
+Concurrent-session load test for app.py.
+
+Starts one `streamlit run app.py` server (or targets --url) and, for each
+session count N, opens N websocket sessions that speak the same protocol as
+the browser. Each session replays randomized interaction scripts: CHS slider
+drags, preset switches, tab switches, shape toggles and debug enablement.
+Widgets inside an st.fragment rerun just that fragment, as the browser
+would. Per level it reports:
+
+    p50/p95/p99   rerun latency, send -> script_finished
+    frag/other    p50 for widgets inside a fragment vs the rest
+    msgs/deltas   median ForwardMsgs and deltas per rerun, and wire KB
+    stream        median ms from a rerun's first to last delta (how long
+                  the page's layout takes to arrive)
+    cpu, cpu/s    server cores used, in total and per session
+    rss, +MB/s    server peak RSS, and its rise over the RSS at the level's
+                  start per session
+
+A discarded warm-up session of random interactions runs first, so lazy
+imports and caches are part of the idle baseline rather than the first level.
+
+    pip install -r requirements-dev.txt
+    python -m src.app_loadtest --sessions 1,4,8,16 --steps 20
+
+--full-reruns sends the same interactions as whole-script reruns, the way
+the app behaved before the Shot Pattern and Debug panels were fragments.
+Compare its "frag p50" with a normal run's: the same shape and debug
+interactions, run as the whole script instead of just the fragment.
+
+Rendered output is parsed with Streamlit's testing element tree, so widget
+values are serialized the same way AppTest does. AppTest itself cannot be
+used here: each run swaps a process-global Runtime, so concurrent AppTest
+sessions in one process interfere with each other.
+
+Server CPU/RSS come from /proc and are only reported on Linux with a
+locally started server.
+
+--cold-start N instead starts N fresh servers one after another and reports
+startup: time until the server is healthy, then for the first session the
+time to the first card grid (first paint) and to the end of its first run.
+
+    python -m src.app_loadtest --cold-start 5
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+SHAPES = ["Straight", "Fade", "Draw"]
+
+class Rerun(NamedTuple):
+    in_fragment: bool  # the interaction's widget sits in an st.fragment
+    seconds: float     # send -> script_finished
+    msgs: int          # ForwardMsgs received
+    deltas: int
+    nbytes: int
+    stream_s: float    # first -> last delta
+
+class Session:
+    """One browser-like websocket session."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        # label -> (widget node from the latest render, fragment id or "")
+        self.widgets: Dict[str, Tuple[object, str]] = {}
+        # widget id -> WidgetState for every widget this session has touched
+        self.states: Dict[str, object] = {}
+        self.errors: List[str] = []
+        # st.tabs widget id and the open tab (tabs rerun the script on change)
+        self.tabs_id = ""
+        self.tab = ""
+        # (msgs, deltas, bytes, stream seconds) of the latest rerun
+        self.last: Tuple[int, int, int, float] = (0, 0, 0, 0.0)
+
+    async def rerun(self, fragment_id: str = "") -> float:
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.testing.v1.element_tree import parse_tree_from_messages
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        deltas: List[ForwardMsg] = []
+        fragments: Dict[str, str] = {}
+        n_msgs = n_bytes = 0
+        first = last = None
+        while True:
+            raw = await self.ws.recv()
+            n_msgs += 1
+            n_bytes += len(raw)
+            fm = ForwardMsg()
+            fm.ParseFromString(raw)
+            kind = fm.WhichOneof("type")
+            if kind == "delta":
+                last = time.perf_counter()
+                first = first or last
+                deltas.append(fm)
+                if fm.delta.WhichOneof("type") == "add_block" and fm.delta.add_block.WhichOneof("type") == "tab_container":
+                    self.tabs_id = fm.delta.add_block.tab_container.id
+                if fm.delta.WhichOneof("type") == "new_element":
+                    el = fm.delta.new_element
+                    if el.WhichOneof("type") == "exception":
+                        self.errors.append(el.exception.message)
+                    widget = getattr(el, el.WhichOneof("type"), None)
+                    if getattr(widget, "id", ""):
+                        fragments[widget.id] = fm.delta.fragment_id
+            elif kind == "script_finished":
+                dt = time.perf_counter() - t0
+                break
+        self.last = (n_msgs, len(deltas), n_bytes, (last - first) if first else 0.0)
+
+        for node in parse_tree_from_messages(deltas):
+            label = getattr(node, "label", None)
+            node_id = getattr(node, "id", "")
+            if label and node_id:
+                self.widgets[label] = (node, fragments.get(node_id, ""))
+        return dt
+
+    def set(self, label: str, value) -> str:
+        """Set a widget's value; returns the fragment id to rerun ("" = full script)."""
+        from streamlit.testing.v1.element_tree import get_widget_state
+
+        hit = self.widgets.get(label)
+        if hit is None:
+            raise LookupError(f"no widget labelled {label!r} in the last rerun")
+        node, fragment_id = hit
+        if node.type in ("radio", "selectbox"):
+            # The wire value is the displayed option; the tree's own encoder
+            # needs the format_func that only an AppTest runner holds.
+            from streamlit.proto.WidgetStates_pb2 import WidgetState
+            if value not in node.options:
+                raise ValueError(f"{value!r} is not an option of {label!r}")
+            node._value = value
+            self.states[node.id] = WidgetState(id=node.id, string_value=value)
+        else:
+            node.set_value(value)
+            self.states[node.id] = get_widget_state(node)
+        return fragment_id
+
+    def open_tab(self, label: str) -> Optional[str]:
+        """Click a tab; None if it is already open or the tabs switch client-side (no rerun)."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        # Without a key (app revisions before stateful tabs) every tab is rendered
+        # and switching happens in the browser
+        if not self.tabs_id or label == self.tab:
+            return None
+        self.tab = label
+        self.states[self.tabs_id] = WidgetState(id=self.tabs_id, string_value=label)
+        return ""
+
+    def options(self, label: str) -> List[str]:
+        return list(self.widgets[label][0].options)
+
+    def current(self, label: str, default):
+        node, _ = self.widgets[label]
+        return node._value if node.id in self.states else default
+
+# A step returns the fragment id to rerun ("" = full script), or None to skip
+Step = Callable[[Session], Optional[str]]
+
+def _drag_slider(rng: random.Random) -> List[Step]:
+    """A drag lands as several value changes in a row."""
+    start = rng.randint(950, 1250)
+    step = rng.choice([-3, 3])
+    return [lambda s, v=(start + step * k) / 10: s.set("Driver CHS (mph)", v) for k in range(4)]
+
+def _switch_preset(rng: random.Random) -> List[Step]:
+    return [lambda s: s.set("Preset", rng.choice(s.options("Preset")))]
+
+def _toggle_shape(rng: random.Random) -> List[Step]:
+    return [lambda s: s.open_tab("Shot Pattern"), lambda s: s.set("Shot Shape", rng.choice(SHAPES))]
+
+def _toggle_debug(rng: random.Random) -> List[Step]:
+    return [lambda s: s.open_tab("Debug"),
+            lambda s: s.set("Enable debug output", not s.current("Enable debug output", False))]
+
+def _open_cards(rng: random.Random) -> List[Step]:
+    return [lambda s: s.open_tab(rng.choice(["Clubs", "Wedges"]))]
+
+# (weight, script); weights approximate a golfer poking at the card
+SCRIPTS = [(6, _drag_slider), (2, _switch_preset), (3, _toggle_shape), (1, _toggle_debug), (2, _open_cards)]
+
+async def run_session(url: str, seed: int, steps: int, think_s: float,
+                      reruns: List[Rerun], errors: List[str], full_reruns: bool = False) -> None:
+    import websockets
+
+    rng = random.Random(seed)
+    try:
+        async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            s = Session(ws)
+            await s.rerun()
+            done = 0
+            while done < steps:
+                script = rng.choices([sc for _, sc in SCRIPTS], weights=[w for w, _ in SCRIPTS])[0]
+                for action in script(rng):
+                    if done >= steps:
+                        break
+                    fragment_id = action(s)
+                    if fragment_id is None:
+                        continue
+                    dt = await s.rerun("" if full_reruns else fragment_id)
+                    reruns.append(Rerun(bool(fragment_id), dt, *s.last))
+                    done += 1
+                    if think_s:
+                        await asyncio.sleep(rng.uniform(0.5, 1.5) * think_s)
+            errors.extend(s.errors)
+    except Exception as e:  # a dead session must show up in the report
+        errors.append(f"{type(e).__name__}: {e}")
+
+def _proc_cpu_s(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _proc_rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return None
+
+def _wait_idle(pid: int, timeout: float = 60.0) -> None:
+    """Return once the server's RSS has stayed within 1 MB for a second (background warm-up done)."""
+    deadline = time.monotonic() + timeout
+    last = _proc_rss_mb(pid)
+    while last is not None and time.monotonic() < deadline:
+        time.sleep(1.0)
+        now = _proc_rss_mb(pid)
+        if now is None or abs(now - last) < 1.0:
+            return
+        last = now
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    i = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[i]
+
+async def run_level(url: str, n_sessions: int, steps: int, think_s: float, seed: int,
+                    server_pid: Optional[int] = None, full_reruns: bool = False) -> Dict[str, object]:
+    reruns: List[Rerun] = []
+    errors: List[str] = []
+    cpu0 = _proc_cpu_s(server_pid) if server_pid else None
+    rss0 = _proc_rss_mb(server_pid) if server_pid else None
+    rss_peak = [rss0]
+    t0 = time.perf_counter()
+    sessions = asyncio.gather(*(run_session(url, seed + i, steps, think_s, reruns, errors, full_reruns)
+                                for i in range(n_sessions)))
+    if rss0 is not None:
+        # Sessions release their state on disconnect; sample while they are live
+        while not sessions.done():
+            await asyncio.wait([sessions], timeout=0.2)
+            rss_peak.append(_proc_rss_mb(server_pid))
+    await sessions
+    wall = time.perf_counter() - t0
+    cpu1 = _proc_cpu_s(server_pid) if server_pid else None
+    cpu = (cpu1 - cpu0) / wall if cpu0 is not None and cpu1 is not None and wall else None
+    rss = max((v for v in rss_peak if v is not None), default=None)
+
+    lat = sorted(r.seconds for r in reruns)
+    # Split by interaction kind: widgets inside a fragment vs the rest (sent as full reruns under full_reruns)
+    frag = sorted(r.seconds for r in reruns if r.in_fragment)
+    other = sorted(r.seconds for r in reruns if not r.in_fragment)
+    return {
+        "sessions": n_sessions,
+        "reruns": len(lat),
+        "p50_ms": _percentile(lat, 0.50) * 1e3,
+        "p95_ms": _percentile(lat, 0.95) * 1e3,
+        "p99_ms": _percentile(lat, 0.99) * 1e3,
+        "fragment_p50_ms": _percentile(frag, 0.50) * 1e3 if frag else None,
+        "other_p50_ms": _percentile(other, 0.50) * 1e3 if other else None,
+        "fragment_reruns": len(frag),
+        "deltas_per_rerun": _percentile(sorted(r.deltas for r in reruns), 0.50),
+        "msgs_per_rerun": _percentile(sorted(r.msgs for r in reruns), 0.50),
+        "kb_per_rerun": _percentile(sorted(r.nbytes for r in reruns), 0.50) / 1024.0,
+        "stream_ms": _percentile(sorted(r.stream_s for r in reruns), 0.50) * 1e3,
+        "reruns_per_s": len(lat) / wall if wall else 0.0,
+        # Whole server process, then per session: cores / n and the peak's rise over the idle RSS / n
+        "cpu_cores": cpu,
+        "rss_mb": rss,
+        "cpu_per_session": cpu / n_sessions if cpu is not None else None,
+        "rss_mb_per_session": (rss - rss0) / n_sessions if rss is not None and rss0 is not None else None,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else "",
+    }
+
+def start_server(port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP_PATH), "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.terminate()
+    raise RuntimeError("streamlit server did not become healthy within 60s")
+
+async def first_paint(url: str) -> Tuple[float, float]:
+    """(ms to the first card grid, ms to script_finished) for a new session's first run."""
+    import websockets
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        t0 = time.perf_counter()
+        await ws.send(msg.SerializeToString())
+        paint = None
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await ws.recv())
+            kind = fm.WhichOneof("type")
+            if kind == "delta" and paint is None and fm.delta.WhichOneof("type") == "new_element":
+                el = fm.delta.new_element
+                if el.WhichOneof("type") == "markdown" and 'class="ygrid"' in el.markdown.body:
+                    paint = time.perf_counter() - t0
+            elif kind == "script_finished":
+                done = time.perf_counter() - t0
+                return (paint if paint is not None else float("nan")) * 1e3, done * 1e3
+
+def cold_start(port: int, runs: int) -> None:
+    print(f"{'run':>4} {'ready ms':>9} {'paint ms':>9} {'run ms':>8}")
+    results = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        proc = start_server(port)
+        ready = (time.perf_counter() - t0) * 1e3
+        try:
+            paint, done = asyncio.run(first_paint(f"ws://127.0.0.1:{port}/_stcore/stream"))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+        results.append((ready, paint, done))
+        print(f"{i + 1:>4} {ready:>9.0f} {paint:>9.0f} {done:>8.0f}", flush=True)
+    med = [sorted(col)[len(col) // 2] for col in zip(*results)]
+    print(f"{'med':>4} {med[0]:>9.0f} {med[1]:>9.0f} {med[2]:>8.0f}")
+
+def _fmt(v: Optional[float], spec: str, width: int) -> str:
+    return f"{'-':>{width}}" if v is None else f"{v:>{width}{spec}}"
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sessions", default="1,4,8,16", help="comma-separated session counts")
+    ap.add_argument("--steps", type=int, default=20, help="reruns per session")
+    ap.add_argument("--think-ms", type=float, default=250.0, help="mean pause between interactions")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--url", help="websocket URL of a running app (default: start one)")
+    ap.add_argument("--port", type=int, default=8599)
+    ap.add_argument("--full-reruns", action="store_true",
+                    help="rerun the whole script for fragment widgets too (the pre-fragment app)")
+    ap.add_argument("--cold-start", type=int, metavar="N", help="measure startup over N fresh servers instead")
+    args = ap.parse_args(argv)
+
+    if importlib.util.find_spec("websockets") is None:
+        raise SystemExit("src.app_loadtest needs the websockets package: pip install -r requirements-dev.txt")
+    if args.cold_start:
+        cold_start(args.port, args.cold_start)
+        return
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc = start_server(args.port)
+        url = f"ws://127.0.0.1:{args.port}/_stcore/stream"
+    try:
+        # Lazy tab imports, caches and the cache warm-up thread belong to the idle baseline,
+        # not to the first level: one discarded session of random interactions
+        asyncio.run(run_level(url, 1, max(args.steps, 20), 0.0, args.seed - 1))
+        if proc is not None:
+            _wait_idle(proc.pid)
+        print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'frag p50':>9} {'other p50':>9} {'msgs':>5} {'deltas':>6} {'KB':>6} {'stream':>7} "
+              f"{'rerun/s':>8} {'cpu':>5} {'cpu/s':>6} {'rss MB':>8} {'+MB/s':>6} {'err':>4}")
+        for n in [int(x) for x in args.sessions.split(",") if x.strip()]:
+            r = asyncio.run(run_level(url, n, args.steps, args.think_ms / 1e3, args.seed,
+                                      proc.pid if proc else None, args.full_reruns))
+            print(f"{r['sessions']:>8} {r['reruns']:>7} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+                  f"{_fmt(r['fragment_p50_ms'], '.1f', 9)} {_fmt(r['other_p50_ms'], '.1f', 9)} "
+                  f"{r['msgs_per_rerun']:>5.0f} {r['deltas_per_rerun']:>6.0f} {r['kb_per_rerun']:>6.1f} "
+                  f"{r['stream_ms']:>7.1f} {r['reruns_per_s']:>8.1f} {_fmt(r['cpu_cores'], '.2f', 5)} "
+                  f"{_fmt(r['cpu_per_session'], '.3f', 6)} {_fmt(r['rss_mb'], '.1f', 8)} "
+                  f"{_fmt(r['rss_mb_per_session'], '.2f', 6)} {r['errors']:>4}", flush=True)
+            if r["first_error"]:
+                print(f"         first error: {r['first_error']}", flush=True)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Offline benchmark suite with a stored baseline.
+
+Cases cover speed/carry estimation over the full catalog, shot-pattern
+simulation (n=220 / 10k / 1M), summarize_pattern, the SVG renderer,
+build_full_catalog, and a full app.py rerun through Streamlit's AppTest.
+Each case is timed `repeat` times after one warm-up call. The minimum is
+compared against data/bench/baseline.json, and the run exits non-zero when
+any case is slower than baseline * (1 + threshold).
+
+    python -m src.bench                     # compare against the baseline
+    python -m src.bench --save              # record a new baseline
+    python -m src.bench -k pattern --threshold 0.5
+    python -m src.bench --skip-slow         # skip the 1M simulation and AppTest
+
+Baselines are machine-specific; re-save after changing hardware.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = ROOT / "data" / "bench" / "baseline.json"
+CONFIG_PATH = ROOT / "data" / "config.yaml"
+THRESHOLD = 0.25
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    # setup() -> zero-arg callable that runs one iteration
+    setup: Callable[[], Callable[[], object]]
+    repeat: int = 5
+    slow: bool = False
+
+def _config() -> dict:
+    with CONFIG_PATH.open("r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+def _estimate_catalog():
+    from src.catalog import build_full_catalog
+    from src.estimates import LoftTable, anchors_by_label, estimate_carry, estimate_club_speed, fit_carry_curve
+    from src.yardage import anchors_from_cfg
+
+    anchors = anchors_from_cfg(_config()["baseline"]["anchors"])
+    amap = anchors_by_label(anchors)
+    fit = fit_carry_curve(anchors)
+    table = LoftTable.from_anchors(amap)
+    catalog = build_full_catalog()
+
+    def run():
+        for label in catalog:
+            spd = estimate_club_speed(label, amap, table)
+            if spd is not None:
+                estimate_carry(label, float(spd), amap, anchors, fit, table)
+    return run
+
+def _simulate(n: int):
+    def setup():
+        from src.shot_pattern import simulate_shot_pattern
+        return lambda: simulate_shot_pattern("7i", 176.0, 182.0, "Draw", n=n)
+    return setup
+
+def _summarize():
+    from src.shot_pattern import simulate_shot_pattern, summarize_pattern
+    points = simulate_shot_pattern("7i", 176.0, 182.0, "Draw", n=10_000)["carry_points"]
+    return lambda: summarize_pattern(points)
+
+def _render_svg():
+    from src.shot_pattern import render_shot_pattern_svg, simulate_shot_pattern
+    pattern = simulate_shot_pattern("Driver", 282.0, 297.0, "Fade")
+    return lambda: render_shot_pattern_svg("Driver", "Fade", 282.0, 297.0, pattern)
+
+def _catalog():
+    from src.catalog import build_full_catalog
+    return build_full_catalog
+
+def _app_rerun():
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"app.py raised: {at.exception[0].message}")
+    return at.run
+
+CASES: List[Case] = [
+    Case("estimate_catalog", _estimate_catalog, repeat=20),
+    Case("simulate_220", _simulate(220), repeat=50),
+    Case("simulate_10k", _simulate(10_000), repeat=10),
+    Case("simulate_1m", _simulate(1_000_000), repeat=2, slow=True),
+    Case("summarize_10k", _summarize, repeat=20),
+    Case("render_svg_220", _render_svg, repeat=50),
+    Case("build_full_catalog", _catalog, repeat=200),
+    Case("app_rerun", _app_rerun, repeat=5, slow=True),
+]
+
+def time_case(case: Case) -> Dict[str, float]:
+    fn = case.setup()
+    fn()  # warm-up
+    samples = []
+    for _ in range(case.repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {"min_s": min(samples), "median_s": statistics.median(samples), "repeat": case.repeat}
+
+def machine() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()}
+
+def load_baseline(path: Path) -> Optional[dict]:
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+def compare(results: Dict[str, Dict[str, float]], baseline: dict, threshold: float) -> List[str]:
+    """Names of cases whose min time exceeds baseline min * (1 + threshold)."""
+    base = baseline.get("cases", {})
+    return [name for name, r in results.items()
+            if name in base and r["min_s"] > base[name]["min_s"] * (1.0 + threshold)]
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    ap.add_argument("--skip-slow", action="store_true")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown fraction (default 0.25)")
+    ap.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    ap.add_argument("--save", action="store_true", help="write results as the new baseline")
+    args = ap.parse_args(argv)
+
+    cases = [c for c in CASES
+             if (not args.pattern or args.pattern in c.name) and not (args.skip_slow and c.slow)]
+    baseline = None if args.save else load_baseline(args.baseline)
+    if baseline is not None and baseline.get("machine") != machine():
+        print(f"warning: baseline recorded on {baseline.get('machine')}; comparing anyway", file=sys.stderr)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        r = time_case(case)
+        results[case.name] = r
+        line = f"{case.name:<20} min {r['min_s'] * 1e3:10.3f} ms  median {r['median_s'] * 1e3:10.3f} ms"
+        base = (baseline or {}).get("cases", {}).get(case.name)
+        if base:
+            line += f"  ({r['min_s'] / base['min_s'] - 1.0:+.0%} vs baseline)"
+        print(line)
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        prev = load_baseline(args.baseline) or {}
+        # Keep baseline entries for cases not run this time (-k / --skip-slow)
+        merged = {**prev.get("cases", {}), **results}
+        doc = {"machine": machine(), "cases": dict(sorted(merged.items()))}
+        args.baseline.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return
+
+    if baseline is None:
+        print(f"no baseline at {args.baseline}; run with --save to record one", file=sys.stderr)
+        return
+    regressed = compare(results, baseline, args.threshold)
+    if regressed:
+        print(f"REGRESSION (> {args.threshold:.0%} slower): {', '.join(regressed)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Bootstrap confidence bands for modeled carries.
+
+Anchors are resampled with replacement thousands of times. Each replicate
+refits the global speed->carry power law (one batched least-squares over all
+replicates at once) and re-interpolates the wedge loft table. Each club's
+baseline carry is recomputed from the refit, then scaled to each CHS.
+
+Only the carry mapping is resampled: club speeds for interpolated clubs are
+held at the model's estimate, and anchored clubs keep their measured carry,
+so their band is a point.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.yardage import CardModel, compute_baseline, shape_p
+from src.estimates import category_of, interp_extrap, parse_loft, responsiveness_exponent
+from src.memory import shared
+
+N_BOOT = 4000
+CHUNKS = 8
+
+@dataclass(frozen=True)
+class BootstrapBands:
+    labels: Tuple[str, ...]
+    chs: Tuple[float, ...]
+    source: Tuple[str, ...]   # "anchor" | "curve" | "wedge_loft" | "no_model"
+    p10: np.ndarray           # (clubs, chs)
+    p50: np.ndarray
+    p90: np.ndarray
+    n_boot: int
+
+    def rows(self) -> List[dict]:
+        out = []
+        for i, label in enumerate(self.labels):
+            row = {"club": label, "source": self.source[i]}
+            for j, c in enumerate(self.chs):
+                if np.isnan(self.p50[i, j]):
+                    row[f"@{c:g}"] = None
+                else:
+                    row[f"@{c:g}"] = f"{self.p10[i, j]:.0f}–{self.p90[i, j]:.0f}"
+            out.append(row)
+        return out
+
+def _replicate_chunk(args) -> np.ndarray:
+    """
+    Worker: baseline carries for `n` replicates -> array (n, clubs).
+    Top-level function so it pickles for the process pool.
+    """
+    (seed, n, curve_pts, wedge_pts, curve_speeds, wedge_lofts) = args
+    rng = np.random.default_rng(seed)
+    out = np.full((n, len(curve_speeds) + len(wedge_lofts)), np.nan)
+
+    # Batched log-log least squares over all replicates: rows = replicates
+    cp = np.asarray(curve_pts, dtype=np.float64)
+    idx = rng.integers(0, len(cp), size=(n, len(cp)))
+    x = np.log(cp[idx, 0])
+    y = np.log(cp[idx, 1])
+    xbar = x.mean(axis=1, keepdims=True)
+    ybar = y.mean(axis=1, keepdims=True)
+    den = ((x - xbar) ** 2).sum(axis=1)
+    b = np.where(den > 0, ((x - xbar) * (y - ybar)).sum(axis=1) / np.where(den > 0, den, 1.0), np.nan)
+    log_a = ybar[:, 0] - b * xbar[:, 0]
+    if len(curve_speeds):
+        out[:, :len(curve_speeds)] = np.exp(log_a[:, None] + b[:, None] * np.log(np.asarray(curve_speeds))[None, :])
+
+    # Wedge loft interpolation per replicate (distinct lofts vary per draw)
+    if len(wedge_lofts) and len(wedge_pts) >= 2:
+        wp = np.asarray(wedge_pts, dtype=np.float64)
+        q = np.asarray(wedge_lofts, dtype=np.float64)
+        widx = rng.integers(0, len(wp), size=(n, len(wp)))
+        for r in range(n):
+            pts = wp[np.unique(widx[r])]
+            if len(pts) < 2:
+                continue
+            out[r, len(curve_speeds):] = interp_extrap(q, pts[:, 0], pts[:, 1])
+    return out
+
+def bootstrap_bands(model: CardModel, labels: Sequence[str], chs_points: Sequence[float],
+                    n_boot: int = N_BOOT, seed: int = 7, workers: Optional[int] = None) -> BootstrapBands:
+    """workers=None uses the default process pool size; workers=0 runs in-process."""
+    labels = [l for l in labels if category_of(l) != "putter"]
+    curve_pts = [(a.club_speed_mph, a.carry_yd) for a in model.anchors
+                 if a.category in ("wood", "hybrid", "iron", "wedge")]
+    wedge_pts = sorted(
+        (float(a.loft_deg if a.loft_deg is not None else parse_loft(a.label)), a.carry_yd)
+        for a in model.anchors
+        if a.category == "wedge" and (a.loft_deg is not None or parse_loft(a.label) is not None)
+    )
+
+    source: List[str] = []
+    speeds: List[Optional[float]] = []
+    curve_cols: List[int] = []
+    wedge_cols: List[int] = []
+    for i, label in enumerate(labels):
+        spd, _ = compute_baseline(model, label)
+        speeds.append(spd)
+        if spd is None:
+            source.append("no_model")
+        elif label in model.anchor_map:
+            source.append("anchor")
+        elif category_of(label) == "wedge" and parse_loft(label) is not None and len(wedge_pts) >= 2:
+            source.append("wedge_loft")
+            wedge_cols.append(i)
+        else:
+            source.append("curve")
+            curve_cols.append(i)
+
+    curve_speeds = [float(speeds[i]) for i in curve_cols]
+    wedge_lofts = [float(parse_loft(labels[i])) for i in wedge_cols]
+
+    chunks = max(1, min(CHUNKS, n_boot // 250))
+    sizes = [n_boot // chunks + (1 if k < n_boot % chunks else 0) for k in range(chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+    tasks = [(s, n, curve_pts, wedge_pts, curve_speeds, wedge_lofts) for s, n in zip(seeds, sizes)]
+    if workers == 0 or chunks == 1:
+        parts = [_replicate_chunk(t) for t in tasks]
+    else:
+        # spawn: forking a threaded server process (Streamlit, uvicorn) is unsafe
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            parts = list(ex.map(_replicate_chunk, tasks))
+    reps = np.vstack(parts)  # (n_boot, len(curve_cols) + len(wedge_cols))
+
+    chs = np.asarray(chs_points, dtype=np.float64)
+    n_clubs = len(labels)
+    p10 = np.full((n_clubs, len(chs)), np.nan)
+    p50 = np.full_like(p10, np.nan)
+    p90 = np.full_like(p10, np.nan)
+
+    base_q = np.full((n_clubs, 3), np.nan)
+    cols = curve_cols + wedge_cols
+    if cols:
+        base_q[cols] = np.nanpercentile(reps, [10, 50, 90], axis=0).T
+    for i, label in enumerate(labels):
+        if source[i] == "anchor":
+            base_q[i] = model.anchor_map[label].carry_yd
+
+    for i in range(n_clubs):
+        if speeds[i] is None:
+            continue
+        g = responsiveness_exponent(float(speeds[i]), model.chs0, shape_p(model, labels[i]))
+        factor = (chs / model.chs0) ** g
+        p10[i], p50[i], p90[i] = base_q[i, 0] * factor, base_q[i, 1] * factor, base_q[i, 2] * factor
+
+    return BootstrapBands(tuple(labels), tuple(float(c) for c in chs), tuple(source), p10, p50, p90, n_boot)
+
+# Results cached per (model content hash, CHS points, n_boot, seed) in the
+# byte-bounded shared store, handed out by reference
+def cached_bands(model_key: str, model: CardModel, labels: Sequence[str], chs_points: Sequence[float],
+                 n_boot: int = N_BOOT, seed: int = 7) -> BootstrapBands:
+    key = ("bootstrap_bands", model_key, tuple(labels), tuple(chs_points), n_boot, seed)
+    return shared.get_or_create(key, lambda: bootstrap_bands(model, labels, chs_points, n_boot, seed))
@@ -0,0 +1,297 @@
+"""
+Static yardage cards for printing or other apps.
+
+Renders the Clubs and Wedges cards for every CHS in a range x every preset x
+the chosen offsets. The markup is the app's own (src.cards) with CARD_CSS
+inlined, as a standalone .html page, or as a fixed-width .txt card for
+plain printing. The values come from the same card graph and wedge matrix
+the app uses.
+
+    python -m src.card_export --out cards                          # 90-135 every 1 mph, offset 0
+    python -m src.card_export --out cards --step 0.1 --offsets=-5,0,5 --format txt
+
+Layout: <out>/<profile>/<preset>/offset<+n>/<chs>.<fmt>, plus manifest.json.
+
+Cards are rendered in chunks on a spawn process pool, each worker filling one
+(preset, offset) chunk of CHS values from one incrementally updated card
+graph. Workers write their files as they go, and the manifest is saved as
+chunks finish, so an interrupted run keeps what it wrote. For each card the
+manifest records
+
+    inputs   hash of config digest, model key, bag, CHS, offset, format and
+             the renderer source. A card whose inputs hash matches and whose
+             file exists is not rendered again.
+    sha256   hash of the rendered content. A re-rendered card with the same
+             content is not rewritten, so mtimes (and rsync, print queues)
+             only see real changes.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.cards import CARD_CSS, clubs_grid_html, wedges_grid_html
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "data" / "config.yaml"
+
+CHS_RANGE = (90.0, 135.0)
+FORMATS = ("html", "txt")
+CHUNK_CARDS = 48
+MANIFEST = "manifest.json"
+MANIFEST_EVERY_S = 1.0
+
+PAGE_CSS = """
+body { margin: 0 auto; padding: 16px; max-width: 900px; font-family: system-ui, sans-serif;
+       color: var(--ink); background: var(--cream); }
+h1 { font-size: 1.3rem; margin: 0 0 4px 0; }
+h2 { font-size: 1.0rem; margin: 14px 0 8px 0; color: var(--augusta-green-dark); }
+@media print {
+  body { background: #fff; padding: 0; }
+  .ycard { break-inside: avoid; box-shadow: none; backdrop-filter: none; }
+  .ycard:hover { transform: none; }
+}
+"""
+
+# Renderer source in every inputs hash: markup or layout changes re-render everything
+_RENDERER = hashlib.sha256(b"".join(
+    (Path(__file__).resolve().parent / name).read_bytes() for name in ("cards.py", "card_export.py")
+)).hexdigest()[:16]
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "preset"
+
+def card_path(profile_id: str, preset: str, offset: float, chs: float, fmt: str) -> str:
+    return f"{slug(profile_id)}/{slug(preset)}/offset{offset:+g}/{chs:.1f}.{fmt}"
+
+def inputs_key(cfg_digest: str, model_key: str, bag: Sequence[str], chs: float, offset: float, fmt: str) -> str:
+    blob = json.dumps([cfg_digest, model_key, list(bag), round(chs, 1), float(offset), fmt, _RENDERER])
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+def html_page(title: str, badges: Sequence[str], clubs_html: str, wedges_html: str) -> str:
+    badge_html = "".join(f'<div class="badge">{b}</div>' for b in badges)
+    return (
+        '<!doctype html><html><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f"<title>{title}</title><style>{CARD_CSS}{PAGE_CSS}</style></head><body>"
+        f'<h1>{title}</h1><div class="badges">{badge_html}</div>'
+        f"<h2>Clubs</h2>{clubs_html}<h2>Wedges</h2>{wedges_html}</body></html>\n"
+    )
+
+def _yd(x: Optional[float]) -> str:
+    return "—" if x is None else f"{x:.0f}"
+
+def text_card(title: str, badges: Sequence[str], club_rows: List[dict], wedge_rows: List[dict],
+              partials: Dict[str, List[Tuple[str, Optional[float]]]], loft_texts: Dict[str, str]) -> str:
+    lines = [title, " · ".join(badges), "", f"{'CLUBS':<20}{'Carry':>6}{'Total':>7}{'Gap':>6}"]
+    for r in club_rows:
+        loft = loft_texts.get(r["club"])
+        name = f"{r['club']} ({loft})" if loft else r["club"]
+        gap = "" if r["gap"] is None else f"+{r['gap']:.0f}"
+        lines.append(f"{name:<20}{_yd(r['carry']):>6}{_yd(r['total']):>7}{gap:>6}")
+    cols = [k for k, _ in next(iter(partials.values()), [])]
+    lines += ["", f"{'WEDGES':<20}{'Carry':>6}{'Total':>7}" + "".join(f"{k:>7}" for k in cols)]
+    for r in wedge_rows:
+        cells = dict(partials.get(r["club"], []))
+        lines.append(f"{r['club']:<20}{_yd(r['carry']):>6}{_yd(r['total']):>7}"
+                     + "".join(f"{_yd(cells.get(k)):>7}" for k in cols))
+    return "\n".join(lines) + "\n"
+
+# Per-worker compiled config (spawned workers load it once)
+_cc = None
+
+def _config(path: str):
+    global _cc
+    if _cc is None or _cc[0] != path:
+        from src.config import load_compiled
+        _cc = (path, load_compiled(Path(path)))
+    return _cc[1]
+
+def _write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def render_chunk(task: tuple) -> List[Tuple[str, str, str, bool]]:
+    """
+    Render and write one (profile, preset, offset) run of CHS values.
+    Returns [(relpath, inputs, sha256, written)].
+    """
+    from src.graph import card_groups, shared_card_graph
+    from src.partials import PartialScheme, build_wedge_matrix
+
+    config_path, out_dir, profile_id, preset, offset, chs_values, fmt, old = task
+    cc = _config(config_path)
+    model, model_key = cc.profiles.model(profile_id), cc.profiles.key(profile_id)
+    bag = list(cc.presets[preset])
+    clubs, wedges, labels = card_groups(list(cc.catalog), bag)
+    graph = shared_card_graph(model, model_key, labels, chs_values[0], offset)
+    graph.group("clubs", clubs)
+    graph.group("wedges", wedges)
+    scheme = PartialScheme.from_config(cc)
+    profile = [f"Profile: {cc.profiles.name(profile_id)}"] if len(cc.profiles.ids()) > 1 else []
+
+    out = []
+    for chs in chs_values:
+        graph.set(chs=chs, offset=offset)
+        max_carry = graph.get("max_carry")
+        club_rows, wedge_rows = graph.rows("clubs"), graph.rows("wedges")
+        matrix = build_wedge_matrix(model, wedges, scheme, chs).with_offset(offset)
+        partials = {r["club"]: matrix.cells(r["club"]) for r in wedge_rows}
+        title = f"Yardage Card · {preset}"
+        badges = [f"CHS: {chs:.1f} mph", f"Offset: {offset:+.0f} yd", f"Preset: {preset}"] + profile
+        if fmt == "html":
+            body = html_page(title, badges, clubs_grid_html(club_rows, max_carry, cc.loft_texts),
+                             wedges_grid_html(wedge_rows, max_carry, partials))
+        else:
+            body = text_card(title, badges, club_rows, wedge_rows, partials, dict(cc.loft_texts))
+        data = body.encode("utf-8")
+        rel = card_path(profile_id, preset, offset, chs, fmt)
+        sha = hashlib.sha256(data).hexdigest()
+        written = old.get(rel) != sha or not (Path(out_dir) / rel).exists()
+        if written:
+            _write(Path(out_dir) / rel, data)
+        out.append((rel, inputs_key(cc.digest, model_key, bag, chs, offset, fmt), sha, written))
+    return out
+
+def _tenths(x: float, what: str) -> int:
+    """x in tenths of a mph; ValueError unless x is a whole multiple of 0.1."""
+    t = round(x * 10)
+    if abs(x * 10 - t) > 1e-6:
+        raise ValueError(f"{what} must be a multiple of 0.1 mph (the app's slider step), got {x:g}")
+    return t
+
+def chs_grid(lo: float, hi: float, step: float) -> List[float]:
+    """lo, lo + step, ... up to hi. All three must be multiples of 0.1 mph, so card paths and inputs name the exact CHS."""
+    a, b, d = _tenths(lo, "chs_min"), _tenths(hi, "chs_max"), _tenths(step, "step")
+    if d <= 0:
+        raise ValueError("step must be at least 0.1 mph")
+    return [t / 10 for t in range(a, b + 1, d)]
+
+def export_cards(out_dir: Path, config_path: Path = CONFIG_PATH, profile_id: Optional[str] = None,
+                 presets: Optional[Sequence[str]] = None, offsets: Sequence[float] = (0.0,),
+                 chs_values: Optional[Sequence[float]] = None, fmt: str = "html", workers: Optional[int] = None,
+                 progress=None) -> dict:
+    """
+    Render every missing or stale card under out_dir. Returns counts:
+    cards, skipped (inputs unchanged), rendered, written (content changed), seconds.
+    """
+    from src.config import load_compiled
+    from src.profiles import BASE_PROFILE
+
+    t0 = time.perf_counter()
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    cc = load_compiled(config_path)
+    profile_id = profile_id or BASE_PROFILE
+    if profile_id not in cc.profiles.ids():
+        raise ValueError(f"unknown profile: {profile_id}")
+    presets = list(presets or cc.preset_names)
+    unknown = [p for p in presets if p not in cc.presets]
+    if unknown:
+        raise ValueError(f"unknown preset(s): {', '.join(unknown)}")
+    chs_values = list(chs_values or chs_grid(*CHS_RANGE, 1.0))
+    # card_path() and inputs_key() name CHS to 0.1 mph; anything finer would collide
+    chs_values = [_tenths(chs, "CHS") / 10 for chs in chs_values]
+    model_key = cc.profiles.key(profile_id)
+
+    out_dir = Path(out_dir)
+    manifest_path = out_dir / MANIFEST
+    try:
+        manifest: Dict[str, dict] = json.loads(manifest_path.read_text())["cards"]
+    except (OSError, ValueError, KeyError):
+        manifest = {}
+
+    tasks, total = [], 0
+    for preset in presets:
+        bag = cc.presets[preset]
+        for offset in offsets:
+            pending = []
+            for chs in chs_values:
+                total += 1
+                rel = card_path(profile_id, preset, offset, chs, fmt)
+                entry = manifest.get(rel)
+                if entry is None or entry.get("inputs") != inputs_key(cc.digest, model_key, bag, chs, offset, fmt) \
+                        or not (out_dir / rel).exists():
+                    pending.append(chs)
+            for i in range(0, len(pending), CHUNK_CARDS):
+                chunk = pending[i:i + CHUNK_CARDS]
+                old = {card_path(profile_id, preset, offset, c, fmt): manifest.get(
+                    card_path(profile_id, preset, offset, c, fmt), {}).get("sha256") for c in chunk}
+                tasks.append((str(config_path), str(out_dir), profile_id, preset, float(offset), chunk, fmt, old))
+
+    stats = {"cards": total, "skipped": total - sum(len(t[5]) for t in tasks), "rendered": 0, "written": 0}
+    saved = time.perf_counter()
+
+    def record(results) -> None:
+        nonlocal saved
+        for rel, inputs, sha, written in results:
+            manifest[rel] = {"inputs": inputs, "sha256": sha}
+            stats["rendered"] += 1
+            stats["written"] += written
+        if progress is not None:
+            progress(stats)
+        if time.perf_counter() - saved >= MANIFEST_EVERY_S:
+            _save_manifest(manifest_path, manifest)
+            saved = time.perf_counter()
+
+    workers = min(os.cpu_count() or 1, len(tasks)) if workers is None else workers
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            record(render_chunk(task))
+    else:
+        # spawn: forking a threaded server process (Streamlit, uvicorn) is unsafe
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            for fut in as_completed([ex.submit(render_chunk, t) for t in tasks]):
+                record(fut.result())
+    if tasks or not manifest_path.exists():
+        _save_manifest(manifest_path, manifest)
+    stats["seconds"] = round(time.perf_counter() - t0, 2)
+    return stats
+
+def _save_manifest(path: Path, cards: Dict[str, dict]) -> None:
+    _write(path, json.dumps({"cards": dict(sorted(cards.items()))}, indent=1).encode("utf-8"))
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--out", type=Path, required=True)
+    ap.add_argument("--config", type=Path, default=CONFIG_PATH)
+    ap.add_argument("--profile", default=None)
+    ap.add_argument("--preset", action="append", help="repeatable; default every preset")
+    ap.add_argument("--offsets", default="0", help="comma-separated yards, e.g. --offsets=-5,0,5")
+    ap.add_argument("--chs-min", type=float, default=CHS_RANGE[0])
+    ap.add_argument("--chs-max", type=float, default=CHS_RANGE[1])
+    ap.add_argument("--step", type=float, default=1.0,
+                    help="mph between cards, a multiple of 0.1 (0.1 = every slider value)")
+    ap.add_argument("--format", choices=FORMATS, default="html")
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: CPU count; 1 = inline)")
+    args = ap.parse_args(argv)
+
+    try:
+        offsets = [float(x) for x in args.offsets.split(",") if x.strip()]
+    except ValueError:
+        ap.error(f"offsets must be numbers: {args.offsets!r}")
+    if not CHS_RANGE[0] <= args.chs_min <= args.chs_max <= CHS_RANGE[1]:
+        ap.error(f"CHS range must be within {CHS_RANGE[0]:g}-{CHS_RANGE[1]:g}")
+
+    def progress(s: dict) -> None:
+        print(f"\r{s['skipped'] + s['rendered']}/{s['cards']} cards", end="", file=sys.stderr, flush=True)
+
+    try:
+        chs_values = chs_grid(args.chs_min, args.chs_max, args.step)
+        stats = export_cards(args.out, args.config, args.profile, args.preset, offsets,
+                             chs_values, args.format, args.workers, progress)
+    except ValueError as e:
+        ap.error(str(e))
+    print(f"\r{stats['cards']} cards in {args.out}: {stats['skipped']} unchanged inputs, "
+          f"{stats['rendered']} rendered, {stats['written']} written, {stats['seconds']} s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Card HTML for the Clubs and Wedges tabs.
+
+Each tab is rendered as a single HTML payload laid out with CSS grid
+(`.ygrid`), instead of one st.markdown per card inside st.columns pairs.
+CARD_CSS styles the markup; app.py injects it and the static exporter
+(src/card_export.py) inlines it.
+"""
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from src.estimates import category_of
+
+# (cell label, value or None for "no model", bar fill 0..1)
+WedgeCell = Tuple[str, Optional[float], float]
+
+CARD_CSS = """
+/* Augusta-inspired palette */
+:root{
+  --augusta-green: #006747;
+  --augusta-green-dark: #004c35;
+  --azalea-pink: #e86aa3;
+  --gold: #d4af37;
+  --cream: #fbf7ef;
+  --ink: #10201a;
+  --muted: rgba(16,32,26,0.65);
+  --line: rgba(16,32,26,0.12);
+}
+
+/* badges */
+.badges { display:flex; gap:8px; flex-wrap:wrap; margin: 6px 0 12px 0; }
+.badge {
+  padding: 4px 10px;
+  border-radius: 999px;
+  border: 1px solid rgba(16,32,26,0.10);
+  background: rgba(255,255,255,0.70);
+  font-size: 0.78rem;
+  font-weight: 800;
+  color: rgba(16,32,26,0.75);
+  max-width: 100%;
+  white-space: nowrap;
+  overflow: hidden;
+  text-overflow: ellipsis;
+  box-shadow: 0 1px 0 rgba(0,0,0,0.03);
+}
+
+/* cards */
+.ycard {
+  padding: 10px 12px;
+  border: 1px solid var(--line);
+  border-left: 6px solid var(--augusta-green);
+  background: rgba(255,255,255,0.75);
+  backdrop-filter: blur(4px);
+  border-radius: 16px;
+  margin-bottom: 10px;
+  box-shadow: 0 1px 0 rgba(0,0,0,0.03);
+  position: relative;
+  overflow: hidden;
+  transition: transform 120ms ease, box-shadow 120ms ease, border-color 120ms ease;
+}
+.ycard:hover{
+  transform: translateY(-1px);
+  box-shadow: 0 6px 18px rgba(0,0,0,0.06);
+  border-color: rgba(16,32,26,0.18);
+}
+.ycard:before{
+  content:"";
+  position:absolute;
+  left:0; top:0;
+  width:100%; height:40%;
+  background: linear-gradient(180deg, rgba(255,255,255,0.55), rgba(255,255,255,0.0));
+  pointer-events:none;
+}
+
+.yrow { display:flex; justify-content: space-between; align-items: baseline; gap: 10px; }
+.yclub { font-size: 1.0rem; font-weight: 800; color: var(--ink); }
+.ycloft{
+  font-size: 0.78rem;
+  font-weight: 700;
+  color: rgba(16,32,26,0.50);
+  margin-left: 6px;
+}
+.yvals {
+  font-size: 1.18rem;
+  font-weight: 900;
+  color: var(--augusta-green-dark);
+  letter-spacing: -0.02em;
+  text-shadow: 0 1px 0 rgba(255,255,255,0.6);
+}
+.ysub  { opacity: 0.75; font-size: 0.80rem; margin-top: 2px; color: var(--muted); }
+
+/* carry bar */
+.barwrap {
+  width: 100%;
+  height: 8px;
+  background: rgba(16,32,26,0.08);
+  border-radius: 999px;
+  overflow: hidden;
+  margin-top: 8px;
+}
+.barfill {
+  height: 100%;
+  background: linear-gradient(90deg, var(--augusta-green), var(--augusta-green-dark));
+  border-radius: 999px;
+  filter: saturate(1.05);
+}
+
+/* gap pill */
+.gapline{
+  margin-top: 6px;
+  display: flex;
+  justify-content: flex-start;
+  align-items: center;
+  min-height: 24px;
+}
+.gappill{
+  display:inline-block;
+  padding: 3px 8px;
+  border-radius: 999px;
+  border: 1px solid rgba(16,32,26,0.08);
+  background: rgba(255,255,255,0.65);
+  font-size: 0.72rem;
+  font-weight: 800;
+  color: rgba(16,32,26,0.68);
+  min-height: 18px;
+}
+
+/* wedges: mini grid */
+.wgrid {
+  display: grid;
+  grid-template-columns: repeat(5, 1fr);
+  gap: 8px;
+  margin-top: 8px;
+}
+.wcell {
+  border: 1px solid rgba(16,32,26,0.10);
+  border-radius: 12px;
+  padding: 8px 8px;
+  background: rgba(255,255,255,0.60);
+  text-align: center;
+}
+.wlab {
+  font-size: 0.72rem;
+  font-weight: 800;
+  color: rgba(16,32,26,0.70);
+  letter-spacing: 0.02em;
+}
+.wval {
+  margin-top: 2px;
+  font-size: 1.05rem;
+  font-weight: 900;
+  color: var(--augusta-green-dark);
+}
+.wbarwrap{
+  width: 100%;
+  height: 6px;
+  background: rgba(16,32,26,0.08);
+  border-radius: 999px;
+  overflow: hidden;
+  margin-top: 6px;
+}
+.wbarfill{
+  height: 100%;
+  background: linear-gradient(90deg, var(--augusta-green), var(--augusta-green-dark));
+  border-radius: 999px;
+}
+
+.ycard.wedge { padding: 10px 12px; }
+
+/* card grid (one payload per tab; stacks like st.columns on phones) */
+.ygrid {
+  display: grid;
+  grid-template-columns: repeat(2, minmax(0, 1fr));
+  column-gap: 1rem;
+  align-items: start;
+}
+@media (max-width: 640px){
+  .ygrid { grid-template-columns: 1fr; }
+}
+
+/* wedge cell grid: Choke + three feels */
+.wgrid.wgrid4{
+  grid-template-columns: repeat(4, 1fr) !important;
+}
+"""
+
+def clamp01(x: float) -> float:
+    return max(0.0, min(1.0, x))
+
+def loft_text(label: str, lofts_cfg: dict) -> Optional[str]:
+    """Return a pretty loft string for non-wedge clubs, like '32°' or '10.5°'."""
+    if category_of(label) == "wedge":
+        return None
+
+    loft = lofts_cfg.get(label)
+    if loft is None:
+        return None
+
+    try:
+        f = float(loft)
+    except Exception:
+        return None
+
+    if abs(f - round(f)) < 1e-9:
+        return f"{int(round(f))}°"
+    return f"{f:.1f}°"
+
+def club_card_html(label: str, shown: str, sub: str, fill_pct: float,
+                   gap_text: Optional[str] = None, loft_txt: Optional[str] = None) -> str:
+    fill_pct = clamp01(fill_pct)
+    label_html = (
+        f'{label} <span class="ycloft">({loft_txt})</span>'
+        if loft_txt else
+        f'{label}'
+    )
+    gap_safe = gap_text if gap_text else "&nbsp;"
+    return (
+        f'<div class="ycard">'
+        f'<div class="yrow"><div class="yclub">{label_html}</div><div class="yvals">{shown}</div></div>'
+        f'<div class="ysub">{sub}</div>'
+        f'<div class="barwrap"><div class="barfill" style="width:{fill_pct*100:.0f}%;"></div></div>'
+        f'<div class="gapline"><span class="gappill">{gap_safe}</span></div>'
+        f'</div>'
+    )
+
+def wedge_card_html(label: str, shown: str, sub: str, fill_pct: float,
+                    gap_text: Optional[str], cells: Sequence[WedgeCell]) -> str:
+    cell_html = []
+    for k, v, pct in cells:
+        val_txt = "—" if v is None else f"{v:.0f}"
+        cell_html.append(
+            f'<div class="wcell"><div class="wlab">{k}</div><div class="wval">{val_txt}</div>'
+            f'<div class="wbarwrap"><div class="wbarfill" style="width:{clamp01(pct)*100:.0f}%;"></div></div></div>'
+        )
+    gap_safe = gap_text if gap_text else "&nbsp;"
+    return (
+        f'<div class="ycard wedge">'
+        f'<div class="yrow"><div class="yclub">{label}</div><div class="yvals">{shown}</div></div>'
+        f'<div class="ysub">{sub}</div>'
+        f'<div class="barwrap"><div class="barfill" style="width:{clamp01(fill_pct)*100:.0f}%;"></div></div>'
+        f'<div class="gapline"><span class="gappill">{gap_safe}</span></div>'
+        f'<div class="wgrid wgrid4">{"".join(cell_html)}</div>'
+        f'</div>'
+    )
+
+def gap_text(gap: Optional[float]) -> Optional[str]:
+    return None if gap is None else f"Gap to next: +{gap:.0f} yd"
+
+def sub_text(sub: str, slope: Optional[float]) -> str:
+    """Card subtitle, with the club's yd per mph of driver CHS when known."""
+    return sub if slope is None else f"{sub} · {slope:+.1f} yd/mph"
+
+def grid_html(cards: List[str]) -> str:
+    return f'<div class="ygrid">{"".join(cards)}</div>'
+
+def clubs_grid_html(rows: List[dict], max_carry: float, loft_texts: Mapping[str, str]) -> str:
+    """
+    rows: output of src.yardage.sorted_with_gaps (or CardGraph.rows, which adds "slope")
+    loft_texts: label -> pre-formatted loft (see loft_text)
+    """
+    cards = []
+    for r in rows:
+        carry, total = r["carry"], r["total"]
+        if carry is None:
+            shown, sub, fill, gap_txt = "—", "No model", 0.0, None
+        else:
+            shown = f"{carry:.0f} / {total:.0f}"
+            sub = sub_text("Carry / Total", r.get("slope"))
+            fill = (carry / max_carry) if max_carry else 0.0
+            gap_txt = gap_text(r["gap"])
+        cards.append(club_card_html(r["club"], shown, sub, fill, gap_txt, loft_texts.get(r["club"])))
+    return grid_html(cards)
+
+def wedges_grid_html(rows: List[dict], max_carry: float, partials: Dict[str, List[Tuple[str, Optional[float]]]]) -> str:
+    """
+    rows: output of src.yardage.sorted_with_gaps (or CardGraph.rows, which adds "slope")
+    partials: wedge label -> [(cell label, carry or None), ...]
+    """
+    cards = []
+    for r in rows:
+        carry_full, total_full = r["carry"], r["total"]
+        cells = partials.get(r["club"], [])
+        if carry_full is None:
+            shown, sub = "—", "No model"
+            wcells = [(k, None, 0.0) for k, _ in cells]
+            fill = 0.0
+        else:
+            shown = f"{carry_full:.0f} / {total_full:.0f}"
+            sub = sub_text("Full (Carry / Total)", r.get("slope"))
+            wcells = [(k, v, (v / carry_full) if (v is not None and carry_full) else 0.0) for k, v in cells]
+            fill = (carry_full / max_carry) if max_carry else 0.0
+        cards.append(wedge_card_html(r["club"], shown, sub, fill, gap_text(r["gap"]), wcells))
+    return grid_html(cards)
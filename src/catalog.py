@@ -6,6 +6,10 @@ HYBRID_RE = re.compile(r"^(\d)H$")
 UTIL_RE = re.compile(r"^(\d)U$")
 IRON_RE = re.compile(r"^(\d)i$")
 
+# Kind-only labels the config uses for a bag's single hybrid/utility (e.g. the
+# "Hybrid" anchor); they are not in the numbered catalog
+GENERIC_LABELS = ("Hybrid", "Utility")
+
 def _sort_key(label: str):
     # Rank groups in golf order
     # (group_rank, within_group_rank, tiebreaker)
@@ -18,10 +22,14 @@ def _sort_key(label: str):
     if m:
         return (1, int(m.group(1)), label)
 
+    if label == "Hybrid":
+        return (2, 0, label)
     m = HYBRID_RE.match(label)
     if m:
         return (2, int(m.group(1)), label)
 
+    if label == "Utility":
+        return (3, 0, label)
     m = UTIL_RE.match(label)
     if m:
         return (3, int(m.group(1)), label)
@@ -71,3 +79,81 @@ def build_full_catalog() -> list[str]:
     clubs = list(dict.fromkeys(clubs))
     clubs.sort(key=_sort_key)
     return clubs
+
+# -------------------------
+# Free-text club labels (launch-monitor exports) -> catalog labels
+# -------------------------
+_NAMED_WEDGE_DEFAULT = {"PW": 46, "GW": 50, "SW": 56, "LW": 60}
+_WEDGE_ALIASES = {
+    "PW": "PW", "P": "PW", "PITCHING": "PW", "PITCHINGWEDGE": "PW",
+    "GW": "GW", "AW": "GW", "UW": "GW", "GAP": "GW", "GAPWEDGE": "GW", "APPROACHWEDGE": "GW",
+    "SW": "SW", "SAND": "SW", "SANDWEDGE": "SW",
+    "LW": "LW", "LOB": "LW", "LOBWEDGE": "LW",
+}
+_CLEAN_RE = re.compile(r"[\s\-_.]+")
+_NUM_KIND_RE = re.compile(r"^(\d{1,2})(W|WOOD|FW|H|HY|HYB|HYBRID|RESCUE|U|UT|UTIL|UTILITY|DI|DRIVINGIRON|I|IRON)$")
+_KIND_NUM_RE = re.compile(r"^(W|WOOD|FW|H|HY|HYB|HYBRID|U|UT|UTIL|UTILITY|I|IRON)(\d{1,2})$")
+_WEDGE_LOFT_RE = re.compile(r"^([A-Z]*?)(?:WEDGE)?\(?(\d{2})(?:°|DEG|DEGREE|DEGREES)?\)?(?:WEDGE)?$")
+_KIND = {
+    "W": "W", "WOOD": "W", "FW": "W",
+    "H": "H", "HY": "H", "HYB": "H", "HYBRID": "H", "RESCUE": "H",
+    "U": "U", "UT": "U", "UTIL": "U", "UTILITY": "U", "DI": "U", "DRIVINGIRON": "U",
+    "I": "i", "IRON": "i",
+}
+_GENERIC = {
+    "HYBRID": "Hybrid", "HY": "Hybrid", "HYB": "Hybrid", "RESCUE": "Hybrid",
+    "UTILITY": "Utility", "UT": "Utility", "UTIL": "Utility", "DRIVINGIRON": "Utility",
+}
+_CATALOG = frozenset(build_full_catalog())
+
+def _known(label: str) -> str | None:
+    return label if label in _CATALOG else None
+
+def normalize_club_label(raw: str) -> str | None:
+    """
+    Map a free-text club name ("7 Iron", "3-Wood", "Pitching Wedge",
+    "56° Wedge", "SW 54", "Dr") to a catalog label, or None if unrecognized or
+    not in build_full_catalog() ("10W", "8H", "0i"). A kind without a number
+    ("Hybrid", "Rescue", "Driving Iron") maps to the config's generic label in
+    GENERIC_LABELS.
+    Named wedges without a loft use the usual lofts (PW 46, GW 50, SW 56, LW 60);
+    a named wedge at a loft the catalog doesn't list becomes "Wedge (<loft>°)".
+    """
+    if raw is None:
+        return None
+    s = str(raw).strip()
+    if not s:
+        return None
+
+    key = _CLEAN_RE.sub("", s.upper()).replace("º", "°")
+    if key in ("DRIVER", "DR", "D", "1W", "W1"):
+        return "Driver"
+    if s in _CATALOG:
+        return s
+    if key in ("MINIDRIVER", "MINI"):
+        return "Mini Driver"
+    if key in ("PUTTER", "PT", "PUTT"):
+        return "Putter"
+    if key in _GENERIC:
+        return _GENERIC[key]
+
+    m = _NUM_KIND_RE.match(key) or _KIND_NUM_RE.match(key)
+    if m:
+        a, b = m.groups()
+        num, kind = (a, b) if a.isdigit() else (b, a)
+        return _known(f"{int(num)}{_KIND[kind]}")
+
+    if key in _WEDGE_ALIASES:
+        name = _WEDGE_ALIASES[key]
+        return f"{name} ({_NAMED_WEDGE_DEFAULT[name]}°)"
+
+    m = _WEDGE_LOFT_RE.match(key)
+    if m:
+        prefix, loft = m.group(1), int(m.group(2))
+        if not 40 <= loft <= 64:
+            return None
+        name = _WEDGE_ALIASES.get(prefix) if prefix else None
+        if prefix and name is None:
+            return None
+        return (_known(f"{name} ({loft}°)") if name else None) or f"Wedge ({loft}°)"
+    return None
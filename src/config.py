@@ -0,0 +1,115 @@
+"""
+Compiled configuration.
+
+`data/config.yaml` is parsed once into a frozen CompiledConfig (anchors,
+fitted model, catalog baselines, presets, loft labels) tagged with a content
+hash. Extra anchor-set profiles resolve through cc.profiles (src/profiles.py).
+ConfigStore hands out the current compiled config and rebuilds it when
+the file's mtime/size changes and its content hash differs.
+"""
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+import yaml
+
+from src.yardage import CardModel
+from src.cards import loft_text
+from src.catalog import build_full_catalog
+from src.profiles import BASE_PROFILE, ProfileStore
+
+@dataclass(frozen=True, slots=True)
+class CompiledConfig:
+    digest: str
+    raw: Mapping
+    model: CardModel
+    profiles: ProfileStore
+    catalog: Tuple[str, ...]
+    presets: Mapping[str, Tuple[str, ...]]
+    preset_names: Tuple[str, ...]
+    default_preset: str
+    default_bag: Tuple[str, ...]
+    loft_texts: Mapping[str, str]
+    choke_sub: float
+    alpha: float
+    feel_map: Mapping[str, float]
+
+def config_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+def compile_config(raw: dict, digest: str, profiles_dir: Optional[Path] = None) -> CompiledConfig:
+    catalog = tuple(build_full_catalog())
+
+    ui = raw.get("ui", {})
+    presets = {name: tuple(bag) for name, bag in (ui.get("presets") or {}).items()}
+    default_preset = ui.get("default_preset", "My Bag")
+    preset_names = tuple(presets.keys()) if presets else ("My Bag",)
+    if default_preset not in preset_names:
+        default_preset = preset_names[0]
+    default_bag = presets.get(default_preset, tuple(ui.get("default_bag", [])))
+
+    lofts_cfg = raw.get("lofts_deg", {})
+    labels = dict.fromkeys(list(catalog) + [c for bag in presets.values() for c in bag])
+    loft_texts = {}
+    for label in labels:
+        txt = loft_text(label, lofts_cfg)
+        if txt:
+            loft_texts[label] = txt
+
+    wedges_cfg = raw.get("wedges", {})
+    partials_cfg = wedges_cfg.get("partials", {})
+
+    profiles = ProfileStore(raw, labels, profiles_dir)
+
+    return CompiledConfig(
+        digest=digest,
+        raw=MappingProxyType(raw),
+        model=profiles.model(BASE_PROFILE),
+        profiles=profiles,
+        catalog=catalog,
+        presets=MappingProxyType(presets),
+        preset_names=preset_names,
+        default_preset=default_preset,
+        default_bag=default_bag,
+        loft_texts=MappingProxyType(loft_texts),
+        choke_sub=float(wedges_cfg.get("choke_down_subtract_yd", 4)),
+        alpha=float(partials_cfg.get("alpha", 0.55)),
+        feel_map=MappingProxyType({k: float(v) for k, v in partials_cfg.get("feel_map", {"75%": 0.75, "50%": 0.50, "25%": 0.25}).items()}),
+    )
+
+def load_compiled(path: Path) -> CompiledConfig:
+    data = path.read_bytes()
+    return compile_config(yaml.safe_load(data), config_digest(data), path.parent / "profiles")
+
+class ConfigStore:
+    """
+    Process-wide holder of the compiled config for one YAML file.
+    get() is a stat() call when nothing changed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._compiled: Optional[CompiledConfig] = None
+
+    def get(self) -> CompiledConfig:
+        st = self.path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        compiled = self._compiled
+        if compiled is not None and stamp == self._stamp:
+            return compiled
+
+        with self._lock:
+            if self._compiled is not None and stamp == self._stamp:
+                return self._compiled
+            data = self.path.read_bytes()
+            digest = config_digest(data)
+            # Touched but unchanged: keep the compiled artifact
+            if self._compiled is None or digest != self._compiled.digest:
+                self._compiled = compile_config(yaml.safe_load(data), digest, self.path.parent / "profiles")
+            self._stamp = stamp
+            return self._compiled
@@ -0,0 +1,307 @@
+"""
+Debug-tab validation tables as columnar frames, and their bulk export.
+
+One batched engine, src.lookup.profile_block, returns carry/total for every
+club x every requested CHS as one (n_chs, n_clubs, 2) array. Four pandas
+frames are built from it:
+
+    yardages   club, bucket, carry, total, rollout, flags, action
+    gaps       from, to, gap_yd, flags, action    (adjacent modeled clubs by carry)
+    partials   wedge, full_carry, 100%, Choke, <feels>, flags, action
+    response   club, bucket, carry@<chs>..., flags, action
+
+The sanity flags are boolean masks over whole columns, not per-row ifs.
+The Debug tab builds the frames for the current CHS. Bulk export walks the
+slider range BLOCK_CHS values at a time and writes a zip with one member per
+table (CSV deflated, or zstd Parquet with one row group per block). Each
+block's frames are encoded and dropped before the next, so memory holds one
+block plus the compressor's buffers whatever the range:
+
+    python -m src.debug_tables --out debug.zip --format parquet --offset 0
+"""
+import argparse
+import sys
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.yardage import CardModel
+from src.estimates import category_of
+from src.lookup import CHS_RANGE, STEPS_PER_MPH, profile_block
+from src.partials import PartialScheme, partial_matrix
+
+TH = {
+    "gap_small": 4,
+    "gap_large_irons": 18,
+    "gap_large_woods": 25,
+    "rollout_driver_max": 45,
+    "rollout_driver_min": 5,
+    "rollout_iron_max": 22,
+    "rollout_iron_min": 0,
+    "monotonic_tol": 0.1,
+    "sensitive_gain_10mph": 18,
+}
+
+TABLES = ("yardages", "gaps", "partials", "response")
+FORMATS = ("csv", "parquet")
+BLOCK_CHS = 50
+
+def bucket(label: str) -> str:
+    cat = category_of(label)
+    if cat == "wedge":
+        return "wedge"
+    if cat == "putter":
+        return "putter"
+    if label == "Driver":
+        return "driver"
+    if "Wood" in label or label.endswith("W"):
+        return "wood"
+    if "H" in label:
+        return "hybrid"
+    if "U" in label:
+        return "utility"
+    return "iron"
+
+def carry_block(model: CardModel, labels: Sequence[str], chs: Iterable[float],
+                offset: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(carry, total) arrays of shape (n_chs, n_labels); NaN for unmodeled clubs."""
+    block = profile_block(model, list(labels), np.atleast_1d(np.asarray(chs, dtype=float)))
+    return block[..., 0] + float(offset), block[..., 1] + float(offset)
+
+def _flags(rules: Sequence[Tuple[np.ndarray, str, str]], n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """flags / action columns from (mask, flag, action) rules, joined in rule order."""
+    flags = np.full(n, "", dtype=object)
+    actions = np.full(n, "", dtype=object)
+    for mask, flag, action in rules:
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            f, a = flags[mask], actions[mask]
+            flags[mask] = np.where(f == "", flag, f + ", " + flag)
+            actions[mask] = np.where(a == "", action, a + " | " + action)
+    return flags, actions
+
+def _grid_columns(labels: Sequence[str], chs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-major (chs, label) columns for a (n_chs, n_labels) block."""
+    return np.repeat(chs, len(labels)), np.tile(np.array(labels, dtype=object), len(chs))
+
+def _frame(columns: Dict[str, np.ndarray], by: str, with_chs: bool) -> pd.DataFrame:
+    """DataFrame of `columns` sorted by CHS, then `by` longest first with NaN last (np.lexsort is stable)."""
+    key = columns[by]
+    order = np.lexsort((np.where(np.isnan(key), np.inf, -key), columns["chs"]))
+    if not with_chs:
+        columns = {k: v for k, v in columns.items() if k != "chs"}
+    return pd.DataFrame({k: v[order] for k, v in columns.items()})
+
+def yardage_frame(model: CardModel, labels: Sequence[str], chs: Iterable[float], offset: float,
+                  with_chs: bool = False) -> pd.DataFrame:
+    """Modeled carry/total/rollout with sanity flags, longest first (putters skipped)."""
+    labels = [x for x in labels if category_of(x) != "putter"]
+    chs = np.atleast_1d(np.asarray(chs, dtype=float))
+    carry, total = carry_block(model, labels, chs, offset)
+    c, t = carry.ravel(), total.ravel()
+    r = t - c
+    chs_col, club = _grid_columns(labels, chs)
+    b = np.tile(np.array([bucket(x) for x in labels], dtype=object), len(chs))
+    woods = np.isin(b, ("driver", "wood"))
+    irons = b == "iron"
+    flags, actions = _flags([
+        (np.isnan(c) | np.isnan(t), "no_model", "Add/verify anchor mapping or label parsing for this club."),
+        (t < c, "total<cary", "Check rollout_for() and rollout_defaults_yd in config."),
+        ((c <= 0) | (t <= 0), "non_positive", "Check anchors / scaling logic; carry should be positive."),
+        (woods & (r < TH["rollout_driver_min"]), "rollout_low",
+         "Rollout seems low for driver/woods; check rollout_defaults_yd."),
+        (woods & (r > TH["rollout_driver_max"]), "rollout_high",
+         "Rollout seems high for driver/woods; check rollout_defaults_yd."),
+        (irons & (r < TH["rollout_iron_min"]), "rollout_neg", "Iron rollout negative; check rollout_defaults_yd."),
+        (irons & (r > TH["rollout_iron_max"]), "rollout_high", "Iron rollout high; check rollout_defaults_yd."),
+    ], len(c))
+    return _frame({
+        "chs": chs_col, "club": club, "bucket": b,
+        "carry": np.round(c, 1), "total": np.round(t, 1), "rollout": np.round(r, 1),
+        "flags": flags, "action": actions,
+    }, "carry", with_chs)
+
+def gap_frame(yardages: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gap from each modeled club to the next one down, from a yardage_frame
+    (per CHS if it has a chs column).
+    """
+    with_chs = "chs" in yardages.columns
+    carry = yardages["carry"].to_numpy()
+    modeled = ~np.isnan(carry)
+    c = carry[modeled]
+    club = yardages["club"].to_numpy()[modeled]
+    b = yardages["bucket"].to_numpy()[modeled]
+    chs = yardages["chs"].to_numpy()[modeled] if with_chs else np.zeros(len(c))
+    # yardage_frame sorts by CHS then carry, so neighbours within one CHS are the pairs
+    pair = np.flatnonzero(chs[:-1] == chs[1:])
+    gap = c[pair] - c[pair + 1]
+    woods = np.isin(b[pair], ("driver", "wood")) | np.isin(b[pair + 1], ("driver", "wood"))
+    large = np.where(woods, TH["gap_large_woods"], TH["gap_large_irons"])
+    flags, actions = _flags([
+        (gap < TH["gap_small"], "gap_small", "Clubs may be redundant/too close; verify anchors or club list."),
+        (gap > large, "gap_large", "Gap seems large; verify anchor curve or missing intermediate club."),
+    ], len(gap))
+    columns = {"from": club[pair], "to": club[pair + 1], "gap_yd": np.round(gap, 1),
+               "flags": flags, "action": actions}
+    return pd.DataFrame({"chs": chs[pair], **columns} if with_chs else columns)
+
+def partials_frame(labels: Sequence[str], full: np.ndarray, scheme: PartialScheme,
+                   chs: Optional[Iterable[float]] = None) -> pd.DataFrame:
+    """
+    Wedge partials with sanity flags from full carries `full` of shape
+    (n_chs, n_labels), longest first. `chs` labels the rows when given.
+    """
+    full = np.atleast_2d(np.asarray(full, dtype=float))
+    with_chs = chs is not None
+    chs = np.atleast_1d(np.asarray(chs if with_chs else [np.nan] * len(full), dtype=float))
+    f = full.ravel()
+    vals = partial_matrix(f, scheme)
+    order = np.column_stack([f, vals[:, 1:]])
+    modeled = ~np.isnan(f)
+    flags, actions = _flags([
+        (~modeled, "no_model", "Add/verify wedge anchor mapping or label parsing."),
+        (vals[:, 0] > f, "choke>100", "Increase choke_down_subtract_yd in config."),
+        (modeled & (order[:, :-1] < order[:, 1:] - TH["monotonic_tol"]).any(axis=1), "partials_non_monotonic",
+         "Check wedges.partials feel_map/alpha; feels must decrease."),
+    ], len(f))
+    chs_col, wedge = _grid_columns(labels, chs)
+    return _frame({"chs": chs_col, "wedge": wedge, "full_carry": np.round(f, 1), "100%": np.round(f, 1),
+                   **{k: np.round(vals[:, i], 1) for i, k in enumerate(scheme.columns)},
+                   "flags": flags, "action": actions}, "full_carry", with_chs)
+
+def response_frame(model: CardModel, labels: Sequence[str], chs_points: Sequence[float],
+                   offset: float) -> pd.DataFrame:
+    """Carry per club at each of `chs_points` (in the given order), flagging non-monotonic or oversensitive clubs."""
+    carry, _ = carry_block(model, labels, chs_points, offset)
+    b = np.array([bucket(x) for x in labels], dtype=object)
+    n = len(labels)
+    non_mono = np.zeros(n, dtype=bool)
+    if len(chs_points) >= 2:
+        lo, hi = carry[:-1], carry[1:]
+        non_mono = (np.isnan(lo) | np.isnan(hi) | (hi < lo - TH["monotonic_tol"])).any(axis=0)
+    sensitive = np.zeros(n, dtype=bool)
+    if 105 in chs_points and 115 in chs_points:
+        delta = carry[list(chs_points).index(115)] - carry[list(chs_points).index(105)]
+        sensitive = np.isin(b, ("iron", "wedge")) & (delta > TH["sensitive_gain_10mph"])
+    flags, actions = _flags([
+        (non_mono, "non_monotonic_vs_chs",
+         "Check responsiveness_exponent() / exponent_shape_p or speed estimation mapping."),
+        (sensitive, "too_sensitive_105_115",
+         "Iron/wedge gain seems high; fit exponent_shape_p / exponent_shape_p_by_category with `python -m src.tune`."),
+    ], n)
+    df = pd.DataFrame({"club": np.array(labels, dtype=object), "bucket": b})
+    for i, chs in enumerate(chs_points):
+        df[f"carry@{chs}"] = np.round(carry[i], 1)
+    df["flags"] = flags
+    df["action"] = actions
+    return df
+
+def response_range_frame(model: CardModel, labels: Sequence[str], chs: np.ndarray, offset: float,
+                         step: float) -> pd.DataFrame:
+    """
+    Export form of the response check, one row per CHS x club: carry, carry
+    10 mph faster, and the same two flags, against the previous grid step
+    and over +10 mph.
+    """
+    labels = [x for x in labels if category_of(x) != "putter"]
+    carry, _ = carry_block(model, labels, chs, offset)
+    prev, _ = carry_block(model, labels, chs - step, offset)
+    up, _ = carry_block(model, labels, chs + 10.0, offset)
+    c, gain = carry.ravel(), (up - carry).ravel()
+    chs_col, club = _grid_columns(labels, chs)
+    b = np.tile(np.array([bucket(x) for x in labels], dtype=object), len(chs))
+    flags, actions = _flags([
+        (np.isnan(c) | (c < prev.ravel() - TH["monotonic_tol"]), "non_monotonic_vs_chs",
+         "Check responsiveness_exponent() / exponent_shape_p or speed estimation mapping."),
+        (np.isin(b, ("iron", "wedge")) & (gain > TH["sensitive_gain_10mph"]), "too_sensitive_10mph",
+         "Iron/wedge gain seems high; fit exponent_shape_p / exponent_shape_p_by_category with `python -m src.tune`."),
+    ], len(c))
+    return pd.DataFrame({"chs": chs_col, "club": club, "bucket": b, "carry": np.round(c, 1),
+                         "gain_10mph": np.round(gain, 1), "flags": flags, "action": actions})
+
+def export_blocks(model: CardModel, catalog: Sequence[str], scheme: PartialScheme, offset: float,
+                  chs_range: Tuple[float, float] = CHS_RANGE, steps_per_mph: int = STEPS_PER_MPH,
+                  block: int = BLOCK_CHS) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """(table, frame) for every table and CHS block of the range; all of one table before the next."""
+    # Same grid as the lookup file: integer numerators, so 105.0 is exactly 105.0
+    grid = np.arange(round(chs_range[0] * steps_per_mph), round(chs_range[1] * steps_per_mph) + 1) / steps_per_mph
+    blocks = [grid[i:i + block] for i in range(0, len(grid), block)]
+    wedges = [x for x in catalog if category_of(x) == "wedge"]
+    for table in TABLES:
+        for chs in blocks:
+            if table in ("yardages", "gaps"):
+                df = yardage_frame(model, catalog, chs, offset, with_chs=True)
+                yield table, (df if table == "yardages" else gap_frame(df))
+            elif table == "partials":
+                yield table, partials_frame(wedges, carry_block(model, wedges, chs, offset)[0], scheme, chs)
+            else:
+                yield table, response_range_frame(model, catalog, chs, offset, 1.0 / steps_per_mph)
+
+def write_export(out: BinaryIO, blocks: Iterable[Tuple[str, pd.DataFrame]], fmt: str = "csv") -> Dict[str, int]:
+    """
+    Stream (table, frame) blocks into a zip on `out`, one member per table
+    (<table>.csv deflated, or <table>.parquet with zstd row groups). Returns
+    rows written per table.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    rows: Dict[str, int] = {}
+    member = writer = None
+    current = None
+    compression = zipfile.ZIP_DEFLATED if fmt == "csv" else zipfile.ZIP_STORED
+    with zipfile.ZipFile(out, "w", compression=compression) as zf:
+        for table, df in blocks:
+            if table != current:
+                if writer is not None:
+                    writer.close()
+                    writer = None
+                if member is not None:
+                    member.close()
+                member = zf.open(f"{table}.{fmt}", "w", force_zip64=True)
+                current = table
+            if fmt == "csv":
+                member.write(df.to_csv(index=False, header=table not in rows).encode("utf-8"))
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                if writer is None:
+                    batch = pa.Table.from_pandas(df, preserve_index=False)
+                    writer = pq.ParquetWriter(member, batch.schema, compression="zstd")
+                else:
+                    batch = pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False)
+                writer.write_table(batch)
+            rows[table] = rows.get(table, 0) + len(df)
+        if writer is not None:
+            writer.close()
+        if member is not None:
+            member.close()
+    return rows
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.config import load_compiled
+    from src.profiles import BASE_PROFILE
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", type=Path, default=Path(__file__).resolve().parent.parent / "data" / "config.yaml")
+    ap.add_argument("--profile", default=BASE_PROFILE)
+    ap.add_argument("--offset", type=float, default=0.0)
+    ap.add_argument("--format", choices=FORMATS, default="csv")
+    ap.add_argument("--out", type=Path, required=True)
+    args = ap.parse_args(argv)
+
+    cc = load_compiled(args.config)
+    if args.profile not in cc.profiles.ids():
+        ap.error(f"unknown profile: {args.profile}")
+    blocks = export_blocks(cc.profiles.model(args.profile), list(cc.catalog), PartialScheme.from_config(cc),
+                           args.offset)
+    with args.out.open("wb") as f:
+        rows = write_export(f, blocks, args.format)
+    print(f"{args.out}: " + ", ".join(f"{t} {n} rows" for t, n in rows.items()), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Per-profile dispersion tables (data/dispersion/<profile>.yaml).
+
+Each table maps catalog labels to fitted DispersionParams, written by
+src/dispersion_fit.py. Clubs without an entry use pattern_defaults.
+"""
+import json
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+import yaml
+
+from src.shot_pattern import DispersionParams
+
+DISPERSION_DIR = Path(__file__).resolve().parent.parent / "data" / "dispersion"
+
+def dispersion_path(profile_id: str, base_dir: Path = DISPERSION_DIR) -> Path:
+    return base_dir / f"{profile_id}.yaml"
+
+def dump_table(params: Mapping[str, DispersionParams]) -> str:
+    lines = ["clubs:"]
+    for label, p in params.items():
+        lines.append(
+            f"  {json.dumps(label, ensure_ascii=False)}: "
+            f"{{ lat_frac: {p.lat_frac:g}, dist_frac: {p.dist_frac:g}, start_k: {p.start_k:g}, "
+            f"curve_k: {p.curve_k:g}, shape_scale: {p.shape_scale:g}, shots: {p.shots} }}"
+        )
+    return "\n".join(lines) + "\n"
+
+def load_table(path: Path) -> Dict[str, DispersionParams]:
+    """Missing file -> empty table (the pattern falls back to defaults)."""
+    if not path.is_file():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        doc = yaml.safe_load(f) or {}
+    return {label: DispersionParams(**{k: (int(v) if k == "shots" else float(v)) for k, v in p.items()})
+            for label, p in (doc.get("clubs") or {}).items()}
+
+# path -> (mtime_ns or None, table); reloaded when the file changes
+_tables: Dict[Path, Tuple[Optional[int], Dict[str, DispersionParams]]] = {}
+
+def table_for(profile_id: str, base_dir: Path = DISPERSION_DIR) -> Dict[str, DispersionParams]:
+    path = dispersion_path(profile_id, base_dir)
+    mtime = path.stat().st_mtime_ns if path.is_file() else None
+    hit = _tables.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    table = load_table(path) if mtime is not None else {}
+    _tables[path] = (mtime, table)
+    return table
@@ -0,0 +1,204 @@
+"""
+Fit per-club shot-pattern dispersion from real shot data.
+
+One streaming pass bins every shot into per-club histograms (carry, lateral,
+and start line / curve when launch direction is available). Outliers are
+trimmed per club at histogram quantiles, and the trimmed moments come from
+the bins themselves, so there is no second pass over the raw shots.
+
+The result is a small per-profile table (data/dispersion/<profile>.yaml, see
+src/dispersion.py) that simulate_shot_pattern uses in place of
+pattern_defaults.
+
+    python -m src.dispersion_fit shots.csv --profile me
+"""
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.catalog import _sort_key
+from src.dispersion import dispersion_path, dump_table
+from src.ingest import CARRY_COLS, CARRY_FACTORS, CHUNK_ROWS, CLUB_COLS, _pick_column, map_clubs
+from src.shot_pattern import FALLBACK_CURVE_K, FALLBACK_START_K, DispersionParams
+
+LATERAL_COLS = ("side", "carry side", "carry_side", "offline", "lateral", "side (yds)", "lateral_yd")
+LAUNCH_DIR_COLS = ("launch direction", "launch_direction", "launch dir", "horizontal launch angle", "hla")
+
+# Histogram grids (yd), 0.1 resolution
+BIN_WIDTH = 0.1
+CARRY_RANGE = (5.0, 420.0)
+LATERAL_RANGE = (-100.0, 100.0)
+
+TRIM_Q = 0.025
+MIN_SHOTS = 30
+
+_VARS = ("carry", "lateral", "start", "curve")
+
+def _n_bins(rng) -> int:
+    return int(round((rng[1] - rng[0]) / BIN_WIDTH))
+
+def _range(var: str):
+    return CARRY_RANGE if var == "carry" else LATERAL_RANGE
+
+@dataclass
+class DispersionHistograms:
+    labels: List[str] = field(default_factory=list)
+    index: Dict[str, int] = field(default_factory=dict)
+    hists: Dict[str, np.ndarray] = field(default_factory=lambda: {
+        v: np.zeros((0, _n_bins(_range(v))), dtype=np.int64) for v in _VARS
+    })
+    rows_in: int = 0
+    rows_used: int = 0
+    has_launch_dir: bool = False
+    unknown_labels: Dict[str, int] = field(default_factory=dict)
+
+    def club_index(self, label: str) -> int:
+        i = self.index.get(label)
+        if i is None:
+            i = len(self.labels)
+            self.labels.append(label)
+            self.index[label] = i
+            for v, h in self.hists.items():
+                self.hists[v] = np.vstack([h, np.zeros((1, h.shape[1]), dtype=np.int64)])
+        return i
+
+    def add(self, var: str, club_idx: np.ndarray, vals: np.ndarray) -> None:
+        hist = self.hists[var]
+        lo = _range(var)[0]
+        nb = hist.shape[1]
+        b = np.floor((vals - lo) / BIN_WIDTH).astype(np.int64)
+        ok = (b >= 0) & (b < nb)
+        hist += np.bincount(club_idx[ok] * nb + b[ok], minlength=hist.size).reshape(hist.shape)
+
+def trimmed_moments(hist: np.ndarray, lo: float, q: float = TRIM_Q):
+    """
+    Per-row (club) mean, std and count after dropping the q / 1-q tails,
+    all from the binned counts. Returns three arrays of shape (clubs,).
+    """
+    centers = lo + (np.arange(hist.shape[1]) + 0.5) * BIN_WIDTH
+    n = hist.sum(axis=1)
+    cum = np.cumsum(hist, axis=1)
+    lo_idx = (cum < (q * n)[:, None]).sum(axis=1)
+    hi_idx = (cum < ((1.0 - q) * n)[:, None]).sum(axis=1)
+    cols = np.arange(hist.shape[1])[None, :]
+    w = np.where((cols >= lo_idx[:, None]) & (cols <= hi_idx[:, None]), hist, 0).astype(np.float64)
+    wn = w.sum(axis=1)
+    safe = np.where(wn > 0, wn, 1.0)
+    mean = (w * centers).sum(axis=1) / safe
+    var = (w * (centers[None, :] - mean[:, None]) ** 2).sum(axis=1) / safe
+    return mean, np.sqrt(var), wn
+
+def fit_params(h: DispersionHistograms, min_shots: int = MIN_SHOTS) -> Dict[str, DispersionParams]:
+    """Vectorized over clubs; clubs with fewer than min_shots are left out."""
+    if not h.labels:
+        return {}
+    m = {v: trimmed_moments(h.hists[v], _range(v)[0]) for v in _VARS}
+    carry_mean, carry_std, carry_n = m["carry"]
+    _, lat_std, lat_n = m["lateral"]
+
+    out: Dict[str, DispersionParams] = {}
+    for label in sorted(h.labels, key=_sort_key):
+        i = h.index[label]
+        n = int(min(carry_n[i], lat_n[i]))
+        if n < min_shots or carry_mean[i] <= 0 or lat_std[i] <= 0:
+            continue
+        c = float(carry_mean[i])
+        if h.has_launch_dir and m["start"][2][i] >= min_shots:
+            # lateral = start + curve, so var(lat) = cov(start, lat) + cov(curve, lat), and
+            # cov(start, lat) = (var(lat) + var(start) - var(curve)) / 2 from the marginals.
+            # Each part's share of var(lat) keeps their correlation, and the simulator's
+            # independent draws then add back up to lat_std.
+            var_lat, var_s, var_c = lat_std[i] ** 2, m["start"][1][i] ** 2, m["curve"][1][i] ** 2
+            share = float(np.clip((var_lat + var_s - var_c) / (2.0 * var_lat), 0.0, 1.0))
+            start_k, curve_k = float(np.sqrt(share)), float(np.sqrt(1.0 - share))
+            shape_scale = float(m["curve"][0][i]) / c
+        else:
+            # Without launch direction we can't split start vs curve: keep the
+            # default split and use the mean lateral offset as the shape bias.
+            start_k, curve_k = FALLBACK_START_K, FALLBACK_CURVE_K
+            shape_scale = float(m["lateral"][0][i]) / c
+        out[label] = DispersionParams(
+            lat_frac=round(float(lat_std[i]) / c, 5),
+            dist_frac=round(float(carry_std[i]) / c, 5),
+            start_k=round(start_k, 4),
+            curve_k=round(curve_k, 4),
+            shape_scale=round(shape_scale, 5),
+            shots=n,
+        )
+    return out
+
+def fit_csv(path: Path, club_col: Optional[str] = None, carry_col: Optional[str] = None,
+            lateral_col: Optional[str] = None, launch_dir_col: Optional[str] = None,
+            carry_unit: str = "yd", flip_lateral: bool = False,
+            chunk_rows: int = CHUNK_ROWS) -> DispersionHistograms:
+    header = pd.read_csv(path, nrows=0).columns
+    club_col = _pick_column(header, club_col, CLUB_COLS, "club")
+    carry_col = _pick_column(header, carry_col, CARRY_COLS, "carry")
+    lateral_col = _pick_column(header, lateral_col, LATERAL_COLS, "lateral")
+    if launch_dir_col is None:
+        lowered = {c.strip().lower(): c for c in header}
+        launch_dir_col = next((lowered[c] for c in LAUNCH_DIR_COLS if c in lowered), None)
+
+    k = CARRY_FACTORS[carry_unit]
+    sign = -1.0 if flip_lateral else 1.0
+    h = DispersionHistograms(has_launch_dir=launch_dir_col is not None)
+    label_cache: Dict[str, int] = {}
+
+    cols = [club_col, carry_col, lateral_col] + ([launch_dir_col] if launch_dir_col else [])
+    for chunk in pd.read_csv(path, usecols=cols, dtype={club_col: "string"}, chunksize=chunk_rows):
+        h.rows_in += len(chunk)
+        club_idx = map_clubs(chunk[club_col], label_cache, h.club_index, h.unknown_labels)
+        carry = pd.to_numeric(chunk[carry_col], errors="coerce").to_numpy(dtype=np.float64) * k
+        lateral = pd.to_numeric(chunk[lateral_col], errors="coerce").to_numpy(dtype=np.float64) * k * sign
+        ok = (club_idx >= 0) & np.isfinite(carry) & np.isfinite(lateral)
+        h.rows_used += int(ok.sum())
+        ci = club_idx[ok]
+        h.add("carry", ci, carry[ok])
+        h.add("lateral", ci, lateral[ok])
+        if launch_dir_col:
+            ldir = pd.to_numeric(chunk[launch_dir_col], errors="coerce").to_numpy(dtype=np.float64)[ok] * sign
+            start = carry[ok] * np.tan(np.radians(ldir))
+            good = np.isfinite(start)
+            h.add("start", ci[good], start[good])
+            h.add("curve", ci[good], lateral[ok][good] - start[good])
+    return h
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("csv", type=Path)
+    ap.add_argument("--profile", default="tour", help="writes data/dispersion/<profile>.yaml")
+    ap.add_argument("--out", type=Path, help="explicit output path (overrides --profile)")
+    ap.add_argument("--club-col")
+    ap.add_argument("--carry-col")
+    ap.add_argument("--lateral-col")
+    ap.add_argument("--launch-dir-col")
+    ap.add_argument("--carry-unit", choices=sorted(CARRY_FACTORS), default="yd")
+    ap.add_argument("--flip-lateral", action="store_true", help="export uses negative = right")
+    ap.add_argument("--min-shots", type=int, default=MIN_SHOTS)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    h = fit_csv(args.csv, args.club_col, args.carry_col, args.lateral_col, args.launch_dir_col,
+                args.carry_unit, args.flip_lateral)
+    params = fit_params(h, args.min_shots)
+    elapsed = time.perf_counter() - t0
+
+    out = args.out or dispersion_path(args.profile)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(dump_table(params), encoding="utf-8")
+
+    rate = h.rows_in / elapsed if elapsed else 0.0
+    print(f"{h.rows_in:,} rows ({h.rows_used:,} used) in {elapsed:.2f}s = {rate:,.0f} rows/s; "
+          f"{len(params)} clubs -> {out}", file=sys.stderr)
+    for label, p in params.items():
+        print(f"  {label:<12} n={p.shots:<8} lat {p.lat_frac*100:.1f}%  dist {p.dist_frac*100:.1f}%  "
+              f"start/curve {p.start_k:.2f}/{p.curve_k:.2f}  shape {p.shape_scale*100:+.2f}%", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
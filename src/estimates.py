@@ -1,8 +1,15 @@
+import bisect
+import math
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, List, Tuple
 
-@dataclass
+import numpy as np
+
+from src.perf import timed
+
+@dataclass(frozen=True, slots=True)
 class Anchor:
     label: str
     club_speed_mph: float
@@ -20,12 +27,14 @@ def parse_loft(label: str) -> Optional[int]:
     m = WEDGE_RE.match(label)
     return int(m.group("loft")) if m else None
 
+# Pure and called per club on every hot path (shape_p, rollout_for, grouping)
+@lru_cache(maxsize=4096)
 def category_of(label: str) -> str:
     if label in ["Driver", "Mini Driver"] or WOOD_RE.match(label):
         return "wood"
-    if HYBRID_RE.match(label):
+    if label == "Hybrid" or HYBRID_RE.match(label):
         return "hybrid"
-    if UTIL_RE.match(label):
+    if label == "Utility" or UTIL_RE.match(label):
         return "utility"
     if IRON_RE.match(label):
         return "iron"
@@ -63,53 +72,65 @@ def _interp_linear(x: float, x0: float, y0: float, x1: float, y1: float) -> floa
     t = (x - x0) / (x1 - x0)
     return float(y0 + t * (y1 - y0))
 
-def _interp_by_loft(loft: int, pts: List[Tuple[int, float, float]], which: str) -> Optional[float]:
+def interp_extrap(q: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """np.interp with linear extrapolation from the end segments; xs ascending, len >= 2."""
+    q = np.asarray(q, dtype=float)
+    y = np.interp(q, xs, ys)
+    lo = q < xs[0]
+    hi = q > xs[-1]
+    if lo.any():
+        y[lo] = ys[0] + (q[lo] - xs[0]) * (ys[1] - ys[0]) / (xs[1] - xs[0])
+    if hi.any():
+        y[hi] = ys[-1] + (q[hi] - xs[-1]) * (ys[-1] - ys[-2]) / (xs[-1] - xs[-2])
+    return y
+
+@dataclass(frozen=True, slots=True)
+class LoftTable:
     """
-    pts = [(loft, speed, carry), ...] sorted by loft
-    which in {"speed","carry"}
-    Linear interpolate within range; linear extrapolate outside range using nearest segment.
+    Wedge anchors compiled once into loft-sorted columns.
+    Linear interpolation inside the anchor range, linear extrapolation from the
+    nearest end segment outside it; needs at least two distinct lofts.
     """
-    if len(pts) < 2:
-        return None
-
-    idx = 1 if which == "speed" else 2
-
-    # exact match
-    for L, s, c in pts:
-        if L == loft:
-            return float(s if which == "speed" else c)
-
-    # below range -> extrapolate using first segment
-    if loft < pts[0][0]:
-        L0, s0, c0 = pts[0]
-        L1, s1, c1 = pts[1]
-        y0 = s0 if idx == 1 else c0
-        y1 = s1 if idx == 1 else c1
-        return _interp_linear(loft, L0, y0, L1, y1)
-
-    # above range -> extrapolate using last segment
-    if loft > pts[-1][0]:
-        L0, s0, c0 = pts[-2]
-        L1, s1, c1 = pts[-1]
-        y0 = s0 if idx == 1 else c0
-        y1 = s1 if idx == 1 else c1
-        return _interp_linear(loft, L0, y0, L1, y1)
-
-    # inside range -> interpolate between neighbors
-    for i in range(1, len(pts)):
-        L0, s0, c0 = pts[i - 1]
-        L1, s1, c1 = pts[i]
-        if L0 < loft < L1:
-            y0 = s0 if idx == 1 else c0
-            y1 = s1 if idx == 1 else c1
-            return _interp_linear(loft, L0, y0, L1, y1)
+    lofts: Tuple[float, ...]
+    speed: Tuple[float, ...]
+    carry: Tuple[float, ...]
 
-    return None
+    @classmethod
+    def from_anchors(cls, anchors: dict[str, Anchor]) -> "LoftTable":
+        by_loft: dict[float, Tuple[float, float]] = {}
+        for loft, spd, carry in _wedge_points(anchors):
+            # Two anchors at one loft: the first one wins, as an exact match always did
+            by_loft.setdefault(float(loft), (spd, carry))
+        lofts = tuple(by_loft)
+        return cls(lofts, tuple(v[0] for v in by_loft.values()), tuple(v[1] for v in by_loft.values()))
+
+    def lookup(self, loft: float, which: str) -> Optional[float]:
+        """which in {"speed","carry"}; None with fewer than two anchor lofts."""
+        xs = self.lofts
+        if len(xs) < 2:
+            return None
+        ys = self.speed if which == "speed" else self.carry
+        i = bisect.bisect_left(xs, loft)
+        if i < len(xs) and xs[i] == loft:
+            return ys[i]
+        # Bracketing segment inside the range, end segment outside it
+        i = min(max(i, 1), len(xs) - 1)
+        return _interp_linear(loft, xs[i - 1], ys[i - 1], xs[i], ys[i])
+
+    def lookup_many(self, lofts, which: str) -> np.ndarray:
+        """Vectorized lookup() for an array of (possibly fractional) lofts; NaN if unusable."""
+        q = np.asarray(lofts, dtype=float)
+        if len(self.lofts) < 2:
+            return np.full(q.shape, np.nan)
+        ys = self.speed if which == "speed" else self.carry
+        return interp_extrap(q, np.array(self.lofts), np.array(ys))
 
 # -------------------------
 # Estimation
 # -------------------------
-def estimate_club_speed(label: str, anchors: dict[str, Anchor]) -> Optional[float]:
+@timed("estimate_club_speed")
+def estimate_club_speed(label: str, anchors: dict[str, Anchor], loft_table: Optional[LoftTable] = None) -> Optional[float]:
+    """Pass a precompiled `loft_table` (LoftTable.from_anchors) to skip rebuilding it per wedge."""
     # Direct anchor
     if label in anchors:
         return anchors[label].club_speed_mph
@@ -141,7 +162,8 @@ def estimate_club_speed(label: str, anchors: dict[str, Anchor]) -> Optional[floa
     if m:
         n = int(m.group("num"))
         known = {int(k[0]): anchors[k].club_speed_mph for k in anchors if re.match(r"^[3-9]i$", k)}
-        if not known:
+        # Need two irons to define a slope (sparse per-golfer anchor sets)
+        if len(known) < 2:
             return None
         xs = sorted(known.keys())
         slope = (known[xs[-1]] - known[xs[0]]) / (xs[-1] - xs[0])
@@ -173,18 +195,18 @@ def estimate_club_speed(label: str, anchors: dict[str, Anchor]) -> Optional[floa
         loft = parse_loft(label)
         if loft is None:
             return None
-        pts = _wedge_points(anchors)
-        spd = _interp_by_loft(loft, pts, which="speed")
+        table = loft_table if loft_table is not None else LoftTable.from_anchors(anchors)
+        spd = table.lookup(loft, "speed")
         return None if spd is None else float(spd)
 
     return None
 
-def estimate_carry_from_speed(speed_mph: float, anchors: list[Anchor]) -> float:
+def fit_carry_curve(anchors: list[Anchor]) -> Tuple[float, float]:
     """
-    Global speed->carry power law (kept for non-wedge fallback).
+    Global speed->carry power law, carry = a * speed ** b, fit in log-log space.
+    Returns (a, b).
     """
     pts = [(a.club_speed_mph, a.carry_yd) for a in anchors if a.category in ("wood", "hybrid", "iron", "wedge")]
-    import math
     xs = [math.log(x) for x, _ in pts]
     ys = [math.log(y) for _, y in pts]
     n = len(xs)
@@ -194,21 +216,33 @@ def estimate_carry_from_speed(speed_mph: float, anchors: list[Anchor]) -> float:
     den = sum((xs[i]-xbar)**2 for i in range(n))
     b = num / den
     a = math.exp(ybar - b * xbar)
+    return a, b
+
+@timed("estimate_carry_from_speed")
+def estimate_carry_from_speed(speed_mph: float, anchors: list[Anchor], fit: Optional[Tuple[float, float]] = None) -> float:
+    """
+    Global speed->carry power law (kept for non-wedge fallback).
+    Pass a precomputed `fit` (see fit_carry_curve) to skip the refit.
+    """
+    a, b = fit if fit is not None else fit_carry_curve(anchors)
     return a * (speed_mph ** b)
 
-def estimate_carry(label: str, speed_mph: float, anchors: dict[str, Anchor], anchors_list: list[Anchor]) -> float:
+@timed("estimate_carry")
+def estimate_carry(label: str, speed_mph: float, anchors: dict[str, Anchor], anchors_list: list[Anchor],
+                   fit: Optional[Tuple[float, float]] = None, loft_table: Optional[LoftTable] = None) -> float:
     """
     ✅ Wedges: loft-based carry interpolation.
     Everyone else: global speed->carry curve.
+    `fit` and `loft_table` may be passed precomputed (see CardModel).
     """
     if category_of(label) == "wedge":
         loft = parse_loft(label)
         if loft is not None:
-            pts = _wedge_points(anchors)
-            c = _interp_by_loft(loft, pts, which="carry")
+            table = loft_table if loft_table is not None else LoftTable.from_anchors(anchors)
+            c = table.lookup(loft, "carry")
             if c is not None:
                 return float(c)
-    return float(estimate_carry_from_speed(speed_mph, anchors_list))
+    return float(estimate_carry_from_speed(speed_mph, anchors_list, fit))
 
 def responsiveness_exponent(club_speed: float, driver_speed: float, p: float) -> float:
     r = club_speed / driver_speed
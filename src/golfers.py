@@ -0,0 +1,343 @@
+"""
+Persistent golfer profiles and CHS history (SQLite, stdlib sqlite3).
+
+    golfers           handle -> saved anchor profile, preset, offset
+    bags              (golfer, position) -> club               custom bag
+    anchor_overrides  (golfer, club) -> [club speed], carry    the golfer's own numbers, at the
+                                                               profile's baseline driver CHS
+    chs_readings      dated driver CHS readings
+    chs_daily         (golfer, day) -> count, sum, last CHS    maintained by triggers
+
+Rolling 7/30-day CHS averages read the golfer's daily buckets for the window
+through the (golfer_id, day) primary key. That is at most 30 rows however
+long the history is. Triggers keep the buckets in step with every insert
+or delete on chs_readings, including batched executemany writes.
+
+Connections come from a small pool (WAL, synchronous=NORMAL), so readers
+in different Streamlit sessions do not block each other or the writer.
+
+    python -m src.golfers info alice
+    python -m src.golfers import readings.csv      # handle,date,chs rows, batched
+"""
+import argparse
+import csv
+import datetime as dt
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+DB_PATH = Path(os.environ.get("YARDAGE_GOLFERS", ROOT / "data" / "golfers.sqlite"))
+
+POOL_SIZE = 4
+BATCH_ROWS = 5_000
+WINDOWS = (7, 30)
+
+SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS golfers (
+    id          INTEGER PRIMARY KEY,
+    handle      TEXT NOT NULL UNIQUE,
+    name        TEXT,
+    profile_id  TEXT,
+    preset      TEXT,
+    offset_yd   REAL NOT NULL DEFAULT 0,
+    updated_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bags (
+    golfer_id  INTEGER NOT NULL REFERENCES golfers(id) ON DELETE CASCADE,
+    position   INTEGER NOT NULL,
+    club       TEXT NOT NULL,
+    PRIMARY KEY (golfer_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS anchor_overrides (
+    golfer_id       INTEGER NOT NULL REFERENCES golfers(id) ON DELETE CASCADE,
+    club            TEXT NOT NULL,
+    club_speed_mph  REAL,
+    carry_yd        REAL NOT NULL,
+    PRIMARY KEY (golfer_id, club)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chs_readings (
+    id         INTEGER PRIMARY KEY,
+    golfer_id  INTEGER NOT NULL REFERENCES golfers(id) ON DELETE CASCADE,
+    day        TEXT NOT NULL,
+    chs        REAL NOT NULL,
+    source     TEXT NOT NULL DEFAULT 'app',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chs_readings_golfer_day ON chs_readings (golfer_id, day);
+CREATE TABLE IF NOT EXISTS chs_daily (
+    golfer_id  INTEGER NOT NULL,
+    day        TEXT NOT NULL,
+    n          INTEGER NOT NULL,
+    total      REAL NOT NULL,
+    last_chs   REAL NOT NULL,
+    PRIMARY KEY (golfer_id, day)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS chs_readings_ai AFTER INSERT ON chs_readings BEGIN
+    INSERT INTO chs_daily (golfer_id, day, n, total, last_chs) VALUES (NEW.golfer_id, NEW.day, 1, NEW.chs, NEW.chs)
+    ON CONFLICT (golfer_id, day) DO UPDATE SET n = n + 1, total = total + excluded.total, last_chs = excluded.last_chs;
+END;
+-- Recreated on open so databases from before last_chs was maintained on delete pick it up
+DROP TRIGGER IF EXISTS chs_readings_ad;
+CREATE TRIGGER chs_readings_ad AFTER DELETE ON chs_readings BEGIN
+    UPDATE chs_daily SET n = n - 1, total = total - OLD.chs,
+        last_chs = COALESCE((SELECT chs FROM chs_readings WHERE golfer_id = OLD.golfer_id AND day = OLD.day
+                             ORDER BY id DESC LIMIT 1), last_chs)
+    WHERE golfer_id = OLD.golfer_id AND day = OLD.day;
+    DELETE FROM chs_daily WHERE golfer_id = OLD.golfer_id AND day = OLD.day AND n <= 0;
+END;
+COMMIT;
+"""
+
+@dataclass(frozen=True)
+class Golfer:
+    id: int
+    handle: str
+    name: Optional[str]
+    profile_id: Optional[str]
+    preset: Optional[str]
+    offset: float
+    bag: Tuple[str, ...] = ()
+    # club -> (club speed or None, carry)
+    anchors: Dict[str, Tuple[Optional[float], float]] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class ChsStats:
+    last: Optional[float]
+    last_day: Optional[str]
+    # window days -> (average or None, readings)
+    windows: Dict[int, Tuple[Optional[float], int]]
+
+    def avg(self, days: int) -> Optional[float]:
+        return self.windows.get(days, (None, 0))[0]
+
+def _day(day) -> str:
+    if day is None:
+        return dt.date.today().isoformat()
+    if isinstance(day, dt.date):
+        return day.isoformat()
+    return dt.date.fromisoformat(str(day)[:10]).isoformat()
+
+class GolferStore:
+    """Thread-safe access to the golfer database through a small connection pool."""
+
+    def __init__(self, path: Path = DB_PATH, pool_size: int = POOL_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._max = pool_size
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection (autocommit; use transaction() for writes)."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._size < self._max
+                if grow:
+                    self._size += 1
+            conn = self._connect() if grow else self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._size = 0
+
+    # -- golfers --------------------------------------------------------
+    def save_golfer(self, handle: str, *, name: Optional[str] = None, profile_id: Optional[str] = None,
+                    preset: Optional[str] = None, offset: Optional[float] = None,
+                    bag: Optional[Sequence[str]] = None) -> int:
+        """Create or update a golfer; fields left as None keep their stored value."""
+        with self.transaction() as conn:
+            golfer_id = self._upsert(conn, handle, name, profile_id, preset, offset)
+            if bag is not None:
+                conn.execute("DELETE FROM bags WHERE golfer_id = ?", (golfer_id,))
+                conn.executemany("INSERT INTO bags (golfer_id, position, club) VALUES (?, ?, ?)",
+                                 [(golfer_id, i, club) for i, club in enumerate(bag)])
+        return golfer_id
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, handle: str, name=None, profile_id=None, preset=None, offset=None) -> int:
+        row = conn.execute(
+            "INSERT INTO golfers (handle, name, profile_id, preset, offset_yd, updated_at) "
+            "VALUES (?, ?, ?, ?, COALESCE(?, 0), ?) "
+            "ON CONFLICT (handle) DO UPDATE SET "
+            "name = COALESCE(excluded.name, name), profile_id = COALESCE(excluded.profile_id, profile_id), "
+            "preset = COALESCE(excluded.preset, preset), "
+            "offset_yd = CASE WHEN ? IS NULL THEN offset_yd ELSE excluded.offset_yd END, "
+            "updated_at = excluded.updated_at RETURNING id",
+            (handle, name, profile_id, preset, offset, time.time(), offset),
+        ).fetchone()
+        return int(row[0])
+
+    def get(self, handle: str) -> Optional[Golfer]:
+        with self.connection() as conn:
+            row = conn.execute("SELECT id, handle, name, profile_id, preset, offset_yd FROM golfers WHERE handle = ?",
+                               (handle,)).fetchone()
+            if row is None:
+                return None
+            bag = tuple(r[0] for r in conn.execute(
+                "SELECT club FROM bags WHERE golfer_id = ? ORDER BY position", (row[0],)))
+            anchors = {club: (speed, carry) for club, speed, carry in conn.execute(
+                "SELECT club, club_speed_mph, carry_yd FROM anchor_overrides WHERE golfer_id = ?", (row[0],))}
+        return Golfer(id=row[0], handle=row[1], name=row[2], profile_id=row[3], preset=row[4],
+                      offset=float(row[5]), bag=bag, anchors=anchors)
+
+    def set_anchors(self, handle: str, anchors: Dict[str, Tuple[Optional[float], float]],
+                    replace: bool = False) -> None:
+        """club -> (club speed or None, carry). replace=True drops the clubs not given."""
+        with self.transaction() as conn:
+            golfer_id = self._upsert(conn, handle)
+            if replace:
+                conn.execute("DELETE FROM anchor_overrides WHERE golfer_id = ?", (golfer_id,))
+            conn.executemany(
+                "INSERT INTO anchor_overrides (golfer_id, club, club_speed_mph, carry_yd) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (golfer_id, club) DO UPDATE SET club_speed_mph = excluded.club_speed_mph, "
+                "carry_yd = excluded.carry_yd",
+                [(golfer_id, club, None if speed is None else float(speed), float(carry))
+                 for club, (speed, carry) in anchors.items()],
+            )
+
+    def count(self) -> int:
+        with self.connection() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM golfers").fetchone()[0])
+
+    # -- CHS history ------------------------------------------------------
+    def add_reading(self, handle: str, chs: float, day=None, source: str = "app") -> None:
+        self.add_readings([(handle, day, chs, source)])
+
+    def add_readings(self, rows: Iterable[Tuple[str, object, float, str]], batch: int = BATCH_ROWS) -> int:
+        """
+        Insert (handle, day, chs, source) rows, one transaction per `batch`
+        rows; unknown handles are created. Returns the number of rows written.
+        """
+        n = 0
+        ids: Dict[str, int] = {}
+        chunk: List[tuple] = []
+
+        def flush() -> None:
+            with self.transaction() as conn:
+                for handle in {r[0] for r in chunk if r[0] not in ids}:
+                    ids[handle] = self._upsert(conn, handle)
+                now = time.time()
+                conn.executemany(
+                    "INSERT INTO chs_readings (golfer_id, day, chs, source, created_at) VALUES (?, ?, ?, ?, ?)",
+                    [(ids[h], _day(d), float(c), s, now) for h, d, c, s in chunk],
+                )
+            chunk.clear()
+
+        for row in rows:
+            chunk.append(row)
+            n += 1
+            if len(chunk) >= batch:
+                flush()
+        if chunk:
+            flush()
+        return n
+
+    def stats(self, handle: str, today=None) -> ChsStats:
+        """Latest reading and rolling averages over the last 7/30 days (inclusive of today)."""
+        today = dt.date.fromisoformat(_day(today))
+        start = (today - dt.timedelta(days=max(WINDOWS) - 1)).isoformat()
+        with self.connection() as conn:
+            golfer = conn.execute("SELECT id FROM golfers WHERE handle = ?", (handle,)).fetchone()
+            if golfer is None:
+                return ChsStats(None, None, {w: (None, 0) for w in WINDOWS})
+            last = conn.execute(
+                "SELECT day, last_chs FROM chs_daily WHERE golfer_id = ? AND day <= ? ORDER BY day DESC LIMIT 1",
+                (golfer[0], today.isoformat())).fetchone()
+            days = conn.execute(
+                "SELECT day, n, total FROM chs_daily WHERE golfer_id = ? AND day BETWEEN ? AND ?",
+                (golfer[0], start, today.isoformat())).fetchall()
+        windows = {}
+        for w in WINDOWS:
+            lo = (today - dt.timedelta(days=w - 1)).isoformat()
+            n = sum(r[1] for r in days if r[0] >= lo)
+            total = sum(r[2] for r in days if r[0] >= lo)
+            windows[w] = (total / n if n else None, n)
+        return ChsStats(last=None if last is None else last[1], last_day=None if last is None else last[0],
+                        windows=windows)
+
+    def history(self, handle: str, days: int = 90, today=None) -> List[dict]:
+        """Daily mean CHS for the last `days` days, oldest first."""
+        today = dt.date.fromisoformat(_day(today))
+        start = (today - dt.timedelta(days=days - 1)).isoformat()
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT d.day, d.n, d.total FROM chs_daily d JOIN golfers g ON g.id = d.golfer_id "
+                "WHERE g.handle = ? AND d.day BETWEEN ? AND ? ORDER BY d.day",
+                (handle, start, today.isoformat())).fetchall()
+        return [{"day": day, "readings": n, "chs": total / n} for day, n, total in rows]
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--db", type=Path, default=DB_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    i = sub.add_parser("info", help="print a golfer's saved settings and CHS stats")
+    i.add_argument("handle")
+    m = sub.add_parser("import", help="append CHS readings from a handle,date,chs CSV")
+    m.add_argument("csv", type=Path)
+    m.add_argument("--source", default="import")
+    args = ap.parse_args(argv)
+
+    store = GolferStore(args.db)
+    if args.cmd == "info":
+        golfer = store.get(args.handle)
+        if golfer is None:
+            ap.error(f"unknown golfer: {args.handle}")
+        s = store.stats(args.handle)
+        print(json.dumps({
+            "handle": golfer.handle, "name": golfer.name, "profile": golfer.profile_id, "preset": golfer.preset,
+            "offset": golfer.offset, "bag": list(golfer.bag), "anchors": golfer.anchors,
+            "chs": {"last": s.last, "last_day": s.last_day,
+                    **{f"avg_{w}d": None if a is None else round(a, 1) for w, (a, _) in s.windows.items()}},
+        }, indent=2, ensure_ascii=False))
+    else:
+        t0 = time.perf_counter()
+        with args.csv.open(newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            rows = ((h, d, float(c), args.source) for h, d, c in (r[:3] for r in reader if r and r[0] != "handle"))
+            n = store.add_readings(rows)
+        print(f"{n} readings in {time.perf_counter() - t0:.2f}s ({store.count()} golfers)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Incremental recomputation of card values.
+
+A small pull-based dependency graph:
+
+    model -> baseline (speed, carry, rollout per club) -> exponent -> response fit
+    chs   -> curve (scaled carry, yd/mph) -> scaled ---> order/gaps per group
+                                          -> slope
+    offset -> carry -> total, max_carry, app-defined leaves (partials)
+
+set() compares new inputs with the current ones, marks everything
+downstream of a changed input dirty and records the invalidated nodes;
+get() recomputes only dirty nodes, on demand. Baselines do not depend on
+CHS, and the offset is purely additive, so an offset-only change is one
+vector add for carry/total. Order and gaps are reused as they are, because
+a common shift changes neither.
+
+Scaled carry and slope come from the per-club Chebyshev fit in
+src.response (the power law itself outside its CHS range), so values match
+src.yardage.compute_today / sorted_with_gaps to within response.TOL_YD.
+"""
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.yardage import CardModel, compute_baseline, shape_p
+from src.estimates import category_of, rollout_for
+from src.memory import register_shared_type, shared
+from src.response import ResponseFit, fit_response, response_at
+
+# Wedges tab when the bag has none
+DEFAULT_WEDGES = ("PW (46°)", "GW (50°)", "SW (56°)", "LW (60°)")
+
+# Graphs hold the process-wide model by reference; don't charge it to a session
+register_shared_type(CardModel)
+
+class Graph:
+    """Named inputs and derived nodes with lazy, dirty-flag recomputation."""
+
+    def __init__(self):
+        self._fns: Dict[str, Callable] = {}
+        self._deps: Dict[str, Tuple[str, ...]] = {}
+        self._down: Dict[str, List[str]] = defaultdict(list)
+        self._values: Dict[str, object] = {}
+        self._dirty: set = set()
+        self.last_changed: Tuple[str, ...] = ()
+        self.last_invalidated: Tuple[str, ...] = ()
+        # Nodes recomputed since the last set()
+        self.recomputed: List[str] = []
+
+    def input(self, name: str, value) -> None:
+        self._values[name] = value
+        self._fns.pop(name, None)
+
+    def node(self, name: str, deps: Sequence[str], fn: Callable) -> None:
+        """(Re)define a node; fn receives the dependency values in order."""
+        for d in self._deps.get(name, ()):
+            self._down[d].remove(name)
+        self._fns[name] = fn
+        self._deps[name] = tuple(deps)
+        for d in deps:
+            self._down[d].append(name)
+        self._invalidate([name])
+
+    def set(self, **inputs) -> Tuple[str, ...]:
+        """Update inputs; returns the nodes invalidated by the change."""
+        changed = [k for k, v in inputs.items() if self._values.get(k, object()) != v]
+        for k in changed:
+            self._values[k] = inputs[k]
+        self.last_changed = tuple(changed)
+        self.last_invalidated = self._invalidate(changed, include_roots=False)
+        self.recomputed = []
+        return self.last_invalidated
+
+    def _invalidate(self, roots: Iterable[str], include_roots: bool = True) -> Tuple[str, ...]:
+        seen: List[str] = []
+        stack = list(roots) if include_roots else [d for r in roots for d in self._down[r]]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.append(name)
+            self._dirty.add(name)
+            stack.extend(self._down[name])
+        return tuple(seen)
+
+    def get(self, name: str):
+        if name in self._fns and (name in self._dirty or name not in self._values):
+            args = [self.get(d) for d in self._deps[name]]
+            self._values[name] = self._fns[name](*args)
+            self._dirty.discard(name)
+            self.recomputed.append(name)
+        return self._values[name]
+
+    def nodes(self) -> Tuple[str, ...]:
+        return tuple(self._fns)
+
+class CardGraph(Graph):
+    """Card values for a fixed model and label set, driven by chs/offset."""
+
+    # Nodes that depend only on the model and labels; see shared_parts()
+    SHARED = ("baseline", "exponent", "response")
+
+    def __init__(self, model: CardModel, labels: Sequence[str], chs: float, offset: float,
+                 shared: Optional[Tuple[object, ...]] = None):
+        """
+        shared: values of SHARED from another graph with the same model and
+        labels (CardGraph.shared_parts()). They are used by reference,
+        never copied or modified, so sessions can share one set.
+        """
+        super().__init__()
+        self.model = model
+        self.labels = tuple(dict.fromkeys(labels))
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self._groups: Dict[str, Tuple[str, ...]] = {}
+
+        self.input("chs", float(chs))
+        self.input("offset", float(offset))
+        self.node("baseline", (), self._baseline)
+        self.node("exponent", ("baseline",), self._exponent)
+        self.node("response", ("baseline", "exponent"), self._response)
+        self.node("curve", ("response", "baseline", "exponent", "chs"), self._curve)
+        self.node("scaled", ("curve",), lambda curve: curve[0])
+        self.node("slope", ("curve",), lambda curve: curve[1])
+        self.node("carry", ("scaled", "offset"), lambda scaled, offset: scaled + offset)
+        self.node("total", ("carry", "baseline"), lambda carry, base: carry + base[2])
+        self.node("max_carry", ("carry",), self._max_carry)
+        if shared is not None:
+            for name, value in zip(self.SHARED, shared):
+                self.input(name, value)
+
+    def shared_parts(self) -> Tuple[object, ...]:
+        return tuple(self.get(name) for name in self.SHARED)
+
+    # -- node functions ---------------------------------------------------
+    def _baseline(self):
+        n = len(self.labels)
+        spd0 = np.full(n, np.nan)
+        carry0 = np.full(n, np.nan)
+        rollout = np.zeros(n)
+        for i, label in enumerate(self.labels):
+            spd, carry = compute_baseline(self.model, label)
+            if spd is not None and carry is not None:
+                spd0[i], carry0[i] = spd, carry
+                rollout[i] = rollout_for(label, self.model.rollout_cfg)
+        return spd0, carry0, rollout
+
+    def _exponent(self, base):
+        p = np.array([shape_p(self.model, label) for label in self.labels])
+        return (base[0] / self.model.chs0) ** p
+
+    def _response(self, base, g) -> Optional[ResponseFit]:
+        # None if the fit misses TOL_YD; the curve then evaluates the power law directly
+        return fit_response(base[1], g, self.model.chs0)
+
+    def _curve(self, fit, base, g, chs):
+        return response_at(fit, base[1], g, self.model.chs0, chs)
+
+    def _max_carry(self, carry):
+        i = self.index.get("Driver")
+        v = carry[i] if i is not None else np.nan
+        return float(v) if np.isfinite(v) and v else 1.0
+
+    def _gaps(self, labels: Tuple[str, ...], scaled):
+        """Order (longest first, unmodeled last) and gaps; offset-invariant."""
+        idx = np.array([self.index[label] for label in labels], dtype=np.int64)
+        vals = scaled[idx]
+        key = np.where(np.isnan(vals), -1e9, vals)
+        order = idx[np.argsort(-key, kind="stable")]
+        gaps = np.full(len(order), np.nan)
+        modeled = [k for k, i in enumerate(order) if not np.isnan(scaled[i])]
+        for a, b in zip(modeled, modeled[1:]):
+            gaps[a] = scaled[order[a]] - scaled[order[b]]
+        return order, gaps
+
+    # -- queries ------------------------------------------------------------
+    def group(self, name: str, labels: Sequence[str]) -> None:
+        """Declare a club group (e.g. the bag's clubs or wedges) for rows()."""
+        labels = tuple(label for label in labels if label in self.index)
+        if self._groups.get(name) != labels:
+            self._groups[name] = labels
+            self.node(f"gaps:{name}", ("scaled",), lambda scaled, labels=labels: self._gaps(labels, scaled))
+
+    def rows(self, name: str) -> List[dict]:
+        """
+        Same shape as sorted_with_gaps, {club, carry, total, gap}, longest
+        first, plus "slope" (yd per mph of driver CHS).
+        """
+        order, gaps = self.get(f"gaps:{name}")
+        carry = self.get("carry")[order].tolist()
+        total = self.get("total")[order].tolist()
+        slope = self.get("slope")[order].tolist()
+        out = []
+        for i, c, t, gap, d in zip(order.tolist(), carry, total, gaps.tolist(), slope):
+            modeled = c == c  # not NaN
+            out.append({
+                "club": self.labels[i],
+                "carry": c if modeled else None,
+                "total": t if modeled else None,
+                "gap": gap if gap == gap else None,
+                "slope": d if modeled else None,
+            })
+        return out
+
+    def carry_total(self, label: str) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """(carry, total) at the current inputs, or None if label is not in the graph."""
+        i = self.index.get(label)
+        if i is None:
+            return None
+        c = self.get("carry")[i]
+        if np.isnan(c):
+            return None, None
+        return float(c), float(self.get("total")[i])
+
+def card_groups(catalog: Sequence[str], bag: Sequence[str]) -> Tuple[List[str], List[str], Tuple[str, ...]]:
+    """(Clubs tab labels, Wedges tab labels, every label a session's graph serves) for a bag."""
+    clubs = [x for x in bag if category_of(x) not in ("wedge", "putter")]
+    wedges = [x for x in bag if category_of(x) == "wedge"] or list(DEFAULT_WEDGES)
+    return clubs, wedges, tuple(dict.fromkeys(list(catalog) + list(bag) + wedges))
+
+def shared_card_graph(model: CardModel, model_key: str, labels: Tuple[str, ...],
+                      chs: float, offset: float) -> CardGraph:
+    """A new CardGraph whose model-only nodes are one copy per (model key, labels) in src.memory.shared."""
+    parts = shared.get_or_create(("card_graph", (model_key, labels)),
+                                 lambda: CardGraph(model, labels, chs, offset).shared_parts())
+    return CardGraph(model, labels, chs, offset, shared=parts)
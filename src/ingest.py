@@ -0,0 +1,250 @@
+"""
+Streaming launch-monitor CSV ingestion -> personal anchors.
+
+Reads an export of any size in fixed-size chunks, normalizes club labels
+through the catalog parser, and accumulates per-club fixed-width histograms
+of club speed and carry. A shot is counted only if both values are valid and
+on their grids, so the speed and carry medians describe the same shots. They
+come from the histograms, so memory is O(clubs x bins) no matter how many
+rows the file has.
+
+    python -m src.ingest shots.csv > anchors.yaml
+    python -m src.ingest shots.csv --out data/profiles/me.yaml --name "Me"
+
+The profile's driver_chs_mph is the Driver anchor's median club speed. An
+export without (enough) Driver shots needs --driver-chs; otherwise the
+profile would silently inherit the base config's driver CHS.
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.catalog import _sort_key, normalize_club_label
+from src.estimates import category_of, parse_loft
+
+CHUNK_ROWS = 250_000
+
+# Histogram grids (units: mph, yd). 0.1 resolution; a shot with either value outside is dropped.
+SPEED_RANGE = (20.0, 160.0)
+CARRY_RANGE = (5.0, 420.0)
+BIN_WIDTH = 0.1
+
+# Column name candidates, matched case-insensitively
+CLUB_COLS = ("club", "club type", "club name", "clubtype", "club_type")
+SPEED_COLS = ("club speed", "clubhead speed", "club head speed", "club_speed", "clubspeed", "club speed (mph)")
+CARRY_COLS = ("carry", "carry distance", "carry_distance", "carry (yds)", "carry flat", "carry_yd")
+
+SPEED_FACTORS = {"mph": 1.0, "kmh": 0.621371, "ms": 2.236936}
+CARRY_FACTORS = {"yd": 1.0, "m": 1.093613}
+
+def _n_bins(lo_hi) -> int:
+    lo, hi = lo_hi
+    return int(round((hi - lo) / BIN_WIDTH))
+
+@dataclass
+class ClubHistograms:
+    """Per-club speed/carry histograms grown as new clubs appear."""
+    labels: List[str] = field(default_factory=list)
+    index: Dict[str, int] = field(default_factory=dict)
+    speed: np.ndarray = field(default_factory=lambda: np.zeros((0, _n_bins(SPEED_RANGE)), dtype=np.int64))
+    carry: np.ndarray = field(default_factory=lambda: np.zeros((0, _n_bins(CARRY_RANGE)), dtype=np.int64))
+    rows_in: int = 0
+    rows_used: int = 0
+    unknown_labels: Dict[str, int] = field(default_factory=dict)
+
+    def club_index(self, label: str) -> int:
+        i = self.index.get(label)
+        if i is None:
+            i = len(self.labels)
+            self.labels.append(label)
+            self.index[label] = i
+            self.speed = np.vstack([self.speed, np.zeros((1, self.speed.shape[1]), dtype=np.int64)])
+            self.carry = np.vstack([self.carry, np.zeros((1, self.carry.shape[1]), dtype=np.int64)])
+        return i
+
+    def add(self, club_idx: np.ndarray, speed: np.ndarray, carry: np.ndarray) -> int:
+        """
+        Vectorized add of one chunk; club_idx must already be valid indices and
+        speed/carry finite. Returns the number of shots added (both values on grid).
+        """
+        sb = np.floor((speed - SPEED_RANGE[0]) / BIN_WIDTH).astype(np.int64)
+        cb = np.floor((carry - CARRY_RANGE[0]) / BIN_WIDTH).astype(np.int64)
+        ok = (sb >= 0) & (sb < self.speed.shape[1]) & (cb >= 0) & (cb < self.carry.shape[1])
+        for hist, b in ((self.speed, sb[ok]), (self.carry, cb[ok])):
+            nb = hist.shape[1]
+            hist += np.bincount(club_idx[ok] * nb + b, minlength=hist.size).reshape(hist.shape)
+        return int(ok.sum())
+
+def _hist_median(counts: np.ndarray, lo: float) -> Optional[float]:
+    n = int(counts.sum())
+    if n == 0:
+        return None
+    cum = np.cumsum(counts)
+    i = int(np.searchsorted(cum, (n + 1) / 2.0))
+    # Linear interpolation within the median bin
+    prev = cum[i - 1] if i > 0 else 0
+    frac = ((n + 1) / 2.0 - prev) / counts[i] if counts[i] else 0.5
+    return float(lo + (i + min(max(frac, 0.0), 1.0)) * BIN_WIDTH)
+
+def _pick_column(columns: Sequence[str], explicit: Optional[str], candidates: Iterable[str], what: str) -> str:
+    if explicit:
+        if explicit not in columns:
+            raise ValueError(f"{what} column {explicit!r} not in CSV header")
+        return explicit
+    lowered = {c.strip().lower(): c for c in columns}
+    for cand in candidates:
+        if cand in lowered:
+            return lowered[cand]
+    raise ValueError(f"could not find a {what} column; pass --{what}-col (header: {list(columns)})")
+
+def map_clubs(raw_labels: pd.Series, label_cache: Dict[str, int], club_index: Callable[[str], int],
+              unknown: Dict[str, int]) -> np.ndarray:
+    """
+    Per-row club index for one chunk (-1 = unrecognized/putter/NA).
+    Normalization runs once per distinct raw label, cached in label_cache.
+    """
+    codes, uniques = pd.factorize(raw_labels, use_na_sentinel=True)
+    lut = np.empty(len(uniques) + 1, dtype=np.int64)
+    lut[-1] = -1  # NA sentinel (-1) indexes the last slot
+    for j, raw in enumerate(uniques):
+        idx = label_cache.get(raw)
+        if idx is None:
+            label = normalize_club_label(raw)
+            idx = club_index(label) if label and category_of(label) != "putter" else -1
+            label_cache[raw] = idx
+        if idx < 0:
+            unknown[raw] = unknown.get(raw, 0) + int((codes == j).sum())
+        lut[j] = idx
+    return lut[codes]
+
+def ingest_csv(path: Path, club_col: Optional[str] = None, speed_col: Optional[str] = None,
+               carry_col: Optional[str] = None, speed_unit: str = "mph", carry_unit: str = "yd",
+               chunk_rows: int = CHUNK_ROWS, **read_csv_kwargs) -> ClubHistograms:
+    header = pd.read_csv(path, nrows=0, **read_csv_kwargs).columns
+    club_col = _pick_column(header, club_col, CLUB_COLS, "club")
+    speed_col = _pick_column(header, speed_col, SPEED_COLS, "speed")
+    carry_col = _pick_column(header, carry_col, CARRY_COLS, "carry")
+    speed_k = SPEED_FACTORS[speed_unit]
+    carry_k = CARRY_FACTORS[carry_unit]
+
+    h = ClubHistograms()
+    # raw label -> club index (-1 = unrecognized); bounded by distinct raw labels
+    label_cache: Dict[str, int] = {}
+
+    reader = pd.read_csv(
+        path,
+        usecols=[club_col, speed_col, carry_col],
+        dtype={club_col: "string"},
+        chunksize=chunk_rows,
+        **read_csv_kwargs,
+    )
+    for chunk in reader:
+        h.rows_in += len(chunk)
+        club_idx = map_clubs(chunk[club_col], label_cache, h.club_index, h.unknown_labels)
+
+        speed = pd.to_numeric(chunk[speed_col], errors="coerce").to_numpy(dtype=np.float64) * speed_k
+        carry = pd.to_numeric(chunk[carry_col], errors="coerce").to_numpy(dtype=np.float64) * carry_k
+        ok = (club_idx >= 0) & np.isfinite(speed) & np.isfinite(carry)
+        h.rows_used += h.add(club_idx[ok], speed[ok], carry[ok])
+    return h
+
+def anchors_from_histograms(h: ClubHistograms, min_shots: int = 20) -> List[dict]:
+    """Anchor dicts (same keys as baseline.anchors) sorted in golf order."""
+    out = []
+    for label in sorted(h.labels, key=_sort_key):
+        i = h.index[label]
+        # Both histograms hold the same shots (ClubHistograms.add)
+        n = int(h.speed[i].sum())
+        if n < min_shots:
+            continue
+        spd = _hist_median(h.speed[i], SPEED_RANGE[0])
+        carry = _hist_median(h.carry[i], CARRY_RANGE[0])
+        if spd is None or carry is None:
+            continue
+        a = {
+            "label": label,
+            "club_speed_mph": round(spd, 1),
+            "carry_yd": round(carry, 1),
+            "category": category_of(label),
+        }
+        loft = parse_loft(label)
+        if loft is not None:
+            a["loft_deg"] = loft
+        a["shots"] = n
+        out.append(a)
+    return out
+
+def anchors_yaml(anchors: List[dict], name: Optional[str] = None, driver_chs: Optional[float] = None) -> str:
+    """
+    Profile YAML in the same one-line-per-anchor style as data/config.yaml;
+    loads as a data/profiles/<id>.yaml file or pastes under baseline.anchors.
+    """
+    lines = []
+    if name:
+        lines.append(f"name: {json.dumps(name, ensure_ascii=False)}")
+    if driver_chs is not None:
+        lines.append(f"driver_chs_mph: {driver_chs:g}")
+    lines.append("anchors:")
+    for a in anchors:
+        parts = [
+            f'label: {json.dumps(a["label"], ensure_ascii=False)}',
+            f'club_speed_mph: {a["club_speed_mph"]:g}',
+            f'carry_yd: {a["carry_yd"]:g}',
+            f'category: {a["category"]}',
+        ]
+        if a.get("loft_deg") is not None:
+            parts.append(f'loft_deg: {a["loft_deg"]}')
+        lines.append("  - { " + ", ".join(parts) + " }")
+    return "\n".join(lines) + "\n"
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("csv", type=Path)
+    ap.add_argument("--club-col")
+    ap.add_argument("--speed-col")
+    ap.add_argument("--carry-col")
+    ap.add_argument("--speed-unit", choices=sorted(SPEED_FACTORS), default="mph")
+    ap.add_argument("--carry-unit", choices=sorted(CARRY_FACTORS), default="yd")
+    ap.add_argument("--min-shots", type=int, default=20)
+    ap.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    ap.add_argument("--driver-chs", type=float,
+                    help="driver CHS (mph) for the profile; required when the export has no Driver anchor")
+    ap.add_argument("--name", help="profile display name (written with the anchors)")
+    ap.add_argument("--out", type=Path, help="write a profile YAML here instead of stdout")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    h = ingest_csv(args.csv, args.club_col, args.speed_col, args.carry_col,
+                   args.speed_unit, args.carry_unit, args.chunk_rows)
+    elapsed = time.perf_counter() - t0
+
+    anchors = anchors_from_histograms(h, args.min_shots)
+    driver = next((a for a in anchors if a["label"] == "Driver"), None)
+    driver_chs = args.driver_chs if args.driver_chs is not None else (driver["club_speed_mph"] if driver else None)
+    if driver_chs is None:
+        ap.error(f"no Driver anchor (fewer than {args.min_shots} Driver shots); pass --driver-chs")
+    text = anchors_yaml(anchors, args.name, driver_chs)
+
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+
+    rate = h.rows_in / elapsed if elapsed else 0.0
+    print(f"{h.rows_in:,} rows ({h.rows_used:,} used) in {elapsed:.2f}s = {rate:,.0f} rows/s; "
+          f"{len(anchors)} anchors", file=sys.stderr)
+    for a in anchors:
+        print(f"  {a['label']:<12} n={a['shots']:<8} speed {a['club_speed_mph']:.1f}  carry {a['carry_yd']:.1f}", file=sys.stderr)
+    if h.unknown_labels:
+        top = sorted(h.unknown_labels.items(), key=lambda kv: -kv[1])[:10]
+        print("  skipped clubs (unrecognized or putter): " + ", ".join(f"{k!r} ({v})" for k, v in top), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Shared, memory-mapped yardage lookup file.
+
+An offline build step writes carry/total for every catalog (and preset)
+club x driver CHS on a 0.1 mph grid x anchor profile to one flat file:
+
+    0            4s   magic b"YDT1"
+    4            <I   header length
+    8            ...  JSON header (labels, profiles with model keys, CHS grid, data_offset)
+    data_offset  ...  little-endian float64 [profile][chs][label][carry, total], NaN = no model
+                      (64-byte aligned)
+
+Readers mmap the file, so every Streamlit/API process on a host shares one
+page-cached copy. Opening it parses only the small header; a read is index
+arithmetic into the mapped array. Values are at zero offset (the offset is
+additive). Profiles are matched by model key (src.profiles.model_key), so a
+file built from an older config is never used for a profile whose anchors
+or model settings changed; callers fall back to computing.
+
+    python -m src.lookup build                 # -> data/yardage.ydt
+    python -m src.lookup info data/yardage.ydt
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers still never share a tmp file, they just aren't serialized
+    fcntl = None
+
+from src.yardage import CardModel, compute_baseline, compute_today, shape_p
+from src.config import load_compiled
+from src.estimates import category_of, rollout_for
+
+ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = ROOT / "data" / "config.yaml"
+TABLE_PATH = Path(os.environ.get("YARDAGE_TABLE", ROOT / "data" / "yardage.ydt"))
+
+MAGIC = b"YDT1"
+ALIGN = 64
+CHS_RANGE = (90.0, 135.0)
+STEPS_PER_MPH = 10
+
+def _grid(lo: float, hi: float, steps_per_mph: int) -> np.ndarray:
+    # Integer numerators so grid points equal the float literals (105.0, not 105.00000000000001)
+    return np.arange(round(lo * steps_per_mph), round(hi * steps_per_mph) + 1) / steps_per_mph
+
+def profile_block(model: CardModel, labels: Sequence[str], chs: np.ndarray) -> np.ndarray:
+    """(len(chs), len(labels), 2) carry/total at zero offset; same formula as compute_today."""
+    carry0 = np.full(len(labels), np.nan)
+    g = np.zeros(len(labels))
+    rollout = np.zeros(len(labels))
+    for j, label in enumerate(labels):
+        spd0, c0 = compute_baseline(model, label)
+        if spd0 is None or c0 is None:
+            continue
+        carry0[j] = c0
+        g[j] = (spd0 / model.chs0) ** shape_p(model, label)
+        rollout[j] = rollout_for(label, model.rollout_cfg)
+    # One broadcast over CHS x labels; unmodeled labels stay NaN through carry0
+    out = np.empty((len(chs), len(labels), 2))
+    out[:, :, 0] = carry0[None, :] * (np.asarray(chs, dtype=float)[:, None] / model.chs0) ** g[None, :]
+    out[:, :, 1] = out[:, :, 0] + rollout[None, :]
+    return out
+
+@contextmanager
+def _build_lock(path: Path) -> Iterator[None]:
+    """Serialize writers of one lookup file across processes (flock on a sibling .lock file)."""
+    if fcntl is None:
+        yield
+        return
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+def build(cc, path: Path, chs_range: Tuple[float, float] = CHS_RANGE,
+          steps_per_mph: int = STEPS_PER_MPH) -> dict:
+    """Write the lookup file for a CompiledConfig; returns its header."""
+    labels = [x for x in dict.fromkeys(list(cc.catalog) + [c for bag in cc.presets.values() for c in bag])
+              if category_of(x) != "putter"]
+    chs = _grid(chs_range[0], chs_range[1], steps_per_mph)
+    ids = cc.profiles.ids()
+
+    header = {
+        "config_digest": cc.digest,
+        "labels": labels,
+        "profiles": [{"id": pid, "key": cc.profiles.key(pid)} for pid in ids],
+        "chs_lo_steps": int(round(chs_range[0] * steps_per_mph)),
+        "n_chs": len(chs),
+        "steps_per_mph": steps_per_mph,
+        "dtype": "<f8",
+    }
+    # The header records where the data starts; settle its own length first
+    data_offset = 0
+    while True:
+        header["data_offset"] = data_offset
+        blob = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        aligned = -(-(8 + len(blob)) // ALIGN) * ALIGN
+        if aligned == data_offset:
+            break
+        data_offset = aligned
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Each writer gets its own tmp file in the target directory (so os.replace stays
+    # atomic); the lock keeps concurrent builders from doing the work side by side
+    with _build_lock(path):
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(struct.pack("<4sI", MAGIC, len(blob)))
+                f.write(blob)
+                f.write(b"\0" * (data_offset - 8 - len(blob)))
+                for pid in ids:
+                    f.write(profile_block(cc.profiles.model(pid), labels, chs).astype("<f8").tobytes())
+            os.chmod(tmp, 0o644)  # mkstemp creates 0600; other service users map this file
+            # Readers keep their mapping of the old inode; new opens see the new file
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+    return header
+
+class YardageTable:
+    """Read-only view of a lookup file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, hlen = struct.unpack_from("<4sI", self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a yardage lookup file")
+        self.header = json.loads(self._mm[8:8 + hlen])
+        self.labels: Tuple[str, ...] = tuple(self.header["labels"])
+        self._label_ix: Dict[str, int] = {label: i for i, label in enumerate(self.labels)}
+        self._profile_ix: Dict[str, int] = {p["key"]: i for i, p in enumerate(self.header["profiles"])}
+        self._lo = self.header["chs_lo_steps"]
+        self._n_chs = self.header["n_chs"]
+        self._steps = self.header["steps_per_mph"]
+        shape = (len(self._profile_ix), self._n_chs, len(self.labels), 2)
+        self.values = np.frombuffer(self._mm, dtype=self.header["dtype"], count=int(np.prod(shape)),
+                                    offset=self.header["data_offset"]).reshape(shape)
+
+    def has(self, model_key: str) -> bool:
+        return model_key in self._profile_ix
+
+    def carry_total(self, model_key: str, label: str, chs: float,
+                    offset: float = 0.0) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """(carry, total), (None, None) if unmodeled, or None if the file can't answer
+        (unknown profile key or label, CHS off the grid or out of range)."""
+        p = self._profile_ix.get(model_key)
+        j = self._label_ix.get(label)
+        if p is None or j is None:
+            return None
+        x = chs * self._steps
+        k = round(x)
+        i = k - self._lo
+        if abs(x - k) > 1e-6 or not 0 <= i < self._n_chs:
+            return None
+        carry, total = self.values[p, i, j].tolist()
+        if carry != carry:  # NaN
+            return None, None
+        return carry + offset, total + offset
+
+class TableStore:
+    """
+    Process-wide holder of the mapped file; get() is a stat() call when
+    nothing changed and returns None while no file has been built.
+    """
+
+    def __init__(self, path: Path = TABLE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._table: Optional[YardageTable] = None
+
+    def get(self) -> Optional[YardageTable]:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return self._table
+        with self._lock:
+            if stamp != self._stamp:
+                try:
+                    self._table = YardageTable(self.path)
+                except (OSError, ValueError):
+                    self._table = None
+                self._stamp = stamp
+            return self._table
+
+def lookup_today(table: Optional[YardageTable], model_key: str, model: CardModel, label: str,
+                 chs_today: float, offset: float) -> Tuple[Optional[float], Optional[float]]:
+    """compute_today, answered from the lookup file when it covers the request."""
+    if table is not None:
+        hit = table.carry_total(model_key, label, chs_today, offset)
+        if hit is not None:
+            return hit
+    return compute_today(model, label, chs_today, offset)
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="write the lookup file from the config and its profiles")
+    b.add_argument("--config", type=Path, default=CONFIG_PATH)
+    b.add_argument("--out", type=Path, default=TABLE_PATH)
+    b.add_argument("--chs-min", type=float, default=CHS_RANGE[0])
+    b.add_argument("--chs-max", type=float, default=CHS_RANGE[1])
+    i = sub.add_parser("info", help="print a lookup file's header")
+    i.add_argument("path", type=Path, nargs="?", default=TABLE_PATH)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        cc = load_compiled(args.config)
+        header = build(cc, args.out, (args.chs_min, args.chs_max))
+        size = args.out.stat().st_size
+        print(f"{args.out}: {len(header['profiles'])} profile(s) x {header['n_chs']} CHS x "
+              f"{len(header['labels'])} clubs, {size / 1024:.0f} KiB", file=sys.stderr)
+    else:
+        t = YardageTable(args.path)
+        h = dict(t.header)
+        h["labels"] = f"{len(t.labels)} labels"
+        print(json.dumps(h, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Per-session memory accounting and a shared, by-reference object store.
+
+deep_sizeof() estimates the bytes an object keeps alive: containers,
+dataclasses and __dict__/__slots__ objects, with numpy arrays counted by
+their buffer. Each object is counted once. It does not descend into objects
+shared by the whole process (compiled models and configs, modules,
+functions, classes), so a session is charged only for what it holds itself.
+
+SharedStore keeps large, immutable results once per process in an LRU
+bounded by bytes. st.cache_data pickles its values and hands every caller
+a fresh copy. SharedStore instead hands out the stored object itself, so N
+sessions showing the same shot pattern or card-graph baseline hold one
+copy between them.
+
+enforce_budget() keeps one session's st.session_state under a byte budget
+by evicting the largest rebuildable keys first.
+
+    YARDAGE_SESSION_BUDGET_KB   per-session budget (default 256)
+    YARDAGE_SHARED_MB           shared store budget (default 64)
+"""
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src import perf
+
+SESSION_BUDGET = int(os.environ.get("YARDAGE_SESSION_BUDGET_KB", "256")) * 1024
+SHARED_BUDGET = int(os.environ.get("YARDAGE_SHARED_MB", "64")) * 1024 * 1024
+
+# Not descended into: process-wide or code objects
+_OPAQUE = (types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, type,
+           threading.Thread)
+_shared_types: Tuple[type, ...] = ()
+
+def register_shared_type(*types_: type) -> None:
+    """Types whose instances are shared process-wide (counted as a reference only)."""
+    global _shared_types
+    _shared_types = tuple(dict.fromkeys(_shared_types + types_))
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """Approximate bytes kept alive by obj; `seen` carries ids across calls."""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _OPAQUE) or isinstance(o, _shared_types):
+            continue
+        seen.add(id(o))
+        if isinstance(o, np.ndarray):
+            # A view's buffer belongs to its base
+            total += sys.getsizeof(o) if o.base is not None else o.nbytes + 112
+            continue
+        total += sys.getsizeof(o)
+        if isinstance(o, (str, bytes, bytearray, int, float, complex, bool, type(None))):
+            continue
+        if isinstance(o, Mapping):
+            for k, v in o.items():
+                stack.append(k)
+                stack.append(v)
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        else:
+            d = getattr(o, "__dict__", None)
+            if d is not None:
+                stack.append(d)
+            for name in getattr(type(o), "__slots__", ()):
+                if hasattr(o, name):
+                    stack.append(getattr(o, name))
+    return total
+
+_MISSING = object()
+
+class SharedStore:
+    """Thread-safe LRU of immutable values, bounded by deep_sizeof bytes."""
+
+    def __init__(self, budget: int = SHARED_BUDGET):
+        self.budget = budget
+        self._lock = threading.Lock()
+        # key -> (value, bytes, ids of the objects it keeps alive)
+        self._items: "OrderedDict[Hashable, Tuple[object, int, frozenset]]" = OrderedDict()
+        self._building: Dict[Hashable, threading.Lock] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            hit = self._items.get(key)
+            if hit is None:
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return hit[0]
+
+    def put(self, key: Hashable, value) -> None:
+        seen: set = set()
+        size = deep_sizeof(value, seen)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._items[key] = (value, size, frozenset(seen))
+            self.bytes += size
+            while self.bytes > self.budget and len(self._items) > 1:
+                _, (_, dropped, _) = self._items.popitem(last=False)
+                self.bytes -= dropped
+                self.evictions += 1
+
+    def ids(self) -> set:
+        """ids of every object the store keeps alive (skipped by session_usage)."""
+        with self._lock:
+            return set().union(*(entry[2] for entry in self._items.values()))
+
+    def get_or_create(self, key: Hashable, build: Callable[[], object]):
+        """
+        The stored value for key, building it once if concurrent callers miss
+        together. A None result is stored like any other value.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            lock = self._building.setdefault(key, threading.Lock())
+        with lock:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                with self._lock:
+                    self.misses += 1
+                value = build()
+                self.put(key, value)
+        with self._lock:
+            self._building.pop(key, None)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            kinds: Dict[str, List[int]] = {}
+            for key, (_, size, _) in self._items.items():
+                kind = key[0] if isinstance(key, tuple) and key else type(key).__name__
+                k = kinds.setdefault(str(kind), [0, 0])
+                k[0] += 1
+                k[1] += size
+            return {"entries": len(self._items), "bytes": self.bytes, "budget": self.budget,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "kinds": {k: {"entries": n, "bytes": b} for k, (n, b) in sorted(kinds.items())}}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+shared = SharedStore()
+perf.register_cache("shared_store", lambda: (shared.hits, shared.misses))
+
+def session_usage(state: Mapping, store: Optional[SharedStore] = None) -> Dict[str, int]:
+    """
+    Bytes per key; objects reachable from several keys are charged to the
+    first, and objects held by the shared store (default `shared`) to none.
+    """
+    seen = (shared if store is None else store).ids()
+    return {str(k): deep_sizeof(v, seen) for k, v in sorted(state.items(), key=lambda kv: str(kv[0]))}
+
+def enforce_budget(state, evictable: Iterable[str], budget: int = SESSION_BUDGET,
+                   usage: Optional[Dict[str, int]] = None) -> List[str]:
+    """
+    Delete the largest `evictable` keys from a session state (any mutable
+    mapping, e.g. st.session_state) until it fits in `budget` bytes.
+    Returns the evicted keys; other keys are never touched.
+    """
+    usage = session_usage(state) if usage is None else usage
+    total = sum(usage.values())
+    evicted = []
+    for key in sorted((k for k in evictable if k in usage), key=lambda k: -usage[k]):
+        if total <= budget:
+            break
+        del state[key]
+        total -= usage[key]
+        evicted.append(key)
+    return evicted
@@ -0,0 +1,89 @@
+"""
+Wedge partial-swing matrix.
+
+One engine for the Wedges tab cards and the Debug tab's partial validation:
+full carry for a set of wedges (the catalog's whole 40–64° range plus the
+named wedges) against the configured feels, as one wedges x feel array.
+
+    Choke   = max(0, full - wedges.choke_down_subtract_yd)
+    <feel>  = full * feel ** wedges.partials.alpha     (feel_map, e.g. "75%": 0.75)
+
+Full carries for all wedges come from one src.lookup.profile_block call
+per CHS at zero offset. The offset is
+additive, so with_offset() moves a cached matrix to any offset with one
+vector add.
+"""
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.lookup import profile_block
+from src.yardage import CardModel
+
+CHOKE = "Choke"
+
+@dataclass(frozen=True)
+class PartialScheme:
+    choke_sub: float
+    alpha: float
+    # (column label, feel fraction), longest first
+    feels: Tuple[Tuple[str, float], ...]
+
+    @classmethod
+    def from_config(cls, cc) -> "PartialScheme":
+        feels = sorted(cc.feel_map.items(), key=lambda kv: -kv[1])
+        return cls(choke_sub=float(cc.choke_sub), alpha=float(cc.alpha),
+                   feels=tuple((k, float(v)) for k, v in feels))
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (CHOKE,) + tuple(k for k, _ in self.feels)
+
+def partial_matrix(full: np.ndarray, scheme: PartialScheme) -> np.ndarray:
+    """(n, 1 + n_feels) partial carries for full carries `full`; NaN rows stay NaN."""
+    full = np.asarray(full, dtype=float)
+    factors = np.array([f for _, f in scheme.feels], dtype=float) ** scheme.alpha
+    out = np.empty((len(full), 1 + len(factors)))
+    out[:, 0] = np.maximum(0.0, full - scheme.choke_sub)
+    out[:, 1:] = full[:, None] * factors[None, :]
+    return out
+
+@dataclass(frozen=True)
+class WedgeMatrix:
+    labels: Tuple[str, ...]
+    columns: Tuple[str, ...]
+    full: np.ndarray
+    values: np.ndarray
+    scheme: PartialScheme
+
+    def with_offset(self, offset: float) -> "WedgeMatrix":
+        if not offset:
+            return self
+        full = self.full + float(offset)
+        return replace(self, full=full, values=partial_matrix(full, self.scheme))
+
+    def _row(self, label: str) -> Optional[int]:
+        try:
+            return self.labels.index(label)
+        except ValueError:
+            return None
+
+    def full_carry(self, label: str) -> Optional[float]:
+        i = self._row(label)
+        return None if i is None or np.isnan(self.full[i]) else float(self.full[i])
+
+    def cells(self, label: str) -> List[Tuple[str, Optional[float]]]:
+        """[(column, carry or None), ...] for one wedge, as the card grid takes them."""
+        i = self._row(label)
+        if i is None or np.isnan(self.full[i]):
+            return [(k, None) for k in self.columns]
+        return list(zip(self.columns, self.values[i].tolist()))
+
+def build_wedge_matrix(model: CardModel, labels: Sequence[str], scheme: PartialScheme,
+                       chs_today: float, offset: float = 0.0) -> WedgeMatrix:
+    labels = tuple(dict.fromkeys(labels))
+    # Carry column for every wedge at once; same formula as compute_today, NaN where unmodeled
+    full = profile_block(model, labels, np.array([float(chs_today)]))[0, :, 0] + float(offset)
+    return WedgeMatrix(labels=labels, columns=scheme.columns, full=full,
+                       values=partial_matrix(full, scheme), scheme=scheme)
@@ -0,0 +1,155 @@
+"""
+Lightweight hot-path instrumentation.
+
+Off by default. While disabled, a @timed function pays one global flag check
+per call, and span() returns a shared no-op context manager. Turn it on with
+YARDAGE_PERF=1 or, from code, enable(). The switch is process-wide, so the
+app's Debug tab only shows it and visitors can't change it.
+
+Records, per name:
+- call count, cumulative and max wall time. Timings are inclusive, so
+  estimate_carry includes estimate_carry_from_speed.
+- cache lookups and misses, from counters or from registered caches that
+  keep their own hit/miss totals.
+
+snapshot() returns a JSON-ready dict; prometheus_text() renders the same
+data in the Prometheus text exposition format.
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Tuple
+
+_enabled = os.environ.get("YARDAGE_PERF", "") == "1"
+_lock = threading.Lock()
+# name -> [calls, total_s, max_s]
+_timers: Dict[str, List[float]] = {}
+# cache name -> [lookups, misses]
+_caches: Dict[str, List[int]] = {}
+# cache name -> () -> (hits, misses), read at snapshot time
+_sources: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+_NOOP = nullcontext()
+
+def enabled() -> bool:
+    return _enabled
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = bool(on)
+
+def reset() -> None:
+    with _lock:
+        _timers.clear()
+        _caches.clear()
+
+def record(name: str, seconds: float) -> None:
+    with _lock:
+        t = _timers.get(name)
+        if t is None:
+            _timers[name] = [1, seconds, seconds]
+        else:
+            t[0] += 1
+            t[1] += seconds
+            if seconds > t[2]:
+                t[2] = seconds
+
+def timed(name: str):
+    """Decorator: time every call under `name` while instrumentation is on."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - t0)
+        return inner
+    return wrap
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.t0)
+        return False
+
+def span(name: str):
+    """Context manager timing a block (e.g. one tab of app.py)."""
+    return _Span(name) if _enabled else _NOOP
+
+def cache_lookup(name: str, miss: bool = False) -> None:
+    if not _enabled:
+        return
+    with _lock:
+        c = _caches.setdefault(name, [0, 0])
+        c[0] += 1
+        if miss:
+            c[1] += 1
+
+def cache_miss(name: str) -> None:
+    """Count a miss without a lookup, for caches where the miss is only seen
+    inside the cached body (st.cache_data); pair with cache_lookup()."""
+    if not _enabled:
+        return
+    with _lock:
+        _caches.setdefault(name, [0, 0])[1] += 1
+
+def register_cache(name: str, source: Callable[[], Tuple[int, int]]) -> None:
+    """Expose a cache that keeps its own (hits, misses) totals."""
+    _sources[name] = source
+
+def snapshot() -> dict:
+    with _lock:
+        timers = {k: list(v) for k, v in _timers.items()}
+        caches = {k: list(v) for k, v in _caches.items()}
+    for name, source in _sources.items():
+        hits, misses = source()
+        caches[name] = [hits + misses, misses]
+    return {
+        "enabled": _enabled,
+        "timers": {
+            name: {"calls": int(c), "total_s": total, "mean_ms": total / c * 1e3 if c else 0.0, "max_ms": mx * 1e3}
+            for name, (c, total, mx) in sorted(timers.items())
+        },
+        "caches": {
+            name: {"lookups": n, "hits": n - m, "misses": m, "hit_rate": (n - m) / n if n else None}
+            for name, (n, m) in sorted(caches.items())
+        },
+    }
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def prometheus_text(prefix: str = "yardage") -> str:
+    snap = snapshot()
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, label: str, values: Dict[str, float]) -> None:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for key, v in values.items():
+            lines.append(f'{prefix}_{name}{{{label}="{_label(key)}"}} {v:.9g}')
+
+    t = snap["timers"]
+    c = snap["caches"]
+    metric("calls_total", "counter", "Instrumented calls.", "name", {k: v["calls"] for k, v in t.items()})
+    metric("seconds_total", "counter", "Cumulative wall time (inclusive).", "name", {k: v["total_s"] for k, v in t.items()})
+    metric("seconds_max", "gauge", "Slowest single call.", "name", {k: v["max_ms"] / 1e3 for k, v in t.items()})
+    metric("cache_lookups_total", "counter", "Cache lookups.", "cache", {k: v["lookups"] for k, v in c.items()})
+    metric("cache_misses_total", "counter", "Cache misses.", "cache", {k: v["misses"] for k, v in c.items()})
+    lines.append(f"# HELP {prefix}_perf_enabled Whether instrumentation is recording.")
+    lines.append(f"# TYPE {prefix}_perf_enabled gauge")
+    lines.append(f"{prefix}_perf_enabled {int(snap['enabled'])}")
+    return "\n".join(lines) + "\n"
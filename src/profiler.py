@@ -0,0 +1,204 @@
+"""
+Stdlib sampling profiler for one thread (one Streamlit session's rerun).
+
+A daemon thread reads the target thread's current stack through
+sys._current_frames() every `interval` seconds. Only that thread is sampled,
+so other sessions are not profiled. Their only cost is the sampler briefly
+holding the GIL once per interval.
+
+Stacks are trimmed to start at the app script. Module-level frames of
+app.py are named by the section they are in (the "# ---- / # Title" comment
+headers and the top-level `with tab_*:` blocks), so a profile reads
+"app.py:[Tabs/tab_clubs];yardage.py:compute_today;...".
+
+Output: collapsed stacks (flamegraph.pl / speedscope format), a per-function
+self/total table, and a standalone SVG flame graph.
+"""
+import bisect
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from functools import lru_cache
+from html import escape
+from typing import Dict, List, Optional, Tuple
+
+INTERVAL_S = 0.005
+MAX_SECONDS = 60.0
+
+Stack = Tuple[str, ...]
+
+_HEADER_RULE = re.compile(r"^# -{5,}\s*$")
+_TAB_BLOCK = re.compile(r"^with (tab_\w+)")
+
+@lru_cache(maxsize=8)
+def _sections(path: str, mtime_ns: int) -> Tuple[List[int], List[str]]:
+    """(start lines, names) of the module-level sections of a script."""
+    starts: List[int] = []
+    names: List[str] = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return starts, names
+    current = ""
+    for i, line in enumerate(lines, start=1):
+        if _HEADER_RULE.match(line) and i < len(lines) and lines[i].startswith("# ") \
+                and not _HEADER_RULE.match(lines[i]):
+            current = lines[i][2:].split("(")[0].strip()
+            starts.append(i)
+            names.append(current)
+            continue
+        m = _TAB_BLOCK.match(line)
+        if m:
+            starts.append(i)
+            names.append(f"{current}/{m.group(1)}")
+    return starts, names
+
+def _section_of(path: str, lineno: int) -> str:
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return "<module>"
+    starts, names = _sections(path, mtime)
+    i = bisect.bisect_right(starts, lineno) - 1
+    return f"[{names[i]}]" if i >= 0 else "<module>"
+
+def _frame_name(frame, root_file: Optional[str]) -> str:
+    code = frame.f_code
+    fname = code.co_filename
+    base = os.path.basename(fname)
+    if code.co_name == "<module>" and root_file is not None and fname == root_file:
+        return f"{base}:{_section_of(fname, frame.f_lineno)}"
+    return f"{base}:{getattr(code, 'co_qualname', code.co_name)}"
+
+class StackSampler:
+    """Samples one thread's stack until stop(); start()/stop() may run on different threads."""
+
+    def __init__(self, thread_id: int, root_file: Optional[str] = None,
+                 interval: float = INTERVAL_S, max_seconds: float = MAX_SECONDS):
+        self.thread_id = thread_id
+        self.root_file = os.path.abspath(root_file) if root_file else None
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        return self.samples
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval):
+            if time.monotonic() > deadline:
+                return
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            stack.reverse()
+            # Trim the Streamlit runner frames above the script
+            if self.root_file is not None:
+                for i, f in enumerate(stack):
+                    if f.f_code.co_filename == self.root_file:
+                        stack = stack[i:]
+                        break
+                else:
+                    continue  # between reruns / outside the script
+            self.samples[tuple(_frame_name(f, self.root_file) for f in stack)] += 1
+
+# ---------------------------
+# Output formats
+# ---------------------------
+def collapsed(samples: Counter) -> str:
+    """One 'frame;frame;frame count' line per distinct stack."""
+    return "".join(f"{';'.join(stack)} {n}\n" for stack, n in sorted(samples.items()))
+
+def function_table(samples: Counter, interval: float = INTERVAL_S) -> List[dict]:
+    """Per-function self/total samples (total counts a function once per stack)."""
+    self_n: Dict[str, int] = Counter()
+    total_n: Dict[str, int] = Counter()
+    for stack, n in samples.items():
+        self_n[stack[-1]] += n
+        for name in set(stack):
+            total_n[name] += n
+    all_n = sum(samples.values()) or 1
+    rows = [{
+        "function": name,
+        "self": self_n.get(name, 0),
+        "total": t,
+        "self %": round(100.0 * self_n.get(name, 0) / all_n, 1),
+        "total %": round(100.0 * t / all_n, 1),
+        "~total ms": round(t * interval * 1e3, 1),
+    } for name, t in total_n.items()]
+    rows.sort(key=lambda r: (-r["total"], -r["self"]))
+    return rows
+
+def flamegraph_svg(samples: Counter, title: str = "Flame graph", width: int = 1200) -> str:
+    """Standalone SVG flame graph (root at the bottom), hover titles per frame."""
+    # Merge stacks into a tree: name -> [count, children]
+    root: list = [0, {}]
+    for stack, n in samples.items():
+        node = root
+        node[0] += n
+        for name in stack:
+            node = node[1].setdefault(name, [0, {}])
+            node[0] += n
+
+    def depth(node) -> int:
+        return 1 + max((depth(c) for c in node[1].values()), default=0)
+
+    row_h = 17
+    top = 30
+    levels = depth(root) - 1
+    height = top + levels * row_h + 10
+    total = root[0] or 1
+    rects: List[str] = []
+
+    def emit(node, name: str, x: float, level: int) -> None:
+        w = node[0] / total * width
+        if w < 0.3:
+            return
+        y = height - 10 - (level + 1) * row_h
+        hue = 20 + zlib.crc32(name.split(":")[0].encode("utf-8")) % 40
+        pct = 100.0 * node[0] / total
+        label = escape(name)
+        text = escape(name if w > 7 * len(name) else name[: max(0, int(w / 7) - 2)] + "..") if w > 30 else ""
+        rects.append(
+            f'<g><title>{label} ({node[0]} samples, {pct:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{max(w - 0.5, 0.1):.1f}" height="{row_h - 1}" '
+            f'fill="hsl({hue},85%,{55 + level % 3 * 5}%)" rx="2"/>'
+            f'<text x="{x + 3:.1f}" y="{y + row_h - 5}" font-size="11" font-family="monospace">{text}</text></g>'
+        )
+        cx = x
+        for child_name, child in sorted(node[1].items()):
+            emit(child, child_name, cx, level + 1)
+            cx += child[0] / total * width
+
+    x = 0.0
+    for name, child in sorted(root[1].items()):
+        emit(child, name, x, 0)
+        x += child[0] / total * width
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<rect width="100%" height="100%" fill="#fff"/>'
+        f'<text x="{width / 2}" y="18" text-anchor="middle" font-size="14" font-family="sans-serif">'
+        f'{escape(title)} ({root[0]} samples)</text>'
+        + "".join(rects) + "</svg>"
+    )
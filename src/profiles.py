@@ -0,0 +1,179 @@
+"""
+Anchor-set profiles.
+
+The baseline anchors in data/config.yaml are the "tour" profile. Additional
+anchor sets (amateur averages, per-golfer fits, per-season sets) come from
+the config's `profiles:` section or from data/profiles/<id>.yaml.
+
+Each profile is compiled into a fitted CardModel on first use. Models live in
+a process-wide, size-bounded LRU keyed by a content hash of everything the
+model depends on, so switching profiles is a dict lookup and identical anchor
+sets share one model.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import yaml
+
+from src import perf
+from src.yardage import CardModel, build_model, compute_baseline
+from src.estimates import category_of
+
+BASE_PROFILE = "tour"
+MODEL_CACHE_MAX = 32
+
+class ModelCache:
+    """Thread-safe LRU of compiled models keyed by content hash."""
+
+    def __init__(self, max_entries: int = MODEL_CACHE_MAX):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._models: "OrderedDict[str, CardModel]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CardModel]:
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                self.misses += 1
+                return None
+            self._models.move_to_end(key)
+            self.hits += 1
+            return model
+
+    def put(self, key: str, model: CardModel) -> None:
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+model_cache = ModelCache()
+perf.register_cache("model_cache", lambda: (model_cache.hits, model_cache.misses))
+
+def profile_cfg(base_cfg: Mapping, spec: Mapping) -> dict:
+    """
+    Overlay a profile spec ({name, driver_chs_mph, anchors}) on the base
+    config. Everything not set by the profile (model, rollout) is inherited.
+    """
+    cfg = dict(base_cfg)
+    baseline = dict(base_cfg["baseline"])
+    if spec.get("driver_chs_mph") is not None:
+        baseline["driver_chs_mph"] = spec["driver_chs_mph"]
+    baseline["anchors"] = spec["anchors"]
+    cfg["baseline"] = baseline
+    return cfg
+
+def model_key(cfg: Mapping) -> str:
+    """Content hash of the inputs build_model reads."""
+    payload = {
+        "baseline": cfg["baseline"],
+        "model": cfg.get("model"),
+        "rollout": cfg.get("rollout_defaults_yd"),
+    }
+    data = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+class ProfileStore:
+    """
+    Resolves profile ids to fitted models for one compiled config.
+    Profile files are re-read only when their mtime changes.
+    """
+
+    def __init__(self, base_cfg: Mapping, labels: Iterable[str] = (),
+                 profiles_dir: Optional[Path] = None, cache: ModelCache = model_cache):
+        self.base_cfg = base_cfg
+        self.labels = tuple(labels)
+        self.profiles_dir = profiles_dir
+        self.cache = cache
+        self._inline: Dict[str, Mapping] = dict(base_cfg.get("profiles") or {})
+        # profile id -> (file mtime_ns or None, name, model key, cfg)
+        self._resolved: Dict[str, Tuple[Optional[int], str, str, dict]] = {}
+
+    def ids(self) -> List[str]:
+        ids = [BASE_PROFILE] + [p for p in self._inline if p != BASE_PROFILE]
+        if self.profiles_dir is not None and self.profiles_dir.is_dir():
+            ids += sorted(p.stem for p in self.profiles_dir.glob("*.yaml") if p.stem not in ids)
+        return ids
+
+    def name(self, profile_id: str) -> str:
+        return self._resolve(profile_id)[1]
+
+    def key(self, profile_id: str) -> str:
+        return self._resolve(profile_id)[2]
+
+    def model(self, profile_id: str = BASE_PROFILE) -> CardModel:
+        _, _, key, cfg = self._resolve(profile_id)
+        model = self.cache.get(key)
+        if model is None:
+            model = build_model(cfg, self.labels)
+            self.cache.put(key, model)
+        return model
+
+    def with_anchors(self, profile_id: str,
+                     overrides: Mapping[str, Tuple[Optional[float], float]]) -> Tuple[str, CardModel]:
+        """
+        (model key, model) for a profile with some anchors replaced or added,
+        e.g. a golfer's own carries. overrides: club -> (club speed or None,
+        carry at the profile's driver_chs_mph); a missing speed keeps the
+        profile's (anchored or estimated).
+        """
+        base = self.model(profile_id)
+        _, _, _, cfg = self._resolve(profile_id)
+        anchors = {a["label"]: dict(a) for a in cfg["baseline"]["anchors"]}
+        for label, (speed, carry) in overrides.items():
+            if speed is None:
+                speed = compute_baseline(base, label)[0]
+                if speed is None:
+                    continue
+            a = anchors.setdefault(label, {"label": label, "category": category_of(label)})
+            a["club_speed_mph"], a["carry_yd"] = float(speed), float(carry)
+        cfg = profile_cfg(cfg, {"anchors": list(anchors.values())})
+        key = model_key(cfg)
+        model = self.cache.get(key)
+        if model is None:
+            model = build_model(cfg, self.labels)
+            self.cache.put(key, model)
+        return key, model
+
+    def _file(self, profile_id: str) -> Optional[Path]:
+        if self.profiles_dir is None:
+            return None
+        path = self.profiles_dir / f"{profile_id}.yaml"
+        return path if path.is_file() else None
+
+    def _resolve(self, profile_id: str) -> Tuple[Optional[int], str, str, dict]:
+        path = None if profile_id == BASE_PROFILE or profile_id in self._inline else self._file(profile_id)
+        mtime = path.stat().st_mtime_ns if path is not None else None
+
+        hit = self._resolved.get(profile_id)
+        if hit is not None and hit[0] == mtime:
+            return hit
+
+        if profile_id == BASE_PROFILE:
+            name = "Tour Averages"
+            cfg = dict(self.base_cfg)
+        else:
+            if profile_id in self._inline:
+                spec = self._inline[profile_id]
+            elif path is not None:
+                with path.open("r", encoding="utf-8") as f:
+                    spec = yaml.safe_load(f) or {}
+            else:
+                raise KeyError(f"unknown profile: {profile_id}")
+            if not spec.get("anchors"):
+                raise ValueError(f"profile {profile_id!r} has no anchors")
+            name = str(spec.get("name", profile_id))
+            cfg = profile_cfg(self.base_cfg, spec)
+
+        resolved = (mtime, name, model_key(cfg), cfg)
+        self._resolved[profile_id] = resolved
+        return resolved
@@ -0,0 +1,118 @@
+"""
+Continuous CHS response: per-club Chebyshev fits of carry vs driver CHS.
+
+The exact model is one power law per club,
+
+    carry(chs) = carry0 * (chs / chs0) ** g
+
+Over the valid CHS range it is fitted once per model with a Chebyshev
+series, using all clubs at the same nodes. The fit's coefficients and their
+analytic derivative form (n_clubs, degree + 1) arrays. Evaluating any
+fractional CHS (e.g. 104.3 from a launch monitor) takes one basis vector
+T_0..T_n(x), built by recurrence, and two small mat-vec products. That
+gives carry and yd/mph for every club with no pow() calls.
+
+fit_response() raises the degree until the fit is within `tol` yards of
+the exact model on a dense check grid. If it cannot get there it returns
+None, and response_at() evaluates the power law directly. max_err and
+max_slope_err record what a fit achieved.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+CHS_RANGE = (90.0, 135.0)
+MIN_DEGREE = 4
+MAX_DEGREE = 16
+# Cards show whole yards; 1e-3 yd keeps rounding identical to the exact model
+# except within a thousandth of a .5 boundary
+TOL_YD = 1e-3
+CHECK_STEP = 0.05
+
+@dataclass(frozen=True)
+class ResponseFit:
+    lo: float
+    hi: float
+    # (n, degree + 1) Chebyshev coefficients on [-1, 1]; NaN rows are unmodeled clubs
+    coef: np.ndarray
+    # (n, degree) coefficients of d carry / d chs (yd per mph)
+    dcoef: np.ndarray
+    max_err: float
+    max_slope_err: float
+
+    @property
+    def degree(self) -> int:
+        return self.coef.shape[1] - 1
+
+    def covers(self, chs: float) -> bool:
+        return self.lo <= chs <= self.hi
+
+    def _basis(self, chs: float, n: int) -> np.ndarray:
+        x = (2.0 * chs - (self.lo + self.hi)) / (self.hi - self.lo)
+        t = [1.0, x]
+        for _ in range(n - 2):
+            t.append(2.0 * x * t[-1] - t[-2])
+        return np.array(t[:n])
+
+    def carries(self, chs: float) -> np.ndarray:
+        """Zero-offset carry per club at `chs` (within [lo, hi])."""
+        return self.coef @ self._basis(chs, self.coef.shape[1])
+
+    def slopes(self, chs: float) -> np.ndarray:
+        """d carry / d chs per club at `chs`, yd per mph."""
+        return self.dcoef @ self._basis(chs, self.dcoef.shape[1])
+
+def exact_carries(carry0: np.ndarray, g: np.ndarray, chs0: float, chs) -> np.ndarray:
+    """(len(chs), n) carries from the power law; the reference for the fit."""
+    s = np.asarray(chs, dtype=float)[:, None] / chs0
+    return carry0[None, :] * s ** g[None, :]
+
+def exact_slopes(carry0: np.ndarray, g: np.ndarray, chs0: float, chs) -> np.ndarray:
+    chs = np.asarray(chs, dtype=float)[:, None]
+    return g[None, :] * carry0[None, :] * (chs / chs0) ** g[None, :] / chs
+
+def fit_response(carry0: np.ndarray, g: np.ndarray, chs0: float,
+                 chs_range: Tuple[float, float] = CHS_RANGE, tol: float = TOL_YD) -> Optional[ResponseFit]:
+    """
+    Fit carry0 * (chs/chs0)**g for every club (NaN carry0 = unmodeled).
+    Returns None if no degree up to MAX_DEGREE is within `tol` yards; callers
+    pass that to response_at(), which falls back to the exact power law.
+    """
+    lo, hi = float(chs_range[0]), float(chs_range[1])
+    carry0 = np.asarray(carry0, dtype=float)
+    g = np.asarray(g, dtype=float)
+    modeled = ~np.isnan(carry0)
+    half = (hi - lo) / 2.0
+    check = np.linspace(lo, hi, int(round((hi - lo) / CHECK_STEP)) + 1)
+    ref = exact_carries(carry0[modeled], g[modeled], chs0, check)
+    ref_slope = exact_slopes(carry0[modeled], g[modeled], chs0, check)
+    xc = (check - (lo + hi) / 2.0) / half
+
+    err = slope_err = float("inf")
+    for degree in range(MIN_DEGREE, MAX_DEGREE + 1):
+        # Interpolate at the Chebyshev points of the first kind
+        nodes = np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+        y = exact_carries(carry0[modeled], g[modeled], chs0, (lo + hi) / 2.0 + half * nodes)
+        c = chebyshev.chebfit(nodes, y, degree)  # (degree + 1, n_modeled)
+        dc = chebyshev.chebder(c, axis=0) / half
+        err = float(np.max(np.abs(chebyshev.chebval(xc, c).T - ref), initial=0.0))
+        slope_err = float(np.max(np.abs(chebyshev.chebval(xc, dc).T - ref_slope), initial=0.0))
+        if err <= tol:
+            break
+    else:
+        return None
+
+    coef = np.full((len(carry0), degree + 1), np.nan)
+    dcoef = np.full((len(carry0), degree), np.nan)
+    coef[modeled] = c.T
+    dcoef[modeled] = dc.T
+    return ResponseFit(lo=lo, hi=hi, coef=coef, dcoef=dcoef, max_err=err, max_slope_err=slope_err)
+
+def response_at(fit: Optional[ResponseFit], carry0: np.ndarray, g: np.ndarray, chs0: float,
+                chs: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(carry, slope) per club from the fit, or from the power law outside its range."""
+    if fit is not None and fit.covers(chs):
+        return fit.carries(chs), fit.slopes(chs)
+    return exact_carries(carry0, g, chs0, [chs])[0], exact_slopes(carry0, g, chs0, [chs])[0]
@@ -2,34 +2,64 @@ from __future__ import annotations
 
 import math
 import random
+from dataclasses import dataclass
 from html import escape
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from src.estimates import category_of
+from src.memory import shared
+from src.perf import timed
 
 Point = Tuple[float, float]  # (x_left_right_yd, y_carry_yd)
 
+# Start line and curve are drawn independently and summed, so a fitted lateral
+# std is reproduced only when start_k**2 + curve_k**2 == 1. This is the category
+# defaults' 0.58 : 0.62 split on that circle, used when shots carry no launch direction.
+FALLBACK_START_K = 0.58 / math.hypot(0.58, 0.62)
+FALLBACK_CURVE_K = 0.62 / math.hypot(0.58, 0.62)
+
+
+@dataclass(frozen=True, slots=True)
+class DispersionParams:
+    """
+    Per-club dispersion fitted from real shots (see src/dispersion.py).
+    Spreads are fractions of carry so they scale with today's yardage.
+    """
+    lat_frac: float      # lateral std / carry
+    dist_frac: float     # carry std / carry
+    start_k: float       # start-line share of lateral std (start_k**2 + curve_k**2 = 1)
+    curve_k: float       # curve share of lateral std
+    shape_scale: float   # signed mean curve / carry (+ = right, fade); biases the matching shape
+    shots: int = 0
+
 
 def _title_case_shape(shape: str) -> str:
     return (shape or "Straight").strip().title()
 
 
-def _shape_bias(shape: str, carry: float, category: str) -> float:
+def _shape_bias(shape: str, carry: float, category: str, scale: Optional[float] = None) -> float:
+    """
+    `scale` is a fitted signed curve / carry (+ = fade). It sets the bias of
+    the shape it matches; the other shape, which the data says nothing about,
+    keeps the category default.
+    """
     shape = (shape or "Straight").lower()
 
     # Draw = left bias (negative x), Fade = right bias (positive x)
-    scale = {
+    default = {
         "wood": 0.020,
         "hybrid": 0.018,
         "utility": 0.017,
         "iron": 0.015,
         "wedge": 0.010,
     }.get(category, 0.015)
+    fade = scale if scale is not None and scale > 0 else default
+    draw = -scale if scale is not None and scale < 0 else default
 
     if shape == "fade":
-        return carry * scale
+        return carry * fade
     if shape == "draw":
-        return -carry * scale
+        return -carry * draw
     return 0.0
 
 
@@ -56,9 +86,22 @@ def _shape_angle_deg(shape: str, category: str) -> float:
     return 0.0
 
 
-def pattern_defaults(label: str, carry: float) -> Dict[str, float | str]:
+def pattern_defaults(label: str, carry: float, params: Optional[DispersionParams] = None) -> Dict[str, float | str]:
     category = category_of(label)
 
+    if params is not None:
+        lateral_std = max(0.5, carry * params.lat_frac)
+        # Onto start_k**2 + curve_k**2 == 1, so tables written before that rule still give lateral_std
+        norm = math.hypot(params.start_k, params.curve_k) or 1.0
+        return {
+            "category": category,
+            "lateral_std": lateral_std,
+            "distance_std": max(0.5, carry * params.dist_frac),
+            "start_std": lateral_std * params.start_k / norm,
+            "curve_std": lateral_std * params.curve_k / norm,
+            "shape_scale": params.shape_scale,
+        }
+
     cfg = {
         "wood":    {"lat_frac": 0.050, "dist_frac": 0.035, "min_lat": 8.0, "min_dist": 6.0},
         "hybrid":  {"lat_frac": 0.042, "dist_frac": 0.032, "min_lat": 6.0, "min_dist": 5.0},
@@ -79,6 +122,7 @@ def pattern_defaults(label: str, carry: float) -> Dict[str, float | str]:
     }
 
 
+@timed("simulate_shot_pattern")
 def simulate_shot_pattern(
     label: str,
     carry: float,
@@ -86,12 +130,15 @@ def simulate_shot_pattern(
     shape: str = "Straight",
     n: int = 220,
     seed: int = 7,
+    params: Optional[DispersionParams] = None,
 ) -> Dict[str, object]:
-    defaults = pattern_defaults(label, carry)
+    """`params` (fitted per-club dispersion) replaces the category defaults."""
+    defaults = pattern_defaults(label, carry, params)
     category = str(defaults["category"])
     rng = random.Random(seed)
 
-    shape_bias = _shape_bias(shape, carry, category)
+    shape_scale = defaults.get("shape_scale")
+    shape_bias = _shape_bias(shape, carry, category, None if shape_scale is None else float(shape_scale))
     rollout = max(0.0, total - carry)
 
     points: List[Point] = []
@@ -238,6 +285,7 @@ def _cone_polygon(
     return [tip_l, tip_r, base_r, base_l]
 
 
+@timed("render_shot_pattern_svg")
 def render_shot_pattern_svg(label: str, shape: str, carry: float, total: float, pattern: Dict[str, object]) -> str:
     carry_points: List[Point] = pattern["carry_points"]  # type: ignore[index]
     total_points: List[Point] = pattern["total_points"]  # type: ignore[index]
@@ -403,3 +451,18 @@ def render_shot_pattern_svg(label: str, shape: str, carry: float, total: float,
   </div>
 </div>
 """
+
+
+def cached_pattern_svg(label: str, shape: str, carry: float, total: float,
+                       params: Optional[DispersionParams] = None) -> str:
+    """
+    SVG of the Shot Pattern tab's seeded 220-shot pattern. Identical inputs
+    give identical SVGs, so one copy per process is kept in src.memory.shared.
+    """
+    return shared.get_or_create(
+        ("shot_pattern", label, carry, total, shape, params),
+        lambda: render_shot_pattern_svg(
+            label, shape, carry, total,
+            simulate_shot_pattern(label, carry, total, shape=shape, n=220, seed=11, params=params),
+        ),
+    )
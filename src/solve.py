@@ -0,0 +1,163 @@
+"""
+Inverse solver: today's driver CHS (and offset) from a few observed carries.
+
+Given (club, carry) pairs, e.g. from the range, find the CHS, and with two or
+more observations the additive offset, that best fit them under the card
+model, in the least-squares sense.
+
+For a fixed CHS the best offset has a closed form: the mean residual. The
+sum of squares is therefore a function of CHS alone. It is evaluated for
+every point of a 0.1 mph grid in one (grid, clubs) array. The best grid
+point is then refined inside its bracket [prev, next] by bisecting on the
+sign of d SSE / d CHS. The derivative is analytic, because the model is
+carry0 * (chs / chs0) ** g per club. The reported predictions and per-club
+residuals come from src.yardage.compute_today at the solution.
+
+    python -m src.solve 7i:165 PW:121 "SW (56°)":92
+    python -m src.solve 7i:165 --profile tour --offset 0   # hold the offset fixed
+"""
+import argparse
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.yardage import CardModel, compute_baseline, compute_today, shape_p
+from src.catalog import normalize_club_label
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "data" / "config.yaml"
+
+CHS_RANGE = (90.0, 135.0)
+GRID_STEP = 0.1
+BISECT_TOL = 1e-6
+
+@dataclass(frozen=True)
+class Solution:
+    chs: float
+    offset: float
+    # Offset was fitted (two or more observations and no fixed offset)
+    offset_fitted: bool
+    # CHS landed on the edge of the search range; the data may want more/less
+    at_bound: bool
+    rmse: float
+    # [{club, observed, predicted, residual}] with residual = observed - predicted
+    residuals: List[dict]
+
+def parse_observations(items: Sequence[str]) -> List[Tuple[str, float]]:
+    """'club:carry' strings -> [(normalized label, carry)]."""
+    out = []
+    for item in items:
+        club, sep, carry = item.rpartition(":")
+        if not sep or not club.strip():
+            raise ValueError(f"expected club:carry, got {item!r}")
+        label = normalize_club_label(club.strip())
+        if not label:
+            raise ValueError(f"unknown club: {club.strip()!r}")
+        try:
+            out.append((label, float(carry)))
+        except ValueError:
+            raise ValueError(f"carry must be a number: {item!r}")
+    return out
+
+def _profile(model: CardModel, labels: Sequence[str]):
+    """Baseline carry and exponent per observation; ValueError on unmodeled clubs."""
+    carry0, g, missing = [], [], []
+    for label in labels:
+        spd0, c0 = compute_baseline(model, label)
+        if spd0 is None or c0 is None:
+            missing.append(label)
+            continue
+        carry0.append(c0)
+        g.append((spd0 / model.chs0) ** shape_p(model, label))
+    if missing:
+        raise ValueError(f"no model for: {', '.join(dict.fromkeys(missing))}")
+    return np.asarray(carry0), np.asarray(g)
+
+def _sse(pred: np.ndarray, obs: np.ndarray, fit_offset: bool, offset: float) -> np.ndarray:
+    """Per-row SSE of (rows, clubs) predictions, with the best (or fixed) offset."""
+    r = obs[None, :] - pred
+    r = r - (r.mean(axis=1, keepdims=True) if fit_offset else offset)
+    return (r * r).sum(axis=1)
+
+def solve_chs(model: CardModel, observations: Sequence[Tuple[str, float]],
+              offset: Optional[float] = None,
+              chs_range: Tuple[float, float] = CHS_RANGE) -> Solution:
+    """
+    Best-fit driver CHS for observed (club, carry) pairs. The offset is
+    fitted when `offset` is None and there are two or more observations,
+    otherwise held at `offset` (0 by default).
+    """
+    if not observations:
+        raise ValueError("need at least one (club, carry) observation")
+    labels = [label for label, _ in observations]
+    obs = np.asarray([float(c) for _, c in observations])
+    carry0, g = _profile(model, labels)
+    fit_offset = offset is None and len(obs) >= 2
+    fixed = 0.0 if offset is None else float(offset)
+    chs0 = model.chs0
+
+    lo, hi = chs_range
+    grid = np.arange(round(lo / GRID_STEP), round(hi / GRID_STEP) + 1) * GRID_STEP
+    pred = carry0[None, :] * (grid[:, None] / chs0) ** g[None, :]
+    k = int(np.argmin(_sse(pred, obs, fit_offset, fixed)))
+
+    def dsse(chs: float) -> float:
+        p = carry0 * (chs / chs0) ** g
+        dp = g * p / chs
+        r = obs - p - (np.mean(obs - p) if fit_offset else fixed)
+        # d/dchs of sum r^2; the offset term drops out because sum(r) = 0 at the optimum
+        return float(-2.0 * np.dot(r, dp))
+
+    a, b = float(grid[max(k - 1, 0)]), float(grid[min(k + 1, len(grid) - 1)])
+    da, db = dsse(a), dsse(b)
+    if da < 0.0 < db:
+        while b - a > BISECT_TOL:
+            m = 0.5 * (a + b)
+            if dsse(m) < 0.0:
+                a = m
+            else:
+                b = m
+        chs = 0.5 * (a + b)
+    else:
+        # Minimum at a range edge (or flat): keep the grid point
+        chs = float(grid[k])
+
+    p = carry0 * (chs / chs0) ** g
+    off = float(np.mean(obs - p)) if fit_offset else fixed
+    residuals = []
+    for label, observed in zip(labels, obs.tolist()):
+        carry, _ = compute_today(model, label, chs, off)
+        residuals.append({"club": label, "observed": observed, "predicted": carry, "residual": observed - carry})
+    rmse = float(np.sqrt(np.mean([r["residual"] ** 2 for r in residuals])))
+    at_bound = chs - lo < GRID_STEP or hi - chs < GRID_STEP
+    return Solution(chs=chs, offset=off, offset_fitted=fit_offset, at_bound=at_bound,
+                    rmse=rmse, residuals=residuals)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.config import load_compiled
+    from src.profiles import BASE_PROFILE
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("observations", nargs="+", help="club:carry pairs")
+    ap.add_argument("--config", type=Path, default=CONFIG_PATH)
+    ap.add_argument("--profile", default=BASE_PROFILE)
+    ap.add_argument("--offset", type=float, default=None, help="hold the offset fixed instead of fitting it")
+    args = ap.parse_args(argv)
+
+    cc = load_compiled(args.config)
+    if args.profile not in cc.profiles.ids():
+        ap.error(f"unknown profile: {args.profile}")
+    try:
+        sol = solve_chs(cc.profiles.model(args.profile), parse_observations(args.observations), args.offset)
+    except ValueError as e:
+        ap.error(str(e))
+    print(json.dumps({
+        "chs": round(sol.chs, 2), "offset": round(sol.offset, 2), "offset_fitted": sol.offset_fitted,
+        "at_bound": sol.at_bound, "rmse": round(sol.rmse, 2),
+        "residuals": [{k: (round(v, 2) if isinstance(v, float) else v) for k, v in r.items()} for r in sol.residuals],
+    }, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
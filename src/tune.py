@@ -0,0 +1,226 @@
+"""
+Fit model.exponent_shape_p (and optional per-category exponents) to
+multi-CHS reference carries.
+
+Reference data is a CSV of (club, chs, carry[, weight]) rows, where chs is
+the golfer's driver CHS for that carry, or profile YAML files
+(driver_chs_mph + anchors, e.g. written by src.ingest); each profile
+contributes one row per anchor at its driver CHS.
+
+Every candidate p is scored on all reference rows at once: baselines come
+from the current model, and the prediction is
+carry0 * (chs / chs0) ** ((speed0 / chs0) ** p), the same expression as
+responsiveness_exponent/scaled_carry, evaluated as a (p, rows) array.
+Categories only share p through the global fit, so per-category exponents
+are independent 1-D sweeps over the same score matrix. The p grid is split
+across a process pool.
+
+    python -m src.tune ref.csv > model.yaml
+    python -m src.tune data/profiles/*.yaml --per-category --config data/config.yaml
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+from src.yardage import CardModel, build_model, compute_baseline, shape_p
+from src.catalog import _sort_key, normalize_club_label
+from src.estimates import category_of
+from src.ingest import CARRY_COLS, CLUB_COLS, _pick_column
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "data" / "config.yaml"
+
+CATEGORIES = ("wood", "hybrid", "utility", "iron", "wedge")
+CHS_COLS = ("chs", "driver chs", "driver_chs", "driver_chs_mph", "chs_mph")
+WEIGHT_COLS = ("weight", "shots", "n")
+
+P_GRID = (0.0, 4.0, 0.01)
+CHUNKS = 8
+
+@dataclass(frozen=True)
+class RefRows:
+    labels: Tuple[str, ...]
+    chs: np.ndarray
+    carry: np.ndarray
+    weight: np.ndarray
+
+@dataclass(frozen=True)
+class TuneResult:
+    grid: np.ndarray
+    sse: np.ndarray            # (len(grid), len(CATEGORIES)) weighted SSE
+    weight: np.ndarray         # per-category total weight
+    p_global: float
+    p_by_category: Dict[str, float]
+
+    def rmse(self, p_idx: np.ndarray) -> float:
+        """Overall weighted RMSE with category c at grid index p_idx[c]."""
+        w = self.weight.sum()
+        return float(np.sqrt(self.sse[p_idx, np.arange(len(CATEGORIES))].sum() / w)) if w else float("nan")
+
+def load_reference(paths: Sequence[Path]) -> RefRows:
+    labels: List[str] = []
+    chs: List[float] = []
+    carry: List[float] = []
+    weight: List[float] = []
+    for path in paths:
+        if path.suffix.lower() in (".yaml", ".yml"):
+            with path.open("r", encoding="utf-8") as f:
+                spec = yaml.safe_load(f) or {}
+            if spec.get("driver_chs_mph") is None:
+                raise ValueError(f"{path}: profile needs driver_chs_mph to serve as reference data")
+            for a in spec.get("anchors") or []:
+                labels.append(a["label"])
+                chs.append(float(spec["driver_chs_mph"]))
+                carry.append(float(a["carry_yd"]))
+                weight.append(float(a.get("shots", 1)))
+        else:
+            import pandas as pd
+            df = pd.read_csv(path)
+            club_col = _pick_column(df.columns, None, CLUB_COLS, "club")
+            chs_col = _pick_column(df.columns, None, CHS_COLS, "chs")
+            carry_col = _pick_column(df.columns, None, CARRY_COLS, "carry")
+            lowered = {c.strip().lower(): c for c in df.columns}
+            weight_col = next((lowered[c] for c in WEIGHT_COLS if c in lowered), None)
+            labels += [str(x) for x in df[club_col]]
+            chs += df[chs_col].astype(float).tolist()
+            carry += df[carry_col].astype(float).tolist()
+            weight += df[weight_col].astype(float).tolist() if weight_col else [1.0] * len(df)
+
+    norm = [normalize_club_label(x) for x in labels]
+    keep = [i for i, x in enumerate(norm) if x and category_of(x) in CATEGORIES]
+    return RefRows(
+        labels=tuple(norm[i] for i in keep),
+        chs=np.asarray([chs[i] for i in keep], dtype=np.float64),
+        carry=np.asarray([carry[i] for i in keep], dtype=np.float64),
+        weight=np.asarray([weight[i] for i in keep], dtype=np.float64),
+    )
+
+def _design(model: CardModel, ref: RefRows):
+    """Per-row (speed ratio, log CHS ratio, baseline carry, observed, weight, category one-hot)."""
+    base = [compute_baseline(model, label) for label in ref.labels]
+    ok = np.asarray([s is not None and c is not None for s, c in base])
+    r = np.asarray([s / model.chs0 if ok[i] else 1.0 for i, (s, _) in enumerate(base)])[ok]
+    c0 = np.asarray([c if ok[i] else 0.0 for i, (_, c) in enumerate(base)])[ok]
+    log_s = np.log(ref.chs[ok] / model.chs0)
+    cats = [category_of(label) for label, k in zip(ref.labels, ok) if k]
+    onehot = np.zeros((len(cats), len(CATEGORIES)))
+    onehot[np.arange(len(cats)), [CATEGORIES.index(c) for c in cats]] = 1.0
+    return r, log_s, c0, ref.carry[ok], ref.weight[ok], onehot
+
+def _score_chunk(args) -> np.ndarray:
+    """Worker: weighted SSE per (p, category) for one slice of the grid."""
+    ps, r, log_s, c0, obs, w, onehot = args
+    g = r[None, :] ** ps[:, None]                   # responsiveness_exponent
+    pred = c0[None, :] * np.exp(g * log_s[None, :])  # scaled_carry
+    return ((pred - obs[None, :]) ** 2 * w[None, :]) @ onehot
+
+def sweep(model: CardModel, ref: RefRows, grid: np.ndarray, workers: Optional[int] = None) -> TuneResult:
+    """workers=None uses the default process pool size; workers=0 runs in-process."""
+    r, log_s, c0, obs, w, onehot = _design(model, ref)
+    chunks = max(1, min(CHUNKS, len(grid) // 50))
+    tasks = [(ps, r, log_s, c0, obs, w, onehot) for ps in np.array_split(grid, chunks)]
+    if workers == 0 or chunks == 1:
+        parts = [_score_chunk(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            parts = list(ex.map(_score_chunk, tasks))
+    sse = np.vstack(parts)
+    weight = w @ onehot
+
+    p_global = float(grid[int(np.argmin(sse.sum(axis=1)))])
+    p_by_category = {cat: float(grid[int(np.argmin(sse[:, j]))])
+                     for j, cat in enumerate(CATEGORIES) if weight[j] > 0}
+    return TuneResult(grid, sse, weight, p_global, p_by_category)
+
+def residual_report(model: CardModel, ref: RefRows) -> List[dict]:
+    """Per-club residuals (pred - ref) under the model's own exponents."""
+    acc: Dict[str, List[float]] = {}
+    for label, chs, carry, w in zip(ref.labels, ref.chs, ref.carry, ref.weight):
+        spd0, carry0 = compute_baseline(model, label)
+        if spd0 is None or carry0 is None:
+            continue
+        g = (spd0 / model.chs0) ** shape_p(model, label)
+        pred = carry0 * (chs / model.chs0) ** g
+        a = acc.setdefault(label, [0.0, 0.0, 0.0, 0])
+        a[0] += w
+        a[1] += w * (pred - carry)
+        a[2] += w * (pred - carry) ** 2
+        a[3] += 1
+    return [{"club": label, "rows": a[3], "bias": a[1] / a[0], "rmse": float(np.sqrt(a[2] / a[0]))}
+            for label, a in sorted(acc.items(), key=lambda kv: _sort_key(kv[0])) if a[0] > 0]
+
+def model_yaml(p_global: float, p_by_category: Optional[Dict[str, float]] = None) -> str:
+    lines = ["model:", f"  exponent_shape_p: {p_global:g}"]
+    if p_by_category:
+        parts = ", ".join(f"{k}: {v:g}" for k, v in p_by_category.items())
+        lines.append(f"  exponent_shape_p_by_category: {{ {parts} }}")
+    return "\n".join(lines) + "\n"
+
+def tuned_cfg(cfg: dict, p_global: float, p_by_category: Optional[Dict[str, float]]) -> dict:
+    model = dict(cfg.get("model") or {})
+    model["exponent_shape_p"] = p_global
+    model.pop("exponent_shape_p_by_category", None)
+    if p_by_category:
+        model["exponent_shape_p_by_category"] = dict(p_by_category)
+    return {**cfg, "model": model}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("ref", type=Path, nargs="+", help="reference CSV(s) or profile YAML(s)")
+    ap.add_argument("--config", type=Path, default=CONFIG_PATH)
+    ap.add_argument("--per-category", action="store_true", help="also fit exponent_shape_p_by_category")
+    ap.add_argument("--p-min", type=float, default=P_GRID[0])
+    ap.add_argument("--p-max", type=float, default=P_GRID[1])
+    ap.add_argument("--p-step", type=float, default=P_GRID[2])
+    ap.add_argument("--workers", type=int, help="process pool size (0 = in-process)")
+    ap.add_argument("--out", type=Path, help="write the model: block here instead of stdout")
+    args = ap.parse_args(argv)
+
+    with args.config.open("r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    ref = load_reference(args.ref)
+    if not ref.labels:
+        raise SystemExit("no usable reference rows")
+    model = build_model(cfg, sorted(set(ref.labels), key=_sort_key))
+    grid = np.round(np.arange(args.p_min, args.p_max + args.p_step / 2, args.p_step), 6)
+
+    t0 = time.perf_counter()
+    res = sweep(model, ref, grid, args.workers)
+    elapsed = time.perf_counter() - t0
+
+    p_by_category = res.p_by_category if args.per_category else None
+    text = model_yaml(res.p_global, p_by_category)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+
+    def idx(p: float) -> int:
+        return int(np.argmin(np.abs(grid - p)))
+
+    n_cat = len(CATEGORIES)
+    cur = np.asarray([idx(model.p_by_category.get(c, model.p_shape)) for c in CATEGORIES])
+    best_g = np.full(n_cat, idx(res.p_global))
+    best_c = np.asarray([idx(res.p_by_category.get(c, res.p_global)) for c in CATEGORIES])
+    print(f"{len(ref.labels):,} reference rows, {len(grid)} p values in {elapsed:.2f}s", file=sys.stderr)
+    print(f"  RMSE current config      {res.rmse(cur):.2f} yd", file=sys.stderr)
+    print(f"  RMSE p={res.p_global:g}{'':<14}{res.rmse(best_g):.2f} yd", file=sys.stderr)
+    if args.per_category:
+        print(f"  RMSE per-category        {res.rmse(best_c):.2f} yd  "
+              + ", ".join(f"{k}={v:g}" for k, v in res.p_by_category.items()), file=sys.stderr)
+
+    fitted = build_model(tuned_cfg(cfg, res.p_global, p_by_category), model.baselines.keys())
+    print("  residuals under the fitted exponents (pred - ref):", file=sys.stderr)
+    for row in residual_report(fitted, ref):
+        print(f"    {row['club']:<12} rows={row['rows']:<5} bias {row['bias']:+6.1f}  rmse {row['rmse']:5.1f}",
+              file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
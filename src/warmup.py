@@ -0,0 +1,200 @@
+"""
+Background cache warm-up.
+
+Precomputes what the first golfer after a deploy would otherwise pay for:
+
+    models     fitted CardModel for every anchor profile (src.profiles model cache)
+    table      the mmap yardage lookup file (src.lookup): every catalog/preset
+               club x CHS 90-135 at 0.1 mph x profile; rebuilt only when it is
+               missing or was built from another config. The file is shared by
+               every process on the host, so in-app warm-ups leave it to the
+               deploy step unless YARDAGE_WARMUP_TABLE=1
+    graphs     card-graph baselines and response fits per profile x preset bag
+               (src.memory.shared, the same entries app.py reads)
+    patterns   Shot Pattern SVGs for every preset club x shape at the default
+               CHS and offset, per profile
+
+Warmup.start() runs the stages on a daemon thread and returns at once. Each
+unit of work is small and is followed by a zero-length sleep, so serving
+threads get the GIL between units. snapshot() reports per-stage progress
+for the Debug tab.
+
+app.py starts one warm-up per process. Streamlit has no server-start hook,
+so it begins with the first session's run. Set YARDAGE_WARMUP=0 to turn it
+off. Build the lookup file (and warm everything else) before any session
+from a deploy script instead:
+
+    python -m src.lookup build           # the table only
+    python -m src.warmup                 # foreground, progress on stderr; builds the table too
+"""
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config import CompiledConfig, ConfigStore
+from src.estimates import category_of
+from src.lookup import TableStore, build as build_table
+
+ENABLED = os.environ.get("YARDAGE_WARMUP", "1") != "0"
+# In-app warm-ups write the shared lookup file only when asked to
+BUILD_TABLE = os.environ.get("YARDAGE_WARMUP_TABLE", "0") == "1"
+
+DEFAULT_CHS = 105.0
+DEFAULT_OFFSET = 0.0
+SHAPES = ("Straight", "Fade", "Draw")
+
+@dataclass
+class Stage:
+    name: str
+    total: int = 0
+    done: int = 0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    note: str = ""
+
+    @property
+    def seconds(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return (self.finished or time.perf_counter()) - self.started
+
+@dataclass
+class Warmup:
+    configs: ConfigStore
+    tables: Optional[TableStore] = None
+    # Write/refresh the lookup file at tables.path (it is shared by every process on the host)
+    build_table: bool = BUILD_TABLE
+    stages: List[Stage] = field(default_factory=lambda: [Stage(n) for n in ("models", "table", "graphs", "patterns")])
+    state: str = "idle"
+    _thread: Optional[threading.Thread] = None
+
+    def start(self) -> "Warmup":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="cache-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "stages": [{"stage": s.name, "done": s.done, "total": s.total,
+                        "seconds": None if s.seconds is None else round(s.seconds, 2),
+                        "note": s.error or s.note} for s in self.stages],
+        }
+
+    @property
+    def progress(self) -> float:
+        total = sum(s.total for s in self.stages)
+        return sum(s.done for s in self.stages) / total if total else (1.0 if self.state == "done" else 0.0)
+
+    def run(self) -> None:
+        self.state = "running"
+        cc = self.configs.get()
+        steps: Dict[str, Callable[[CompiledConfig, Stage], None]] = {
+            "models": self._models, "table": self._table, "graphs": self._graphs, "patterns": self._patterns,
+        }
+        for stage in self.stages:
+            stage.started = time.perf_counter()
+            try:
+                steps[stage.name](cc, stage)
+            except Exception as e:
+                stage.error = f"{type(e).__name__}: {e}"
+                traceback.print_exc()
+            stage.finished = time.perf_counter()
+        self.state = "failed" if any(s.error for s in self.stages) else "done"
+
+    # -- stages -------------------------------------------------------------
+    @staticmethod
+    def _units(stage: Stage, units: Iterable) -> Iterable:
+        units = list(units)
+        stage.total = len(units)
+        for unit in units:
+            yield unit
+            stage.done += 1
+            time.sleep(0)  # let serving threads in
+
+    @staticmethod
+    def _bags(cc: CompiledConfig) -> List[Tuple[str, ...]]:
+        return list(dict.fromkeys(tuple(bag) for bag in list(cc.presets.values()) + [cc.default_bag]))
+
+    def _models(self, cc: CompiledConfig, stage: Stage) -> None:
+        for pid in self._units(stage, cc.profiles.ids()):
+            cc.profiles.model(pid)
+
+    def _table(self, cc: CompiledConfig, stage: Stage) -> None:
+        if self.tables is None:
+            stage.note = "skipped"
+            return
+        if not self.build_table:
+            table = self.tables.get()
+            stage.note = (f"not built here ({'found ' + table.path.name if table is not None else 'missing'}; "
+                          "python -m src.lookup build)")
+            return
+        table = self.tables.get()
+        if table is not None and table.header.get("config_digest") == cc.digest \
+                and all(table.has(cc.profiles.key(pid)) for pid in cc.profiles.ids()):
+            stage.note = f"up to date ({table.path.name})"
+            return
+        for _ in self._units(stage, [None]):
+            header = build_table(cc, self.tables.path)
+            stage.note = (f"built {self.tables.path.name}: {len(header['profiles'])} profile(s) x "
+                          f"{header['n_chs']} CHS x {len(header['labels'])} clubs")
+
+    def _graphs(self, cc: CompiledConfig, stage: Stage) -> None:
+        from src.graph import card_groups, shared_card_graph
+
+        catalog = list(cc.catalog)
+        for pid, bag in self._units(stage, [(p, b) for p in cc.profiles.ids() for b in self._bags(cc)]):
+            labels = card_groups(catalog, bag)[2]
+            shared_card_graph(cc.profiles.model(pid), cc.profiles.key(pid), labels, DEFAULT_CHS, DEFAULT_OFFSET)
+
+    def _patterns(self, cc: CompiledConfig, stage: Stage) -> None:
+        from src.dispersion import table_for as dispersion_table_for
+        from src.graph import card_groups, shared_card_graph
+        from src.shot_pattern import cached_pattern_svg
+
+        catalog = list(cc.catalog)
+        units = []
+        for pid in cc.profiles.ids():
+            model, key = cc.profiles.model(pid), cc.profiles.key(pid)
+            params = dispersion_table_for(pid)
+            for bag in self._bags(cc):
+                # Same path as the app's compute_today while the session graph sits at these inputs
+                graph = shared_card_graph(model, key, card_groups(catalog, bag)[2], DEFAULT_CHS, DEFAULT_OFFSET)
+                for label in bag:
+                    if category_of(label) == "putter":
+                        continue
+                    hit = graph.carry_total(label)
+                    if hit is None or hit[0] is None:
+                        continue
+                    units += [(label, shape, hit[0], hit[1], params.get(label)) for shape in SHAPES]
+        for label, shape, carry, total, p in self._units(stage, dict.fromkeys(units)):
+            cached_pattern_svg(label, shape, carry, total, p)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", type=Path, default=Path(__file__).resolve().parent.parent / "data" / "config.yaml")
+    ap.add_argument("--no-table", action="store_true", help="don't build/refresh the lookup file")
+    args = ap.parse_args(argv)
+
+    w = Warmup(ConfigStore(args.config), TableStore(), build_table=not args.no_table)
+    w.run()
+    for s in w.snapshot()["stages"]:
+        print(f"{s['stage']:<9} {s['done']:>4}/{s['total']:<4} {s['seconds'] or 0:7.2f}s  {s['note']}", file=sys.stderr)
+    if w.state != "done":
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.estimates import (
+    Anchor, LoftTable, anchors_by_label,
+    estimate_club_speed, estimate_carry, fit_carry_curve,
+    responsiveness_exponent, scaled_carry, rollout_for, category_of
+)
+from src.perf import timed
+
+@dataclass
+class CardModel:
+    anchors: List[Anchor]
+    anchor_map: Dict[str, Anchor]
+    chs0: float
+    p_shape: float
+    # Optional per-category overrides of p_shape (model.exponent_shape_p_by_category)
+    p_by_category: Dict[str, float] = field(default_factory=dict)
+    rollout_cfg: dict = field(default_factory=dict)
+    # Pre-fitted speed->carry power law (a, b) and per-club baselines
+    carry_fit: Optional[Tuple[float, float]] = None
+    # Wedge anchors compiled for loft interpolation
+    loft_table: Optional[LoftTable] = None
+    baselines: Dict[str, Tuple[Optional[float], Optional[float]]] = field(default_factory=dict)
+
+def anchors_from_cfg(anchors_raw: list) -> List[Anchor]:
+    return [Anchor(
+        label=a["label"],
+        club_speed_mph=float(a["club_speed_mph"]),
+        carry_yd=float(a["carry_yd"]),
+        category=a["category"],
+        loft_deg=a.get("loft_deg")
+    ) for a in anchors_raw]
+
+def build_model(cfg: dict, labels: Iterable[str] = ()) -> CardModel:
+    """
+    Build the card model from a raw config dict. Baselines for `labels`
+    (typically the full catalog) are resolved up front.
+    """
+    anchors = anchors_from_cfg(cfg["baseline"]["anchors"])
+    anchor_map = anchors_by_label(anchors)
+    model = CardModel(
+        anchors=anchors,
+        anchor_map=anchor_map,
+        chs0=float(cfg["baseline"]["driver_chs_mph"]),
+        p_shape=float(cfg["model"]["exponent_shape_p"]),
+        p_by_category={k: float(v) for k, v in (cfg["model"].get("exponent_shape_p_by_category") or {}).items()},
+        rollout_cfg=cfg.get("rollout_defaults_yd", {}),
+        carry_fit=fit_carry_curve(anchors),
+        loft_table=LoftTable.from_anchors(anchor_map),
+    )
+    for label in labels:
+        model.baselines[label] = _resolve_baseline(model, label)
+    return model
+
+# ---------------------------
+# Yardage computation
+# ---------------------------
+def _resolve_baseline(model: CardModel, label: str) -> Tuple[Optional[float], Optional[float]]:
+    if label in model.anchor_map:
+        a = model.anchor_map[label]
+        return a.club_speed_mph, a.carry_yd
+
+    spd = estimate_club_speed(label, model.anchor_map, model.loft_table)
+    if spd is None:
+        return None, None
+
+    carry = estimate_carry(label, float(spd), model.anchor_map, model.anchors, model.carry_fit, model.loft_table)
+    return float(spd), float(carry)
+
+def compute_baseline(model: CardModel, label: str) -> Tuple[Optional[float], Optional[float]]:
+    base = model.baselines.get(label)
+    if base is None:
+        base = _resolve_baseline(model, label)
+        model.baselines[label] = base
+    return base
+
+def shape_p(model: CardModel, label: str) -> float:
+    return model.p_by_category.get(category_of(label), model.p_shape)
+
+@timed("compute_today")
+def compute_today(model: CardModel, label: str, chs_today: float, offset: float) -> Tuple[Optional[float], Optional[float]]:
+    spd0, carry0 = compute_baseline(model, label)
+    if spd0 is None or carry0 is None:
+        return None, None
+    g = responsiveness_exponent(spd0, model.chs0, shape_p(model, label))
+    carry = scaled_carry(carry0, float(chs_today), model.chs0, g) + float(offset)
+    rollout = rollout_for(label, model.rollout_cfg)
+    total = carry + rollout
+    return carry, total
+
+def sorted_with_gaps(model: CardModel, labels: List[str], chs_today: float, offset: float,
+                     today: Optional[Callable[..., Tuple[Optional[float], Optional[float]]]] = None) -> List[dict]:
+    """
+    Rows sorted by carry (longest first); each modeled club carries the gap
+    to the next modeled club below it. `today` replaces compute_today (same
+    signature), e.g. to read from the lookup file in src/lookup.py.
+    """
+    today = today or compute_today
+    vals = []
+    for label in labels:
+        carry, total = today(model, label, chs_today, offset)
+        sort_carry = carry if carry is not None else -1e9
+        vals.append((label, carry, total, sort_carry))
+
+    vals.sort(key=lambda x: x[3], reverse=True)
+
+    rows = []
+    for i, (label, carry, total, _) in enumerate(vals):
+        gap = None
+        if carry is not None:
+            for j in range(i + 1, len(vals)):
+                if vals[j][1] is not None:
+                    gap = carry - vals[j][1]
+                    break
+        rows.append({"club": label, "carry": carry, "total": total, "gap": gap})
+    return rows
+
+def card_rows(model: CardModel, bag: List[str], chs_today: float, offset: float,
+              today: Optional[Callable[..., Tuple[Optional[float], Optional[float]]]] = None) -> Dict[str, List[dict]]:
+    clubs = [x for x in bag if category_of(x) not in ("wedge", "putter")]
+    wedges = [x for x in bag if category_of(x) == "wedge"]
+    return {
+        "clubs": sorted_with_gaps(model, clubs, chs_today, offset, today),
+        "wedges": sorted_with_gaps(model, wedges, chs_today, offset, today),
+    }
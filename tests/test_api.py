@@ -0,0 +1,95 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src import api
+
+def _request(path, query="", method="GET"):
+    """(status, headers, body) for one request through the ASGI app."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode("latin-1")}
+    asyncio.run(api.app(scope, receive, send))
+    start, body = sent
+    return start["status"], dict(start["headers"]), body["body"]
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    api._cache.clear()
+    yield
+    api._cache.clear()
+
+def test_card():
+    status, _, body = _request("/card", "chs=104.3&offset=-3")
+    assert status == 200
+    card = json.loads(body)
+    assert card["chs"] == 104.3 and card["clubs"]
+
+@pytest.mark.parametrize("query,error", [
+    ("chs=200", "chs must be between"),
+    ("chs=fast", "chs must be a number"),
+    ("profile=nobody", "unknown profile"),
+    ("preset=nope", "unknown preset"),
+])
+def test_card_rejects_bad_params(query, error):
+    status, _, body = _request("/card", query)
+    assert status == 400 and error in json.loads(body)["error"]
+
+@pytest.mark.parametrize("club", ["Wedge (99°)", "10W", "Putter", "banana"])
+def test_pattern_rejects_unsupported_clubs(club):
+    status, _, body = _request("/pattern", f"club={club}")
+    assert status == 400 and "unsupported club" in json.loads(body)["error"]
+
+def test_pattern_normalizes_club():
+    status, _, body = _request("/pattern", "club=7+Iron&shape=fade")
+    assert status == 200
+    assert json.loads(body)["club"] == "7i"
+
+def test_head_sends_headers_only():
+    _, get_headers, get_body = _request("/card")
+    status, headers, body = _request("/card", method="HEAD")
+    assert status == 200 and body == b""
+    assert headers[b"content-length"] == str(len(get_body)).encode("ascii") == get_headers[b"content-length"]
+
+def test_concurrent_requests_build_once():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return b"{}"
+
+    async def main():
+        return await asyncio.gather(*(api._cached(("test", "coalesce"), build) for _ in range(8)))
+
+    assert asyncio.run(main()) == [b"{}"] * 8
+    assert len(calls) == 1
+
+def test_waiter_retries_after_cancelled_leader():
+    release = threading.Event()
+    calls = []
+
+    def build():
+        calls.append(1)
+        release.wait(5)
+        return b"%d" % len(calls)
+
+    async def main():
+        key = ("test", "cancel")
+        leader = asyncio.ensure_future(api._cached(key, build))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.ensure_future(api._cached(key, build))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        release.set()
+        return await waiter
+
+    assert asyncio.run(main()) == b"2"
+    assert len(calls) == 2
@@ -0,0 +1,40 @@
+import pytest
+
+from src.golfers import GolferStore
+
+DAY = "2026-05-01"
+
+@pytest.fixture
+def store(tmp_path):
+    s = GolferStore(tmp_path / "golfers.sqlite")
+    yield s
+    s.close()
+
+def _delete(store, chs):
+    with store.transaction() as conn:
+        conn.execute("DELETE FROM chs_readings WHERE chs = ?", (chs,))
+
+def test_daily_bucket_follows_inserts(store):
+    store.add_readings([("alice", DAY, c, "test") for c in (101.0, 104.0, 107.0)])
+    stats = store.stats("alice", today=DAY)
+    assert stats.last == 107.0 and stats.last_day == DAY
+    assert stats.windows[7] == (pytest.approx(104.0), 3)
+
+def test_delete_latest_recomputes_last_chs(store):
+    store.add_readings([("alice", DAY, c, "test") for c in (101.0, 104.0, 107.0)])
+    _delete(store, 107.0)
+    stats = store.stats("alice", today=DAY)
+    assert stats.last == 104.0
+    assert stats.windows[7] == (pytest.approx(102.5), 2)
+
+def test_delete_older_keeps_last_chs(store):
+    store.add_readings([("alice", DAY, c, "test") for c in (101.0, 104.0)])
+    _delete(store, 101.0)
+    assert store.stats("alice", today=DAY).last == 104.0
+
+def test_delete_last_reading_drops_day(store):
+    store.add_readings([("alice", "2026-04-30", 99.0, "test"), ("alice", DAY, 103.0, "test")])
+    _delete(store, 103.0)
+    stats = store.stats("alice", today=DAY)
+    assert (stats.last, stats.last_day) == (99.0, "2026-04-30")
+    assert store.history("alice", today=DAY) == [{"day": "2026-04-30", "readings": 1, "chs": 99.0}]
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+
+from src.config import load_compiled
+from src.lookup import TableStore, YardageTable, build, lookup_today
+from src.profiles import BASE_PROFILE
+from src.yardage import compute_today
+
+CFG_PATH = Path(__file__).resolve().parent.parent / "data" / "config.yaml"
+LABELS = ["Driver", "3W", "Hybrid", "4H", "7i", "PW (46°)", "Wedge (52°)", "LW (60°)"]
+
+@pytest.fixture(scope="module")
+def cc():
+    return load_compiled(CFG_PATH)
+
+@pytest.fixture(scope="module")
+def table(cc, tmp_path_factory):
+    path = tmp_path_factory.mktemp("lookup") / "yardage.ydt"
+    build(cc, path)
+    return YardageTable(path)
+
+def test_header(cc, table):
+    assert table.header["config_digest"] == cc.digest
+    assert all(table.has(cc.profiles.key(pid)) for pid in cc.profiles.ids())
+    assert "Putter" not in table.labels
+
+@pytest.mark.parametrize("chs", [90.0, 104.3, 105.0, 118.9, 135.0])
+@pytest.mark.parametrize("offset", [0.0, -4.5])
+def test_lookup_matches_compute(cc, table, chs, offset):
+    model, key = cc.profiles.model(BASE_PROFILE), cc.profiles.key(BASE_PROFILE)
+    for label in LABELS:
+        # Served from the file, not the compute fallback
+        assert table.carry_total(key, label, chs, offset) is not None
+        got = lookup_today(table, key, model, label, chs, offset)
+        assert got == pytest.approx(compute_today(model, label, chs, offset), abs=1e-9)
+
+def test_uncovered_requests_fall_back(cc, table):
+    model, key = cc.profiles.model(BASE_PROFILE), cc.profiles.key(BASE_PROFILE)
+    assert table.carry_total(key, "7i", 104.33) is None
+    assert table.carry_total(key, "7i", 140.0) is None
+    assert table.carry_total("stale-key", "7i", 105.0) is None
+    assert lookup_today(table, "stale-key", model, "7i", 140.0, 0.0) == compute_today(model, "7i", 140.0, 0.0)
+
+def test_rebuild_replaces_file(cc, tmp_path):
+    path = tmp_path / "yardage.ydt"
+    store = TableStore(path)
+    assert store.get() is None
+    build(cc, path, (100.0, 110.0))
+    assert store.get().header["n_chs"] == 101
+    build(cc, path)
+    assert store.get().header["n_chs"] == 451
+    assert not list(tmp_path.glob("*.tmp"))
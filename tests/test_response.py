@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config import load_compiled
+from src.graph import CardGraph
+from src.profiles import BASE_PROFILE
+from src.response import CHS_RANGE, TOL_YD, exact_carries, exact_slopes, fit_response, response_at
+
+CFG_PATH = Path(__file__).resolve().parent.parent / "data" / "config.yaml"
+
+# Whole, fractional (launch-monitor style) and end-point CHS inside the fit range
+IN_RANGE = [90.0, 95.5, 100.0, 104.3, 105.0, 112.7, 120.05, 128.9, 135.0]
+OUT_OF_RANGE = [75.0, 89.9, 135.1, 150.0]
+
+@pytest.fixture(scope="module")
+def power_law():
+    """(carry0, g, chs0) for the base profile's catalog, as the card graph builds them."""
+    cc = load_compiled(CFG_PATH)
+    model = cc.profiles.model(BASE_PROFILE)
+    graph = CardGraph(model, list(cc.catalog), 105.0, 0.0)
+    return graph.get("baseline")[1], graph.get("exponent"), model.chs0
+
+@pytest.fixture(scope="module")
+def fit(power_law):
+    fit = fit_response(*power_law)
+    assert fit is not None
+    return fit
+
+def test_fit_reports_range_and_error(fit):
+    assert (fit.lo, fit.hi) == CHS_RANGE
+    assert fit.max_err <= TOL_YD
+
+@pytest.mark.parametrize("chs", IN_RANGE)
+def test_carry_matches_power_law(power_law, fit, chs):
+    carry0, g, chs0 = power_law
+    carry, _ = response_at(fit, carry0, g, chs0, chs)
+    exact = exact_carries(carry0, g, chs0, [chs])[0]
+    modeled = ~np.isnan(carry0)
+    assert np.all(np.isnan(carry[~modeled]))
+    assert np.max(np.abs(carry[modeled] - exact[modeled])) <= TOL_YD
+    # Cards show whole yards
+    assert np.array_equal(np.round(carry[modeled]), np.round(exact[modeled]))
+
+@pytest.mark.parametrize("chs", IN_RANGE)
+def test_slope_matches_power_law(power_law, fit, chs):
+    carry0, g, chs0 = power_law
+    _, slope = response_at(fit, carry0, g, chs0, chs)
+    exact = exact_slopes(carry0, g, chs0, [chs])[0]
+    modeled = ~np.isnan(carry0)
+    # yd/mph is shown to one decimal
+    assert np.max(np.abs(slope[modeled] - exact[modeled])) < 0.005
+
+@pytest.mark.parametrize("chs", OUT_OF_RANGE)
+def test_outside_range_uses_power_law(power_law, fit, chs):
+    carry0, g, chs0 = power_law
+    assert not fit.covers(chs)
+    carry, slope = response_at(fit, carry0, g, chs0, chs)
+    np.testing.assert_array_equal(carry, exact_carries(carry0, g, chs0, [chs])[0])
+    np.testing.assert_array_equal(slope, exact_slopes(carry0, g, chs0, [chs])[0])
+
+def test_unreachable_tolerance_falls_back(power_law):
+    carry0, g, chs0 = power_law
+    fit = fit_response(carry0, g, chs0, tol=-1.0)
+    assert fit is None
+    carry, slope = response_at(fit, carry0, g, chs0, 104.3)
+    np.testing.assert_array_equal(carry, exact_carries(carry0, g, chs0, [104.3])[0])
+    np.testing.assert_array_equal(slope, exact_slopes(carry0, g, chs0, [104.3])[0])
+
+def test_card_graph_without_fit_serves_power_law(power_law, monkeypatch):
+    import src.graph as graph_mod
+
+    monkeypatch.setattr(graph_mod, "fit_response", lambda *a, **k: None)
+    carry0, g, chs0 = power_law
+    cc = load_compiled(CFG_PATH)
+    graph = CardGraph(cc.profiles.model(BASE_PROFILE), list(cc.catalog), 104.3, 0.0)
+    assert graph.get("response") is None
+    np.testing.assert_array_equal(graph.get("scaled"), exact_carries(carry0, g, chs0, [104.3])[0])
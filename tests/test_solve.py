@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pytest
+
+from src.config import load_compiled
+from src.profiles import BASE_PROFILE
+from src.solve import parse_observations, solve_chs
+from src.yardage import compute_today
+
+CFG_PATH = Path(__file__).resolve().parent.parent / "data" / "config.yaml"
+CLUBS = ["5i", "7i", "9i", "PW (46°)", "SW (56°)"]
+
+@pytest.fixture(scope="module")
+def model():
+    return load_compiled(CFG_PATH).profiles.model(BASE_PROFILE)
+
+def _carries(model, chs, offset, clubs=CLUBS):
+    return [(label, compute_today(model, label, chs, offset)[0]) for label in clubs]
+
+@pytest.mark.parametrize("chs,offset", [(98.0, 0.0), (104.3, -6.5), (121.7, 4.0)])
+def test_recovers_chs_and_offset(model, chs, offset):
+    sol = solve_chs(model, _carries(model, chs, offset))
+    assert sol.offset_fitted and not sol.at_bound
+    assert sol.chs == pytest.approx(chs, abs=1e-3)
+    assert sol.offset == pytest.approx(offset, abs=1e-2)
+    assert sol.rmse < 1e-2
+
+def test_fixed_offset_single_club(model):
+    sol = solve_chs(model, _carries(model, 110.0, 0.0, ["7i"]), offset=0.0)
+    assert not sol.offset_fitted
+    assert sol.chs == pytest.approx(110.0, abs=1e-3)
+
+def test_out_of_range_lands_on_bound(model):
+    sol = solve_chs(model, _carries(model, 140.0, 0.0, ["7i"]))
+    assert sol.at_bound and sol.chs == pytest.approx(135.0)
+
+def test_parse_observations():
+    assert parse_observations(["7 Iron:165", "Sand Wedge:92.5"]) == [("7i", 165.0), ("SW (56°)", 92.5)]
+    with pytest.raises(ValueError):
+        parse_observations(["10W:200"])
+    with pytest.raises(ValueError):
+        parse_observations(["7i"])